@@ -0,0 +1,232 @@
+"""
+Contrôle d'admission : limitation de débit par client et délestage par worker
+"""
+
+import math
+import threading
+import time
+
+from flask import g, jsonify, request
+
+from api.metrics import ADMISSION_DECISIONS, CALCULATOR_IN_FLIGHT, CONCURRENCY_LIMIT
+
+
+class TokenBucket:
+    """Seau de jetons d'un client (slots pour limiter la mémoire par client)"""
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens, updated):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class TokenBucketLimiter:
+    """
+    Limiteur de débit à seaux de jetons, un seau par clé client
+    Les seaux inactifs depuis idle_timeout secondes sont évincés périodiquement
+    """
+
+    def __init__(self, rate, burst, idle_timeout=300.0, clock=time.monotonic):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self.buckets = {}
+        self._lock = threading.Lock()
+        self._next_sweep = clock() + idle_timeout
+
+    def acquire(self, key):
+        """
+        Consomme un jeton pour la clé donnée
+        Retourne 0 si la requête est admise, sinon le délai en secondes avant le prochain jeton
+        """
+        now = self.clock()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._evict_idle(now)
+
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = TokenBucket(self.burst, now)
+            else:
+                bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+                bucket.updated = now
+
+            if bucket.tokens >= 1.0:
+                bucket.tokens -= 1.0
+                return 0.0
+            return (1.0 - bucket.tokens) / self.rate
+
+    def _evict_idle(self, now):
+        """Supprime les seaux inactifs (appelé avec le verrou acquis)"""
+        cutoff = now - self.idle_timeout
+        for key in [key for key, bucket in self.buckets.items() if bucket.updated < cutoff]:
+            del self.buckets[key]
+        self._next_sweep = now + self.idle_timeout
+
+
+class ConcurrencyLimiter:
+    """Plafond global de requêtes en cours pour un worker"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        CONCURRENCY_LIMIT.set(limit)
+
+    def try_acquire(self):
+        """Réserve une place ; retourne False si le plafond est atteint"""
+        with self._lock:
+            if self.in_flight >= self.limit:
+                return False
+            self.in_flight += 1
+            CALCULATOR_IN_FLIGHT.set(self.in_flight)
+            return True
+
+    def release(self, latency=None):
+        """Libère une place réservée par try_acquire"""
+        with self._lock:
+            self.in_flight -= 1
+            CALCULATOR_IN_FLIGHT.set(self.in_flight)
+
+
+class AdaptiveConcurrencyLimiter(ConcurrencyLimiter):
+    """
+    Plafond de concurrence ajusté selon la latence observée (style gradient)
+    La limite croît tant que la latence courte reste proche de la latence de référence
+    et diminue proportionnellement dès qu'elle s'en écarte
+    """
+
+    def __init__(
+        self, initial_limit, min_limit=1, max_limit=1000, tolerance=1.5, smoothing=0.2, short_window=10, long_window=500
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.short_alpha = 2.0 / (short_window + 1)
+        self.long_alpha = 2.0 / (long_window + 1)
+        self.short_latency = None
+        self.baseline_latency = None
+        self.estimated_limit = float(initial_limit)
+        super().__init__(int(initial_limit))
+
+    def release(self, latency=None):
+        """Libère une place et ajuste la limite à partir de la latence de la requête"""
+        with self._lock:
+            in_flight = self.in_flight
+            self.in_flight -= 1
+            CALCULATOR_IN_FLIGHT.set(self.in_flight)
+            if latency is not None:
+                self._update(latency, in_flight)
+
+    def _update(self, latency, in_flight):
+        """Met à jour les moyennes mobiles et recalcule la limite (verrou acquis)"""
+        if self.short_latency is None:
+            self.short_latency = self.baseline_latency = latency
+        else:
+            self.short_latency += self.short_alpha * (latency - self.short_latency)
+            self.baseline_latency += self.long_alpha * (latency - self.baseline_latency)
+            # Après un pic prolongé, la référence redescend vers la latence courante
+            if self.baseline_latency > 2 * self.short_latency:
+                self.baseline_latency *= 0.95
+
+        if self.short_latency <= 0:
+            return
+
+        gradient = max(0.5, min(1.0, self.tolerance * self.baseline_latency / self.short_latency))
+        # Pas de croissance si le worker n'utilise pas la moitié de sa limite
+        if gradient == 1.0 and in_flight < self.estimated_limit / 2:
+            return
+
+        target = self.estimated_limit * gradient + math.sqrt(self.estimated_limit)
+        estimated = (1 - self.smoothing) * self.estimated_limit + self.smoothing * target
+        self.estimated_limit = max(self.min_limit, min(self.max_limit, estimated))
+        self.limit = int(self.estimated_limit)
+        CONCURRENCY_LIMIT.set(self.limit)
+
+
+class AdmissionController:
+    """Regroupe limitation de débit et plafond de concurrence"""
+
+    def __init__(self, rate_limiter=None, concurrency=None, blueprints=()):
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.blueprints = frozenset(blueprints)
+
+    def admit(self, client_key):
+        """
+        Décide de l'admission d'une requête
+        Retourne None si admise, sinon une réponse 429/503 avec Retry-After
+        """
+        # Délestage d'abord : une requête refusée en 503 ne consomme pas de jeton
+        if self.concurrency is not None and not self.concurrency.try_acquire():
+            ADMISSION_DECISIONS.labels(decision="shed").inc()
+            return _reject("Server overloaded, retry later", 503, 1)
+
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.acquire(client_key)
+            if wait > 0:
+                if self.concurrency is not None:
+                    self.concurrency.release()
+                ADMISSION_DECISIONS.labels(decision="rate_limited").inc()
+                return _reject("Too many requests", 429, wait)
+
+        ADMISSION_DECISIONS.labels(decision="admitted").inc()
+        return None
+
+
+def _reject(message, status, retry_after):
+    """Construit une réponse de rejet rapide"""
+    seconds = max(1, math.ceil(retry_after))
+    response = jsonify({"error": message, "retry_after": seconds})
+    response.status_code = status
+    response.headers["Retry-After"] = str(seconds)
+    return response
+
+
+def init_admission_control(app):
+    """
+    Installe le contrôle d'admission devant les blueprints de ADMISSION_BLUEPRINTS
+    RATE_LIMIT_RPS et MAX_CONCURRENT_REQUESTS à 0 désactivent la limite correspondante
+    Avec ADAPTIVE_CONCURRENCY, MAX_CONCURRENT_REQUESTS devient la limite initiale
+    """
+    rate = app.config.get("RATE_LIMIT_RPS", 0)
+    max_concurrent = app.config.get("MAX_CONCURRENT_REQUESTS", 0)
+    if max_concurrent <= 0:
+        concurrency = None
+    elif app.config.get("ADAPTIVE_CONCURRENCY", False):
+        concurrency = AdaptiveConcurrencyLimiter(max_concurrent, max_limit=app.config.get("ADAPTIVE_CONCURRENCY_MAX", 1000))
+    else:
+        concurrency = ConcurrencyLimiter(max_concurrent)
+
+    controller = AdmissionController(
+        rate_limiter=(
+            TokenBucketLimiter(
+                rate, app.config.get("RATE_LIMIT_BURST", rate), app.config.get("RATE_LIMIT_IDLE_TIMEOUT", 300.0)
+            )
+            if rate > 0
+            else None
+        ),
+        concurrency=concurrency,
+        blueprints=app.config.get("ADMISSION_BLUEPRINTS", ()),
+    )
+    app.extensions["admission"] = controller
+
+    @app.before_request
+    def admission_control():
+        if request.blueprint not in controller.blueprints:
+            return None
+        rejection = controller.admit(request.remote_addr or "unknown")
+        if rejection is None:
+            g.admission_slot = controller.concurrency is not None
+        return rejection
+
+    @app.teardown_request
+    def admission_release(exc=None):
+        if g.pop("admission_slot", False):
+            # Même latence que celle observée par REQUEST_DURATION
+            controller.concurrency.release(time.time() - g.start_time if "start_time" in g else None)
+
+    return controller
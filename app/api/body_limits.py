@@ -0,0 +1,69 @@
+"""
+Limites de taille du corps des requêtes par route ou par blueprint
+"""
+
+import io
+
+from flask import jsonify, request
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def resolve_body_limit(limits, endpoint, blueprint):
+    """Retourne la limite applicable : celle de l'endpoint, sinon celle du blueprint"""
+    if endpoint in limits:
+        return limits[endpoint]
+    return limits.get(blueprint)
+
+
+def payload_too_large(limit):
+    """Réponse 413 au format JSON de l'API"""
+    response = jsonify({"error": "Request body too large", "max_bytes": limit})
+    response.status_code = 413
+    return response
+
+
+def read_bounded(stream, limit):
+    """
+    Lit un flux par blocs sans dépasser limit + 1 octets
+    Retourne le contenu, ou None si le flux dépasse la limite
+    """
+    chunks = []
+    remaining = limit + 1
+    while remaining > 0:
+        chunk = stream.read(min(READ_CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    if remaining <= 0:
+        return None
+    return b"".join(chunks)
+
+
+def init_body_limits(app):
+    """
+    Applique BODY_SIZE_LIMITS (endpoint ou blueprint -> octets, None pour aucune limite)
+    Un Content-Length trop grand est rejeté avant toute lecture du corps ;
+    les envois sans Content-Length (chunked) sont lus au travers d'un flux borné
+    """
+    app.config.setdefault("BODY_SIZE_LIMITS", {})
+
+    @app.before_request
+    def enforce_body_limit():
+        limit = resolve_body_limit(app.config["BODY_SIZE_LIMITS"], request.endpoint, request.blueprint)
+        if limit is None:
+            return None
+        if request.content_length is not None:
+            if request.content_length > limit:
+                return payload_too_large(limit)
+            return None
+
+        # Corps sans Content-Length (chunked) : lecture bornée puis remplacement du flux
+        if "wsgi.input_terminated" not in request.environ:
+            return None
+        body = read_bounded(request.environ["wsgi.input"], limit)
+        if body is None:
+            return payload_too_large(limit)
+        request.stream = io.BytesIO(body)
+        return None
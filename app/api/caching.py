@@ -0,0 +1,48 @@
+"""
+Requêtes conditionnelles et en-têtes de cache HTTP par blueprint
+"""
+
+import hashlib
+
+from flask import request
+from werkzeug.http import parse_etags
+
+CACHEABLE_METHODS = ("GET", "HEAD")
+
+
+def compute_etag(body):
+    """Calcule un ETag fort pour un corps de réponse"""
+    return hashlib.sha1(body, usedforsecurity=False).hexdigest()
+
+
+def etag_matches(if_none_match, etag):
+    """Comparaison faible d'If-None-Match, identique à make_conditional pour les requêtes GET"""
+    return parse_etags(if_none_match).contains_weak(etag)
+
+
+def apply_cache_policy(response, policy):
+    """
+    Ajoute Cache-Control et ETag à une réponse puis applique If-None-Match
+    Retourne une réponse 304 sans corps si le client possède déjà la représentation
+    """
+    response.headers["Cache-Control"] = policy
+    if response.get_etag()[0] is None:
+        response.set_etag(compute_etag(response.get_data()))
+    return response.make_conditional(request)
+
+
+def init_http_cache(app):
+    """
+    Active le cache HTTP sur les blueprints listés dans HTTP_CACHE_POLICIES
+    (nom du blueprint -> valeur de Cache-Control)
+    """
+    app.config.setdefault("HTTP_CACHE_POLICIES", {})
+
+    @app.after_request
+    def http_cache(response):
+        policy = app.config["HTTP_CACHE_POLICIES"].get(request.blueprint)
+        if policy is None or request.method not in CACHEABLE_METHODS:
+            return response
+        if response.status_code != 200 or response.is_streamed:
+            return response
+        return apply_cache_policy(response, policy)
@@ -2,62 +2,435 @@
 Endpoint de calcul pour l'application Flask
 """
 
-from flask import Blueprint, jsonify, request
+import json
+import math
+import operator
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+
+from api.body_limits import payload_too_large, read_bounded
+from api.codecs import CODECS, JSON_MIMETYPE, UNSUPPORTED_CONTENT_TYPE, negotiate
+from api.csv_stream import CSV_MIMETYPE, CsvCalculator, open_reader, read_header
+from api.columnar import COLUMNAR_MIMETYPE, FLOAT64, decode_columns, encode_result
+from api.linalg import (
+    ARRAYS_MIMETYPE,
+    MATRIX_OPERATION_CODES,
+    MATRIX_OPERATIONS,
+    check_shapes,
+    decode_arrays,
+    decode_header,
+    elementwise_shape,
+    encode_array_result,
+    infer_shape,
+    to_array,
+)
+from api.offload import OffloadError
+from api.operations import HEAVY, REGISTRY, build_dispatch_table, code_table, load_plugins, operation, register
+from api.schema import Field, ValidationError, compile_schema
+from api.stats import QuantileSketch, StreamingStats, summarize
+from api.warmup import is_warmup_request
 
 calculator_bp = Blueprint("calculator", __name__)
 
 
+def divide_columns(a, b):
+    """Division vectorisée refusant tout diviseur nul"""
+    if not b.all():
+        raise ValidationError("Division by zero is not allowed")
+    return np.divide(a, b)
+
+
+def power_columns(a, b):
+    """Puissance vectorisée ; refusée si un élément n'est pas un réel fini"""
+    with np.errstate(all="ignore"):
+        result = np.power(a, b)
+    if not np.isfinite(result).all():
+        raise ValidationError("Result is not a finite real number")
+    return result
+
+
+# Opérations intégrées (les plugins s'enregistrent via le groupe d'entry points "calculator.operations")
+# Codes figés : un code publié ne change plus, une nouvelle opération prend un code libre
+register("add", operator.add, code=0, vectorized=np.add)
+register("subtract", operator.sub, code=1, vectorized=np.subtract)
+register("multiply", operator.mul, code=2, vectorized=np.multiply)
+
+
+@operation("divide", code=3, vectorized=divide_columns)
+def divide(a, b):
+    """Division refusant un diviseur nul"""
+    if b == 0:
+        raise ValidationError("Division by zero is not allowed")
+    return a / b
+
+
+# Sur le format tableaux, 4 à 6 sont pris par dot, matmul et solve (api/linalg.py)
+@operation("power", code=4, array_code=7, vectorized=power_columns)
+def power(a, b):
+    """Puissance réelle ; dépassement, division par zéro et résultat complexe sont refusés"""
+    try:
+        result = a**b
+    except OverflowError:
+        raise ValidationError("Result is too large")
+    except ZeroDivisionError:
+        raise ValidationError("Division by zero is not allowed")
+    if isinstance(result, complex):
+        raise ValidationError("Result is not a real number")
+    return result
+
+
+# Bornes de primes : la taille de l'intervalle fixe la mémoire (10 Mo) et le temps de crible (~200 ms au maximum)
+PRIMES_MAX_BOUND = 10**12
+PRIMES_MAX_SPAN = 10**7
+
+
+@operation("primes", code=5, cost=HEAVY)
+def primes(a, b):
+    """Nombre de nombres premiers dans [a, b] (crible segmenté, entiers positifs bornés)"""
+    if not (a.is_integer() and b.is_integer()) or not 0 <= a <= b <= PRIMES_MAX_BOUND:
+        raise ValidationError(f"Bounds must be integers with 0 <= a <= b <= {PRIMES_MAX_BOUND}")
+    if b - a > PRIMES_MAX_SPAN:
+        raise ValidationError(f"Interval must not span more than {PRIMES_MAX_SPAN} integers")
+    low, high = int(a), int(b)
+    root = math.isqrt(high)
+
+    base = bytearray([1]) * (root + 1)
+    base[: min(2, root + 1)] = bytes(min(2, root + 1))
+    for p in range(2, math.isqrt(root) + 1):
+        if base[p]:
+            base[p * p :: p] = bytes(len(range(p * p, root + 1, p)))
+
+    segment = bytearray([1]) * (high - low + 1)
+    for p in (p for p in range(2, root + 1) if base[p]):
+        start = max(p * p, -(-low // p) * p)
+        segment[start - low :: p] = bytes(len(range(start, high + 1, p)))
+    for n in range(low, min(2, high + 1)):
+        segment[n - low] = 0
+    return float(segment.count(1))
+
+
+# Table de dispatch résolue une seule fois au démarrage, partagée par tous les modes
+# (unitaire, WebSocket, tâches, colonnaire, tableaux)
+load_plugins()
+OPERATIONS = dict(REGISTRY)
+DISPATCH = build_dispatch_table(OPERATIONS)
+
+# Codes numériques des opérations pour les formats binaires (déclarés à l'enregistrement)
+OPERATION_CODES = code_table((name, entry.code) for name, entry in OPERATIONS.items())
+OPERATION_NAMES = {code: name for name, code in OPERATION_CODES.items()}
+
+# Opérations à ne jamais exécuter sur une boucle d'événements (ASGI, socket Unix)
+HEAVY_OPERATIONS = frozenset(name for name, entry in OPERATIONS.items() if entry.cost == HEAVY)
+
+# Évaluation des fichiers CSV avec la même table de dispatch
+CSV_CALCULATOR = CsvCalculator(DISPATCH, f"Unsupported operation. Use: {', '.join(DISPATCH)}")
+
+# Opérations sur tableaux : nom -> (noyau, règle de forme)
+ARRAY_OPERATIONS = {
+    **{name: (entry.vectorized, elementwise_shape) for name, entry in DISPATCH.items() if entry.vectorized is not None},
+    **MATRIX_OPERATIONS,
+}
+ARRAY_OPERATION_CODES = code_table(
+    [
+        *((name, entry.array_code) for name, entry in OPERATIONS.items() if entry.vectorized is not None),
+        *MATRIX_OPERATION_CODES.items(),
+    ]
+)
+ARRAY_OPERATION_NAMES = {code: name for name, code in ARRAY_OPERATION_CODES.items()}
+
+# Schéma compilé une seule fois au chargement du module
+validate_calculation = compile_schema(
+    [
+        Field("operation", choices=DISPATCH, error=f"Unsupported operation. Use: {', '.join(DISPATCH)}"),
+        Field("a", coerce=float, error="Values a and b must be numeric"),
+        Field("b", coerce=float, error="Values a and b must be numeric"),
+    ]
+)
+
+
+# Agrégation : flux binaire de float64 little-endian lu par blocs
+AGGREGATE_STREAM_MIMETYPE = "application/octet-stream"
+AGGREGATE_CHUNK_SIZE = 1024 * 1024
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0)
+
+
+validate_arrays = compile_schema(
+    [
+        Field("operation", choices=ARRAY_OPERATIONS, error=f"Unsupported operation. Use: {', '.join(ARRAY_OPERATIONS)}"),
+        Field("a"),
+        Field("b"),
+    ]
+)
+
+
+def evaluate(payload, offload=None, flight=None):
+    """
+    Valide une charge utile de calcul et retourne le résultat
+    Partagé par tous les modes d'appel ; lève ValidationError en cas d'entrée invalide
+    Les opérations HEAVY passent par offload (OffloadPool) s'il est fourni, et les
+    calculs identiques simultanés sont regroupés par flight (SingleFlight)
+    """
+    operation, a, b = validate_calculation(payload)
+    return {"result": DISPATCH[operation].call(a, b, offload, flight), "operation": operation, "a": a, "b": b}
+
+
+def is_heavy(payload):
+    """Vrai si la charge utile de calcul désigne une opération HEAVY (avant validation)"""
+    return isinstance(payload, dict) and isinstance(payload.get("operation"), str) and payload["operation"] in HEAVY_OPERATIONS
+
+
+def request_codec():
+    """Codec correspondant au Content-Type de la requête, ou None s'il n'est pas supporté"""
+    if request.is_json:
+        return CODECS[JSON_MIMETYPE]
+    return CODECS.get(request.mimetype)
+
+
+def read_payload(codec):
+    """Décode le corps de la requête ; lève ValidationError si le format est refusé"""
+    if codec is None:
+        raise ValidationError(UNSUPPORTED_CONTENT_TYPE)
+    # JSON compris : un corps illisible donne 400 (comme en ASGI), pas l'erreur BadRequest de get_json
+    return codec.decode(request.get_data())
+
+
+def encode_response(payload, status, request_mimetype=JSON_MIMETYPE):
+    """Encode la réponse dans le format négocié via l'en-tête Accept"""
+    mimetype = negotiate(request.headers.get("Accept"), request_mimetype)
+    if mimetype == JSON_MIMETYPE:
+        response = jsonify(payload)
+        response.status_code = status
+    else:
+        response = Response(CODECS[mimetype].dumps(payload), status=status, mimetype=mimetype)
+    response.vary.add("Accept")
+    return response
+
+
 @calculator_bp.route("/calculate", methods=["POST"])
 def calculate():
     """
     Endpoint de calcul simple
-    Accepte des données JSON et effectue un calcul simple
+    Accepte des données JSON (ou MessagePack / CBOR) et effectue un calcul simple
+    """
+    codec = request_codec()
+    request_mimetype = codec.mimetype if codec is not None else JSON_MIMETYPE
+    try:
+        extensions = current_app.extensions
+        payload = evaluate(read_payload(codec), extensions.get("offload"), extensions.get("singleflight"))
+        history = extensions.get("history")
+        if history is not None and not is_warmup_request():
+            history.record(OPERATION_CODES[payload["operation"]], payload["a"], payload["b"], payload["result"])
+        return encode_response(payload, 200, request_mimetype)
+
+    except ValidationError as e:
+        return encode_response(e.to_dict(), e.status_code, request_mimetype)
+    except OffloadError as e:
+        response = encode_response(e.to_dict(), e.status_code, request_mimetype)
+        if e.retry_after is not None:
+            response.headers["Retry-After"] = str(e.retry_after)
+        return response
+    except Exception as e:
+        return jsonify({"error": "Internal server error", "details": str(e)}), 500
+
+
+@calculator_bp.route("/calculate/columnar", methods=["POST"])
+def calculate_columnar():
+    """
+    Endpoint de calcul en masse
+    Accepte deux colonnes float64 little-endian (format décrit dans api/columnar.py)
+    et retourne la colonne résultat dans le même format
     """
+    if request.mimetype != COLUMNAR_MIMETYPE:
+        return jsonify({"error": f"Content-Type must be {COLUMNAR_MIMETYPE}"}), 400
     try:
-        # Validation de la présence des données JSON
-        if not request.is_json:
-            return jsonify({"error": "Content-Type must be application/json"}), 400
+        operation_code, a, b = decode_columns(request.get_data())
+        if operation_code not in OPERATION_NAMES:
+            raise ValidationError(f"Unsupported operation code: {operation_code}")
+        vectorized = DISPATCH[OPERATION_NAMES[operation_code]].vectorized
+        if vectorized is None:
+            raise ValidationError(f"Operation {OPERATION_NAMES[operation_code]} has no columnar implementation")
+        result = vectorized(a, b)
+        return Response(encode_result(operation_code, result), mimetype=COLUMNAR_MIMETYPE)
+
+    except ValidationError as e:
+        return jsonify(e.to_dict()), e.status_code
 
-        data = request.get_json()
 
-        # Validation des champs requis
-        required_fields = ["operation", "a", "b"]
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
+@calculator_bp.route("/calculate/csv", methods=["POST"])
+def calculate_csv():
+    """
+    Endpoint de calcul CSV en flux
+    Accepte un CSV operation,a,b et retourne operation,a,b,result,error au fil de la lecture
+    """
+    if request.mimetype != CSV_MIMETYPE:
+        return jsonify({"error": f"Content-Type must be {CSV_MIMETYPE}"}), 400
+    reader = open_reader(request.stream)
+    try:
+        read_header(reader)
+    except ValidationError as e:
+        return jsonify(e.to_dict()), e.status_code
+    extensions = current_app.extensions
+    rows = CSV_CALCULATOR.stream(reader, offload=extensions.get("offload"), flight=extensions.get("singleflight"))
+    return Response(stream_with_context(rows), mimetype=CSV_MIMETYPE)
 
-        operation = data["operation"]
-        a = data["a"]
-        b = data["b"]
 
-        # Validation des types numériques
-        try:
-            a = float(a)
-            b = float(b)
-        except (ValueError, TypeError):
-            return jsonify({"error": "Values a and b must be numeric"}), 400
-
-        # Calcul selon l'opération
-        if operation == "add":
-            result = a + b
-        elif operation == "subtract":
-            result = a - b
-        elif operation == "multiply":
-            result = a * b
-        elif operation == "divide":
-            if b == 0:
-                return jsonify({"error": "Division by zero is not allowed"}), 400
-            result = a / b
+def parse_percentiles(raw):
+    """Valide une liste de percentiles (nombres entre 0 et 100)"""
+    if raw is None:
+        return DEFAULT_PERCENTILES
+    if not isinstance(raw, list):
+        raise ValidationError("Percentiles must be a list of numbers between 0 and 100")
+    try:
+        percentiles = [float(p) for p in raw]
+    except (TypeError, ValueError):
+        raise ValidationError("Percentiles must be a list of numbers between 0 and 100")
+    if not all(0 <= p <= 100 for p in percentiles):
+        raise ValidationError("Percentiles must be a list of numbers between 0 and 100")
+    return percentiles
+
+
+def check_finite(values):
+    """Refuse NaN et infinis, qui rendraient les agrégats inexploitables"""
+    if not np.isfinite(values).all():
+        raise ValidationError("Values must be finite numbers")
+    return values
+
+
+def iter_stream_chunks(stream, chunk_size=AGGREGATE_CHUNK_SIZE):
+    """
+    Découpe un flux binaire en tableaux float64 sans le charger entièrement
+    Un reste de moins de 8 octets est reporté sur le bloc suivant
+    """
+    pending = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        data = pending + chunk if pending else chunk
+        usable = len(data) - len(data) % FLOAT64.itemsize
+        yield np.frombuffer(data, dtype=FLOAT64, count=usable // FLOAT64.itemsize)
+        pending = data[usable:]
+    if pending:
+        raise ValidationError("Binary body length must be a multiple of 8 bytes")
+
+
+def json_values():
+    """Lit {"values": [...], "percentiles": [...]} dans la limite AGGREGATE_JSON_MAX_BYTES"""
+    limit = current_app.config["AGGREGATE_JSON_MAX_BYTES"]
+    if request.content_length is not None and request.content_length > limit:
+        return None, None
+    body = read_bounded(request.stream, limit)
+    if body is None:
+        return None, None
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise ValidationError("Invalid request body")
+    if not isinstance(payload, dict) or not isinstance(payload.get("values"), list):
+        raise ValidationError("Request body must be a JSON object with a values list")
+    try:
+        values = np.asarray(payload["values"], dtype=FLOAT64)
+    except (TypeError, ValueError):
+        raise ValidationError("Values must be finite numbers")
+    if values.ndim != 1:
+        raise ValidationError("Values must be finite numbers")
+    return check_finite(values), parse_percentiles(payload.get("percentiles"))
+
+
+@calculator_bp.route("/aggregate", methods=["POST"])
+def aggregate():
+    """
+    Endpoint d'agrégation statistique
+    Accepte {"values": [...], "percentiles": [...]} en JSON, ou un flux application/octet-stream
+    de float64 little-endian (percentiles dans ?percentiles=50,99) traité par blocs en mémoire bornée
+    """
+    stats = StreamingStats()
+    sketch = QuantileSketch()
+    try:
+        if request.is_json:
+            values, percentiles = json_values()
+            if values is None:
+                return payload_too_large(current_app.config["AGGREGATE_JSON_MAX_BYTES"])
+            stats.update(values)
+            sketch.update(values)
+        elif request.mimetype == AGGREGATE_STREAM_MIMETYPE:
+            raw = request.args.get("percentiles")
+            percentiles = parse_percentiles(None if raw is None else raw.split(","))
+            for values in iter_stream_chunks(request.stream):
+                check_finite(values)
+                stats.update(values)
+                sketch.update(values)
         else:
-            return (
-                jsonify({"error": ("Unsupported operation. " "Use: add, subtract, multiply, divide")}),
-                400,
-            )
-
-        return (
-            jsonify({"result": result, "operation": operation, "a": a, "b": b}),
-            200,
+            raise ValidationError(f"Content-Type must be {JSON_MIMETYPE} or {AGGREGATE_STREAM_MIMETYPE}")
+        return jsonify(summarize(stats, sketch, percentiles))
+
+    except ValidationError as e:
+        return jsonify(e.to_dict()), e.status_code
+
+
+def linalg_executor():
+    """Pool de threads partagé pour les gros calculs (créé au premier besoin)"""
+    executor = current_app.extensions.get("linalg_executor")
+    if executor is None:
+        executor = current_app.extensions.setdefault(
+            "linalg_executor",
+            ThreadPoolExecutor(max_workers=current_app.config["LINALG_THREADS"], thread_name_prefix="linalg"),
         )
+    return executor
 
-    except Exception as e:
-        return jsonify({"error": "Internal server error", "details": str(e)}), 500
+
+def stop_linalg_executor(app):
+    """Arrête le pool de threads des calculs matriciels s'il a été créé"""
+    executor = app.extensions.pop("linalg_executor", None)
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def run_array_operation(kernel, a, b):
+    """
+    Exécute un noyau NumPy ; au-delà de LINALG_OFFLOAD_THRESHOLD éléments, le calcul
+    passe par le pool borné, ce qui plafonne le nombre de calculs BLAS simultanés
+    """
+    if a.size + b.size < current_app.config["LINALG_OFFLOAD_THRESHOLD"]:
+        return kernel(a, b)
+    return linalg_executor().submit(kernel, a, b).result()
+
+
+@calculator_bp.route("/linalg", methods=["POST"])
+def linalg():
+    """
+    Endpoint vectoriel et matriciel
+    Accepte {"operation": ..., "a": [...], "b": [...]} (JSON, MessagePack, CBOR) ou le
+    format binaire décrit dans api/linalg.py ; opérations élément par élément, dot, matmul, solve
+    """
+    max_elements = current_app.config["LINALG_MAX_ELEMENTS"]
+    if request.mimetype == ARRAYS_MIMETYPE:
+        try:
+            data = request.get_data()
+            operation_code, shape_a, shape_b = decode_header(data)
+            if operation_code not in ARRAY_OPERATION_NAMES:
+                raise ValidationError(f"Unsupported operation code: {operation_code}")
+            kernel, shape_rule = ARRAY_OPERATIONS[ARRAY_OPERATION_NAMES[operation_code]]
+            check_shapes(shape_rule, shape_a, shape_b, max_elements)
+            a, b = decode_arrays(data, shape_a, shape_b)
+            result = run_array_operation(kernel, a, b)
+            return Response(encode_array_result(operation_code, result), mimetype=ARRAYS_MIMETYPE)
+
+        except ValidationError as e:
+            return jsonify(e.to_dict()), e.status_code
+
+    codec = request_codec()
+    request_mimetype = codec.mimetype if codec is not None else JSON_MIMETYPE
+    try:
+        operation, a, b = validate_arrays(read_payload(codec))
+        kernel, shape_rule = ARRAY_OPERATIONS[operation]
+        shape_a, shape_b = infer_shape(a), infer_shape(b)
+        check_shapes(shape_rule, shape_a, shape_b, max_elements)
+        result = np.asarray(run_array_operation(kernel, to_array(a, shape_a), to_array(b, shape_b)))
+        payload = {"operation": operation, "shape": list(result.shape), "result": result.tolist()}
+        return encode_response(payload, 200, request_mimetype)
+
+    except ValidationError as e:
+        return encode_response(e.to_dict(), e.status_code, request_mimetype)
@@ -0,0 +1,75 @@
+"""
+Négociation de contenu pour les API du calculateur (JSON, MessagePack, CBOR)
+JSON reste le format par défaut ; les formats binaires ne sont proposés que si
+la bibliothèque correspondante est installée
+"""
+
+import json
+
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+from api.schema import ValidationError
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    cbor2 = None
+
+JSON_MIMETYPE = "application/json"
+
+
+def dump_json(payload):
+    """Sérialise comme le fournisseur JSON de Flask (clés triées, compact, saut de ligne final)"""
+    return (json.dumps(payload, sort_keys=True, separators=(",", ":")) + "\n").encode()
+
+
+class Codec:
+    """Format de sérialisation : type MIME canonique, décodeur et encodeur"""
+
+    __slots__ = ("mimetype", "loads", "dumps")
+
+    def __init__(self, mimetype, loads, dumps):
+        self.mimetype = mimetype
+        self.loads = loads
+        self.dumps = dumps
+
+    def decode(self, data):
+        """Décode un corps de requête ; lève ValidationError s'il est illisible"""
+        try:
+            return self.loads(data)
+        except Exception:
+            raise ValidationError("Invalid request body") from None
+
+
+# Type MIME (y compris alias) -> Codec
+CODECS = {JSON_MIMETYPE: Codec(JSON_MIMETYPE, json.loads, dump_json)}
+
+if msgpack is not None:
+    CODECS["application/msgpack"] = CODECS["application/x-msgpack"] = Codec(
+        "application/msgpack", lambda data: msgpack.unpackb(data, raw=False), msgpack.packb
+    )
+
+if cbor2 is not None:
+    CODECS["application/cbor"] = Codec("application/cbor", cbor2.loads, cbor2.dumps)
+
+# Types proposés à la négociation, JSON en premier (choix par défaut pour */*)
+MIMETYPES = list(dict.fromkeys(codec.mimetype for codec in CODECS.values()))
+
+UNSUPPORTED_CONTENT_TYPE = "Content-Type must be " + " or ".join(filter(None, [", ".join(MIMETYPES[:-1]), MIMETYPES[-1]]))
+
+
+def negotiate(accept, request_mimetype=JSON_MIMETYPE):
+    """
+    Choisit le type MIME de la réponse
+    Sans en-tête Accept, la réponse reprend le format de la requête ;
+    si aucun type accepté n'est disponible, JSON est utilisé
+    """
+    if not accept:
+        return request_mimetype
+    return parse_accept_header(accept, MIMEAccept).best_match(MIMETYPES, default=JSON_MIMETYPE)
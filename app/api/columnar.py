@@ -0,0 +1,71 @@
+"""
+Format binaire colonnaire pour les calculs en masse
+
+Requête (little-endian) :
+    0   4   magic b"CALC"
+    4   1   version (1)
+    5   1   code d'opération (voir OPERATION_CODES)
+    6   2   réservé (0)
+    8   8   n : nombre de lignes (uint64)
+    16  8n  colonne a (float64)
+    ..  8n  colonne b (float64)
+
+Réponse : même en-tête avec le magic b"CALR", suivi de la colonne résultat (float64)
+Les colonnes sont lues directement dans le tampon de la requête (numpy.frombuffer),
+sans objet Python par élément.
+"""
+
+import struct
+
+import numpy as np
+
+from api.schema import ValidationError
+
+COLUMNAR_MIMETYPE = "application/vnd.calculator.columns"
+REQUEST_MAGIC = b"CALC"
+RESPONSE_MAGIC = b"CALR"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHQ")
+FLOAT64 = np.dtype("<f8")
+
+
+def encode_columns(operation_code, a, b):
+    """Construit une requête colonnaire (utilisé par les clients et les tests)"""
+    a = np.ascontiguousarray(a, dtype=FLOAT64)
+    b = np.ascontiguousarray(b, dtype=FLOAT64)
+    if a.shape != b.shape or a.ndim != 1:
+        raise ValueError("columns a and b must be 1-D arrays of the same length")
+    return HEADER.pack(REQUEST_MAGIC, VERSION, operation_code, 0, len(a)) + a.tobytes() + b.tobytes()
+
+
+def decode_columns(data):
+    """
+    Décode une requête colonnaire sans copie
+    Retourne (code d'opération, colonne a, colonne b) ; lève ValidationError si la trame est invalide
+    """
+    if len(data) < HEADER.size:
+        raise ValidationError("Truncated columnar header")
+    magic, version, operation_code, _, rows = HEADER.unpack_from(data)
+    if magic != REQUEST_MAGIC or version != VERSION:
+        raise ValidationError("Unsupported columnar frame")
+    if len(data) != HEADER.size + 2 * rows * FLOAT64.itemsize:
+        raise ValidationError("Columnar frame length does not match its header")
+
+    view = memoryview(data)
+    a = np.frombuffer(view, dtype=FLOAT64, count=rows, offset=HEADER.size)
+    b = np.frombuffer(view, dtype=FLOAT64, count=rows, offset=HEADER.size + rows * FLOAT64.itemsize)
+    return operation_code, a, b
+
+
+def encode_result(operation_code, result):
+    """Construit la réponse colonnaire"""
+    result = np.ascontiguousarray(result, dtype=FLOAT64)
+    return HEADER.pack(RESPONSE_MAGIC, VERSION, operation_code, 0, len(result)) + result.tobytes()
+
+
+def decode_result(data):
+    """Décode une réponse colonnaire ; retourne (code d'opération, colonne résultat)"""
+    magic, version, operation_code, _, rows = HEADER.unpack_from(data)
+    if magic != RESPONSE_MAGIC or version != VERSION:
+        raise ValueError("not a columnar result frame")
+    return operation_code, np.frombuffer(data, dtype=FLOAT64, count=rows, offset=HEADER.size)
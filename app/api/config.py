@@ -0,0 +1,90 @@
+"""
+Configuration de l'application lue depuis les variables d'environnement
+Partagée par create_app() (WSGI) et create_asgi_app() (ASGI) pour que les deux modes restent alignés
+"""
+
+import os
+import tempfile
+
+
+def load_config():
+    """Retourne la configuration (dictionnaire de clés en majuscules) à partir de l'environnement"""
+    config = {}
+
+    # Configuration de base
+    config["DEBUG"] = os.getenv("DEBUG", "false").lower() == "true"
+    config["HOST"] = os.getenv("HOST", "127.0.0.1")  # Default to localhost for security
+    config["PORT"] = int(os.getenv("PORT", 5000))
+    config["VERSION"] = os.getenv("VERSION", "1.0.0")
+    config["LOG_LEVEL"] = os.getenv("LOG_LEVEL", "INFO")
+
+    # Politiques de cache HTTP par blueprint (en-tête Cache-Control)
+    config["HTTP_CACHE_POLICIES"] = {
+        "hello": os.getenv("CACHE_CONTROL_HELLO", "public, max-age=60"),
+        "health": os.getenv("CACHE_CONTROL_HEALTH", "no-cache"),
+    }
+
+    # Contrôle d'admission (0 désactive la limite correspondante)
+    # Limite de débit désactivée par défaut : derrière l'ingress, remote_addr est l'adresse du proxy
+    config["RATE_LIMIT_RPS"] = float(os.getenv("RATE_LIMIT_RPS", 0))
+    config["RATE_LIMIT_BURST"] = float(os.getenv("RATE_LIMIT_BURST", 100))
+    config["MAX_CONCURRENT_REQUESTS"] = int(os.getenv("MAX_CONCURRENT_REQUESTS", 32))
+    config["ADAPTIVE_CONCURRENCY"] = os.getenv("ADAPTIVE_CONCURRENCY", "false").lower() == "true"
+    config["ADAPTIVE_CONCURRENCY_MAX"] = int(os.getenv("ADAPTIVE_CONCURRENCY_MAX", 1000))
+    config["ADMISSION_BLUEPRINTS"] = ("calculator",)
+
+    # Taille maximale des corps de requête par blueprint (octets)
+    config["BODY_SIZE_LIMITS"] = {
+        "calculator": int(os.getenv("BODY_LIMIT_CALCULATOR", 16 * 1024)),
+        "calculator.calculate_columnar": int(os.getenv("BODY_LIMIT_COLUMNAR", 256 * 1024 * 1024)),
+        # Flux binaire lu par blocs en mémoire bornée : pas de limite globale
+        "calculator.aggregate": None,
+        # CSV lu en flux, mais borné : les lignes HEAVY occupent le pool de processus
+        "calculator.calculate_csv": int(os.getenv("BODY_LIMIT_CSV", 64 * 1024 * 1024)),
+        "calculator.linalg": int(os.getenv("BODY_LIMIT_LINALG", 32 * 1024 * 1024)),
+        "jobs": int(os.getenv("BODY_LIMIT_JOBS", 1024 * 1024)),
+    }
+    config["AGGREGATE_JSON_MAX_BYTES"] = int(os.getenv("BODY_LIMIT_AGGREGATE_JSON", 16 * 1024 * 1024))
+
+    # Opérations matricielles : taille maximale des tableaux et délestage vers un pool de threads
+    config["LINALG_MAX_ELEMENTS"] = int(os.getenv("LINALG_MAX_ELEMENTS", 1_000_000))
+    config["LINALG_OFFLOAD_THRESHOLD"] = int(os.getenv("LINALG_OFFLOAD_THRESHOLD", 65536))
+    config["LINALG_THREADS"] = int(os.getenv("LINALG_THREADS", 4))
+
+    # Pool de processus pour les opérations lourdes (file bornée, délai en secondes)
+    config["OFFLOAD_WORKERS"] = int(os.getenv("OFFLOAD_WORKERS", 2))
+    config["OFFLOAD_QUEUE_SIZE"] = int(os.getenv("OFFLOAD_QUEUE_SIZE", 16))
+    config["OFFLOAD_TIMEOUT"] = float(os.getenv("OFFLOAD_TIMEOUT", 5))
+
+    # Calculs asynchrones : file SQLite locale, workers et durée de conservation des résultats
+    config["JOBS_DATABASE"] = os.getenv("JOBS_DATABASE", os.path.join(tempfile.gettempdir(), "calculator-jobs.db"))
+    config["JOB_WORKERS"] = int(os.getenv("JOB_WORKERS", 2))
+    config["JOB_RESULT_TTL"] = float(os.getenv("JOB_RESULT_TTL", 3600))
+    config["JOB_MAX_ITEMS"] = int(os.getenv("JOB_MAX_ITEMS", 1000))
+    config["JOB_MAX_WAIT"] = float(os.getenv("JOB_MAX_WAIT", 30))
+
+    # Idempotency-Key : réponses rejouées sur les reprises (stockage partagé optionnel, ex. /dev/shm/idempotency.db)
+    config["IDEMPOTENCY_ENDPOINTS"] = (
+        "calculator.calculate",
+        "calculator.calculate_columnar",
+        "calculator.linalg",
+        "jobs.submit_job",
+    )
+    config["IDEMPOTENCY_MAX_ENTRIES"] = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", 10_000))
+    config["IDEMPOTENCY_TTL"] = float(os.getenv("IDEMPOTENCY_TTL", 3600))
+    config["IDEMPOTENCY_MAX_RESPONSE_BYTES"] = int(os.getenv("IDEMPOTENCY_MAX_RESPONSE_BYTES", 1024 * 1024))
+    config["IDEMPOTENCY_SHARED_PATH"] = os.getenv("IDEMPOTENCY_SHARED_PATH", "")
+
+    # Historique des calculs : nombre d'entrées du tampon circulaire (33 octets par entrée)
+    config["HISTORY_CAPACITY"] = int(os.getenv("HISTORY_CAPACITY", 65536))
+
+    # Préchauffage des routes avant de déclarer l'application disponible (GET /ready)
+    config["WARMUP_ENABLED"] = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+
+    # Arrêt progressif : délai de drainage des requêtes en cours (inférieur à terminationGracePeriodSeconds)
+    config["SHUTDOWN_DRAIN_TIMEOUT"] = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT", 25))
+
+    # Sessions WebSocket (ASGI) : messages traités simultanément par session
+    config["WS_MAX_IN_FLIGHT"] = int(os.getenv("WS_MAX_IN_FLIGHT", 64))
+
+    return config
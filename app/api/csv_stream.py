@@ -0,0 +1,140 @@
+"""
+Calculs en masse au format CSV, en flux
+
+Entrée : en-tête operation,a,b puis une ligne par calcul. Le corps est lu
+incrémentalement par blocs de CHUNK_ROWS lignes ; chaque bloc est évalué par
+opération avec les implémentations vectorisées de la table de dispatch, puis
+écrit aussitôt dans la réponse (colonnes operation,a,b,result,error).
+La mémoire utilisée dépend de la taille d'un bloc, pas de celle du fichier.
+Les opérations HEAVY sont évaluées ligne par ligne via offload et flight, comme evaluate().
+"""
+
+import csv
+import io
+from itertools import islice
+
+import numpy as np
+
+from api.offload import OffloadError
+from api.schema import ValidationError
+
+CSV_MIMETYPE = "text/csv"
+INPUT_COLUMNS = ("operation", "a", "b")
+OUTPUT_COLUMNS = ("operation", "a", "b", "result", "error")
+CHUNK_ROWS = 65536
+READ_BUFFER_SIZE = 1024 * 1024
+
+NUMERIC_ERROR = "Values a and b must be numeric"
+COLUMNS_ERROR = "Row must have 3 columns: operation,a,b"
+
+
+def open_reader(stream):
+    """Lecteur CSV sur le flux binaire de la requête (décodage UTF-8 tamponné)"""
+    if isinstance(stream, io.RawIOBase):
+        stream = io.BufferedReader(stream, READ_BUFFER_SIZE)
+    return csv.reader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+
+
+def read_header(reader):
+    """Valide l'en-tête ; lève ValidationError s'il est absent ou différent de operation,a,b"""
+    try:
+        header = next(reader, None)
+    except (UnicodeDecodeError, csv.Error):
+        raise ValidationError("Request body must be UTF-8 encoded CSV")
+    if header is None or tuple(column.strip().lower() for column in header) != INPUT_COLUMNS:
+        raise ValidationError(f"CSV header must be: {','.join(INPUT_COLUMNS)}")
+
+
+def parse_floats(values, errors):
+    """Conversion en float64 : vectorisée, ou élément par élément si une valeur est invalide"""
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        pass
+    parsed = np.empty(len(values))
+    for i, value in enumerate(values):
+        try:
+            parsed[i] = float(value)
+        except ValueError:
+            parsed[i] = np.nan
+            errors[i] = errors[i] or NUMERIC_ERROR
+    return parsed
+
+
+class CsvCalculator:
+    """Évaluation de blocs de lignes avec une table de dispatch (voir api/operations.py)"""
+
+    def __init__(self, dispatch, unsupported_error):
+        self.dispatch = dispatch
+        self.names = tuple(dispatch)
+        self.codes = {name: code for code, name in enumerate(self.names)}
+        self.unsupported_error = unsupported_error
+
+    def evaluate_rows(self, rows, offload=None, flight=None):
+        """Retourne (opérations, a, b, résultats, erreurs) pour un bloc de lignes, dans l'ordre"""
+        errors = [""] * len(rows)
+        if any(len(row) != 3 for row in rows):
+            for i, row in enumerate(rows):
+                if len(row) != 3:
+                    errors[i] = COLUMNS_ERROR
+                    rows[i] = (row + ["", "", ""])[:3]
+        operations, a_raw, b_raw = zip(*rows)
+
+        a = parse_floats(a_raw, errors)
+        b = parse_floats(b_raw, errors)
+        codes = np.array([self.codes.get(name.strip(), -1) for name in operations])
+        results = np.full(len(rows), np.nan)
+        failed = np.array([error != "" for error in errors])
+
+        # Les erreurs numériques priment sur l'opération inconnue, comme pour le schéma
+        for i in np.nonzero((codes == -1) & ~failed)[0].tolist():
+            errors[i] = self.unsupported_error
+        failed |= codes == -1
+
+        for code in np.unique(codes[~failed]).tolist():
+            indices = np.nonzero((codes == code) & ~failed)[0]
+            self.evaluate_group(self.dispatch[self.names[code]], indices, a, b, results, errors, offload, flight)
+
+        cells = results.tolist()
+        for i, error in enumerate(errors):
+            if error:
+                cells[i] = ""
+        return operations, a_raw, b_raw, cells, errors
+
+    def evaluate_group(self, entry, indices, a, b, results, errors, offload=None, flight=None):
+        """
+        Une opération sur ses lignes : vectorisée, ou ligne par ligne si le bloc contient une erreur
+        Les appels ligne par ligne passent par offload et flight (opérations HEAVY hors du thread de requête)
+        """
+        if entry.vectorized is not None:
+            try:
+                results[indices] = entry.vectorized(a[indices], b[indices])
+                return
+            except ValidationError:
+                pass
+        for i in indices.tolist():
+            try:
+                results[i] = entry.call(float(a[i]), float(b[i]), offload, flight)
+            except (ValidationError, OffloadError) as e:
+                errors[i] = e.message
+
+    def stream(self, reader, chunk_rows=CHUNK_ROWS, offload=None, flight=None):
+        """Génère la réponse CSV bloc par bloc"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(OUTPUT_COLUMNS)
+        while True:
+            try:
+                chunk = list(islice(reader, chunk_rows))
+            except (UnicodeDecodeError, csv.Error) as e:
+                # Réponse déjà commencée : l'erreur est signalée dans une dernière ligne
+                writer.writerow(("", "", "", "", f"Invalid CSV input: {e}"))
+                chunk = None
+            rows = [row for row in chunk or () if row]
+            if rows:
+                writer.writerows(zip(*self.evaluate_rows(rows, offload, flight)))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            if not chunk:
+                return
@@ -2,25 +2,36 @@
 Endpoint de santé pour l'application Flask
 """
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, current_app, jsonify
 from datetime import datetime, timezone
 
 health_bp = Blueprint("health", __name__)
 
 
+def health_status():
+    """Contenu de la réponse de santé (partagé entre les modes WSGI et ASGI)"""
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "version": "1.0.0",
+    }
+
+
 @health_bp.route("/health", methods=["GET"])
 def health_check():
     """
     Endpoint de vérification de santé de l'application
     Retourne un statut 200 avec un message de santé
     """
-    return (
-        jsonify(
-            {
-                "status": "healthy",
-                "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
-                "version": "1.0.0",
-            }
-        ),
-        200,
-    )
+    return jsonify(health_status()), 200
+
+
+@health_bp.route("/ready", methods=["GET"])
+def readiness():
+    """
+    Endpoint de disponibilité (readinessProbe)
+    Retourne 200 une fois le préchauffage terminé, 503 sinon
+    """
+    if current_app.extensions["readiness"].is_set():
+        return jsonify({"status": "ready"}), 200
+    return jsonify({"status": "not_ready"}), 503
@@ -6,6 +6,8 @@ from flask import Blueprint, jsonify
 
 hello_bp = Blueprint("hello", __name__)
 
+HELLO_MESSAGE = {"message": "Hello World!", "version": "1.0.0"}
+
 
 @hello_bp.route("/hello", methods=["GET"])
 def hello():
@@ -13,4 +15,4 @@ def hello():
     Endpoint de bienvenue
     Retourne un message JSON de bienvenue
     """
-    return jsonify({"message": "Hello World!", "version": "1.0.0"}), 200
+    return jsonify(HELLO_MESSAGE), 200
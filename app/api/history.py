@@ -0,0 +1,169 @@
+"""
+Historique des calculs récents : tampon circulaire en colonnes (struct-of-arrays)
+
+Chaque entrée occupe 33 octets (code d'opération uint8, a, b, résultat et horodatage
+float64) : 1 million d'entrées tiennent en 33 Mo, alloués une fois au démarrage.
+Les horodatages sont croissants dans l'ordre d'écriture, ce qui sert d'index
+temporel : les bornes since/until sont trouvées par recherche dichotomique.
+
+L'historique est propre à chaque processus : sous gunicorn avec plusieurs workers,
+GET /api/history ne retourne que les calculs reçus par le worker qui répond.
+
+GET /api/history?since=&until=&operation=&limit=&cursor=
+"""
+
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+from flask import Blueprint, current_app, jsonify, request
+
+from api.calculator import OPERATION_CODES, OPERATION_NAMES
+
+history_bp = Blueprint("history", __name__)
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class CalculationHistory:
+    """
+    Tampon circulaire de capacité fixe ; chaque entrée a un identifiant séquentiel
+    (les identifiants < written - capacity ont été écrasés)
+    """
+
+    def __init__(self, capacity, clock=time.time):
+        self.capacity = capacity
+        self.clock = clock
+        self.codes = np.zeros(capacity, dtype=np.uint8)
+        self.a = np.zeros(capacity)
+        self.b = np.zeros(capacity)
+        self.results = np.zeros(capacity)
+        self.timestamps = np.zeros(capacity)
+        self.written = 0
+        self._last_timestamp = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        """Mémoire occupée par les colonnes"""
+        return sum(column.nbytes for column in (self.codes, self.a, self.b, self.results, self.timestamps))
+
+    @property
+    def oldest(self):
+        """Identifiant de la plus ancienne entrée conservée"""
+        return max(0, self.written - self.capacity)
+
+    def record(self, code, a, b, result):
+        """Ajoute une entrée (horodatage pris sous verrou et rendu croissant)"""
+        with self._lock:
+            timestamp = max(self.clock(), self._last_timestamp)
+            self._last_timestamp = timestamp
+            position = self.written % self.capacity
+            self.codes[position] = code
+            self.a[position] = a
+            self.b[position] = b
+            self.results[position] = result
+            self.timestamps[position] = timestamp
+            self.written += 1
+
+    def _timestamp(self, entry_id):
+        return self.timestamps[entry_id % self.capacity]
+
+    def query(self, since=None, until=None, code=None, limit=DEFAULT_PAGE_SIZE, cursor=None):
+        """
+        Entrées dans [since, until], filtrées par code d'opération, dans l'ordre d'écriture
+        Retourne (identifiants, codes, a, b, résultats, horodatages, curseur suivant ou None)
+        """
+        # Sous verrou : bornes et copie des codes de l'intervalle (1 octet par entrée)
+        with self._lock:
+            first, end = self.oldest, self.written
+            ids = range(first, end)
+            if since is not None:
+                first = first + bisect_left(ids, since, key=self._timestamp)
+            if until is not None:
+                end = ids.start + bisect_right(ids, until, key=self._timestamp)
+            if cursor is not None:
+                first = max(first, cursor)
+            codes = self._copy_codes(first, end)
+
+        # Hors verrou : filtrage, limit + 1 correspondances (la dernière indique une page suivante)
+        matches = np.flatnonzero(codes == code) if code is not None else np.arange(min(len(codes), limit + 1))
+        entry_ids = first + matches[: limit + 1]
+        next_cursor = int(entry_ids[limit]) if len(entry_ids) > limit else None
+        entry_ids = entry_ids[:limit]
+
+        # Sous verrou : lecture des seules entrées retenues (celles écrasées entre-temps sont omises)
+        with self._lock:
+            entry_ids = entry_ids[entry_ids >= self.oldest]
+            positions = entry_ids % self.capacity
+            return (
+                entry_ids,
+                self.codes[positions],
+                self.a[positions],
+                self.b[positions],
+                self.results[positions],
+                self.timestamps[positions],
+                next_cursor,
+            )
+
+    def _copy_codes(self, first, end):
+        """Copie des codes des entrées [first, end) dans l'ordre d'écriture (appelé avec le verrou acquis)"""
+        if end <= first:
+            return np.empty(0, dtype=np.uint8)
+        start = first % self.capacity
+        stop = start + (end - first)
+        if stop <= self.capacity:
+            return self.codes[start:stop].copy()
+        return np.concatenate((self.codes[start:], self.codes[: stop - self.capacity]))
+
+
+def parse_number(name, cast):
+    """Paramètre de requête optionnel ; lève ValueError avec un message explicite"""
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return cast(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number")
+
+
+@history_bp.route("/history", methods=["GET"])
+def history():
+    """
+    Consultation de l'historique des calculs du worker qui répond
+    Filtres since/until (secondes epoch), operation ; pagination par limit et cursor
+    """
+    try:
+        since = parse_number("since", float)
+        until = parse_number("until", float)
+        cursor = parse_number("cursor", int)
+        limit = parse_number("limit", int)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    limit = DEFAULT_PAGE_SIZE if limit is None else max(1, min(limit, MAX_PAGE_SIZE))
+
+    operation = request.args.get("operation")
+    if operation is not None and operation not in OPERATION_CODES:
+        return jsonify({"error": f"Unsupported operation. Use: {', '.join(OPERATION_CODES)}"}), 400
+    code = None if operation is None else OPERATION_CODES[operation]
+
+    ids, codes, a, b, results, timestamps, next_cursor = current_app.extensions["history"].query(
+        since, until, code, limit, cursor
+    )
+    entries = [
+        {"id": entry_id, "operation": OPERATION_NAMES[entry_code], "a": x, "b": y, "result": r, "timestamp": t}
+        for entry_id, entry_code, x, y, r, t in zip(
+            ids.tolist(), codes.tolist(), a.tolist(), b.tolist(), results.tolist(), timestamps.tolist()
+        )
+    ]
+    return jsonify({"entries": entries, "next_cursor": next_cursor})
+
+
+def init_history(app):
+    """Alloue l'historique des calculs (HISTORY_CAPACITY entrées)"""
+    history = CalculationHistory(app.config["HISTORY_CAPACITY"])
+    app.extensions["history"] = history
+    return history
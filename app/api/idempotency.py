@@ -0,0 +1,271 @@
+"""
+En-tête Idempotency-Key pour les POST du calculateur et des tâches
+
+La première requête pour une clé est exécutée et sa réponse enregistrée ; les
+reprises avec le même corps reçoivent la réponse enregistrée à l'identique.
+- même clé, requête différente : 422
+- même clé alors que la requête d'origine est encore en cours : 409
+Les réponses 5xx ne sont pas enregistrées (la reprise est recalculée).
+
+Deux stockages bornés avec expiration :
+- MemoryIdempotencyStore : par processus (OrderedDict)
+- SqliteIdempotencyStore : partagé entre les workers d'un même nœud via un fichier
+  SQLite sur un tmpfs (/dev/shm), IDEMPOTENCY_SHARED_PATH
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response, g, jsonify, request
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+NEW = "new"
+REPLAY = "replay"
+CONFLICT = "conflict"
+IN_PROGRESS = "in_progress"
+
+# En-têtes recalculés par le serveur à chaque envoi
+EXCLUDED_HEADERS = {"content-length", "date", "server", "retry-after"}
+
+
+def request_fingerprint():
+    """Empreinte de la requête : méthode, route, paramètres, type de contenu et corps"""
+    digest = hashlib.sha256()
+    for part in (request.method, request.path, request.query_string.decode("latin-1"), request.content_type or ""):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    digest.update(request.get_data(cache=True))
+    return digest.hexdigest()
+
+
+def classify(stored_fingerprint, completed, fingerprint):
+    """Décision pour une clé déjà connue"""
+    if stored_fingerprint != fingerprint:
+        return CONFLICT
+    return REPLAY if completed else IN_PROGRESS
+
+
+class IdempotencyEntry:
+    """Réponse enregistrée (ou en attente) pour une clé"""
+
+    __slots__ = ("fingerprint", "response", "expires")
+
+    def __init__(self, fingerprint, expires):
+        self.fingerprint = fingerprint
+        self.response = None
+        self.expires = expires
+
+
+class MemoryIdempotencyStore:
+    """Stockage par processus, borné à max_entries clés expirant après ttl secondes"""
+
+    def __init__(self, max_entries=10_000, ttl=3600.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def begin(self, key, fingerprint):
+        """
+        Réserve une clé ; retourne (NEW, None), (REPLAY, réponse), (CONFLICT, None) ou (IN_PROGRESS, None)
+        Une réponse est un tuple (statut, en-têtes, corps)
+        """
+        now = self.clock()
+        with self._lock:
+            # Même durée de vie pour toutes les clés : les plus anciennes sont en tête
+            while self.entries:
+                oldest = next(iter(self.entries.values()))
+                if oldest.expires > now and len(self.entries) < self.max_entries:
+                    break
+                self.entries.popitem(last=False)
+
+            entry = self.entries.get(key)
+            if entry is None:
+                self.entries[key] = IdempotencyEntry(fingerprint, now + self.ttl)
+                return NEW, None
+            decision = classify(entry.fingerprint, entry.response is not None, fingerprint)
+            return decision, entry.response if decision == REPLAY else None
+
+    def complete(self, key, response):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry.response = response
+
+    def abandon(self, key):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry.response is None:
+                del self.entries[key]
+
+
+class SqliteIdempotencyStore:
+    """
+    Stockage partagé entre processus (fichier SQLite, de préférence sur /dev/shm)
+    Même interface que MemoryIdempotencyStore
+    """
+
+    TRIM_EVERY = 64
+
+    def __init__(self, path, max_entries=10_000, ttl=3600.0, clock=time.time):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._local = threading.local()
+        self._inserts = 0
+        self.connection().executescript("""
+            CREATE TABLE IF NOT EXISTS idempotency (
+                key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                status INTEGER,
+                headers TEXT,
+                body BLOB,
+                expires REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idempotency_expires ON idempotency (expires);
+            """)
+
+    def connection(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=OFF")
+            self._local.db = db
+        return db
+
+    def begin(self, key, fingerprint):
+        now = self.clock()
+        db = self.connection()
+        # Insertion atomique ; une entrée expirée est remplacée
+        inserted = db.execute(
+            "INSERT INTO idempotency (key, fingerprint, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET fingerprint = excluded.fingerprint, status = NULL, "
+            "headers = NULL, body = NULL, expires = excluded.expires WHERE idempotency.expires <= ?",
+            (key, fingerprint, now + self.ttl, now),
+        ).rowcount
+        if inserted:
+            self._trim(db, now)
+            return NEW, None
+
+        row = db.execute("SELECT fingerprint, status, headers, body FROM idempotency WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return self.begin(key, fingerprint)
+        stored_fingerprint, status, headers, body = row
+        decision = classify(stored_fingerprint, status is not None, fingerprint)
+        if decision != REPLAY:
+            return decision, None
+        return decision, (status, [tuple(header) for header in json.loads(headers)], bytes(body))
+
+    def _trim(self, db, now):
+        """Purge périodique des clés expirées puis des plus anciennes au-delà de max_entries"""
+        self._inserts += 1
+        if self._inserts % self.TRIM_EVERY:
+            return
+        db.execute("DELETE FROM idempotency WHERE expires <= ?", (now,))
+        db.execute(
+            "DELETE FROM idempotency WHERE key IN (SELECT key FROM idempotency ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def complete(self, key, response):
+        status, headers, body = response
+        self.connection().execute(
+            "UPDATE idempotency SET status = ?, headers = ?, body = ? WHERE key = ?", (status, json.dumps(headers), body, key)
+        )
+
+    def abandon(self, key):
+        self.connection().execute("DELETE FROM idempotency WHERE key = ? AND status IS NULL", (key,))
+
+
+def replay(response):
+    """Reconstruit une réponse enregistrée"""
+    status, headers, body = response
+    replayed = Response(body, status=status, headers=headers)
+    replayed.headers[REPLAYED_HEADER] = "true"
+    return replayed
+
+
+def error_response(message, status):
+    response = jsonify({"error": message})
+    response.status_code = status
+    return response
+
+
+def begin_idempotent_request(store, key):
+    """
+    Réserve la clé d'une requête ; retourne la réponse à renvoyer (erreur ou rejeu),
+    ou None si la requête doit être exécutée
+    """
+    if not key or len(key) > MAX_KEY_LENGTH:
+        return error_response(f"{IDEMPOTENCY_HEADER} must be 1 to {MAX_KEY_LENGTH} characters", 400)
+
+    decision, stored = store.begin(key, request_fingerprint())
+    if decision == REPLAY:
+        return replay(stored)
+    if decision == CONFLICT:
+        return error_response(f"{IDEMPOTENCY_HEADER} was already used with a different request", 422)
+    if decision == IN_PROGRESS:
+        response = error_response(f"A request with this {IDEMPOTENCY_HEADER} is still in progress", 409)
+        response.headers["Retry-After"] = "1"
+        return response
+    g.idempotency_key = key
+    return None
+
+
+def record_response(store, key, response, max_bytes):
+    """Enregistre la réponse pour les reprises ; libère la clé si elle ne doit pas être rejouée"""
+    if response.status_code >= 500 or response.is_streamed:
+        store.abandon(key)
+        return
+    body = response.get_data()
+    if len(body) > max_bytes:
+        store.abandon(key)
+        return
+    headers = [(name, value) for name, value in response.headers.items() if name.lower() not in EXCLUDED_HEADERS]
+    store.complete(key, (response.status_code, headers, body))
+
+
+def init_idempotency(app):
+    """
+    Active Idempotency-Key sur les endpoints de IDEMPOTENCY_ENDPOINTS
+    Stockage partagé si IDEMPOTENCY_SHARED_PATH est défini, sinon par processus
+    """
+    config = app.config
+    if config.get("IDEMPOTENCY_SHARED_PATH"):
+        store = SqliteIdempotencyStore(
+            config["IDEMPOTENCY_SHARED_PATH"], config["IDEMPOTENCY_MAX_ENTRIES"], config["IDEMPOTENCY_TTL"]
+        )
+    else:
+        store = MemoryIdempotencyStore(config["IDEMPOTENCY_MAX_ENTRIES"], config["IDEMPOTENCY_TTL"])
+    app.extensions["idempotency"] = store
+
+    @app.before_request
+    def check_idempotency_key():
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None or request.method != "POST" or request.endpoint not in config["IDEMPOTENCY_ENDPOINTS"]:
+            return None
+        return begin_idempotent_request(store, key)
+
+    @app.after_request
+    def store_idempotent_response(response):
+        key = g.pop("idempotency_key", None)
+        if key is not None:
+            record_response(store, key, response, config["IDEMPOTENCY_MAX_RESPONSE_BYTES"])
+        return response
+
+    @app.teardown_request
+    def release_idempotency_key(exc):
+        # Exception non interceptée avant after_request : la clé est libérée pour la reprise
+        key = g.pop("idempotency_key", None)
+        if key is not None:
+            store.abandon(key)
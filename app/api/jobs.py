@@ -0,0 +1,350 @@
+"""
+Calculs asynchrones : file de tâches locale et durable (SQLite en mode WAL)
+
+POST /api/jobs soumet un lot de calculs et retourne immédiatement un identifiant ;
+GET /api/jobs/<id> retourne l'état et les résultats (attente longue avec ?wait=secondes).
+Les tâches survivent à un redémarrage : celles restées en cours plus de stale_after secondes
+(processus arrêté en cours de route) sont remises en file périodiquement par les workers.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+from flask import Blueprint, current_app, jsonify, request, url_for
+
+from api.calculator import evaluate, validate_calculation
+from api.metrics import JOB_LATENCY, JOB_QUEUE_DEPTH
+from api.offload import OffloadError
+from api.schema import ValidationError
+
+jobs_bp = Blueprint("jobs", __name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    items TEXT NOT NULL,
+    results TEXT,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created);
+"""
+
+
+class JobStore:
+    """Accès à la base SQLite : une connexion par thread, écritures atomiques"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self.connection() as db:
+            db.executescript(SCHEMA)
+
+    def connection(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.row_factory = sqlite3.Row
+            self._local.db = db
+        return db
+
+    def submit(self, items, now):
+        job_id = uuid.uuid4().hex
+        self.connection().execute(
+            "INSERT INTO jobs (id, status, items, created) VALUES (?, ?, ?, ?)", (job_id, QUEUED, json.dumps(items), now)
+        )
+        return job_id
+
+    def claim(self, now):
+        """Passe la plus ancienne tâche en file à l'état running ; retourne sa ligne ou None"""
+        # fetchall : l'instruction doit se terminer pour que l'écriture soit validée
+        rows = (
+            self.connection()
+            .execute(
+                "UPDATE jobs SET status = ?, started = ? "
+                "WHERE id = (SELECT id FROM jobs WHERE status = ? ORDER BY created LIMIT 1) "
+                "RETURNING id, items, created",
+                (RUNNING, now, QUEUED),
+            )
+            .fetchall()
+        )
+        return rows[0] if rows else None
+
+    def complete(self, job_id, results, now):
+        self.connection().execute(
+            "UPDATE jobs SET status = ?, results = ?, finished = ? WHERE id = ?", (DONE, json.dumps(results), now, job_id)
+        )
+
+    def fail(self, job_id, error, now):
+        """Termine une tâche en échec : le message est conservé à la place des résultats"""
+        self.connection().execute(
+            "UPDATE jobs SET status = ?, results = ?, finished = ? WHERE id = ?",
+            (FAILED, json.dumps({"error": error}), now, job_id),
+        )
+
+    def get(self, job_id):
+        return self.connection().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+    def queue_depth(self):
+        return self.connection().execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+
+    def unfinished(self):
+        """Nombre de tâches en file ou en cours (éventuellement interrompues)"""
+        return self.connection().execute("SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)).fetchone()[0]
+
+    def requeue_running(self, started_before):
+        """Remet en file les tâches démarrées avant started_before (interrompues par un arrêt du processus)"""
+        self.connection().execute(
+            "UPDATE jobs SET status = ?, started = NULL WHERE status = ? AND started < ?", (QUEUED, RUNNING, started_before)
+        )
+
+    def purge(self, older_than):
+        """Supprime les tâches terminées avant older_than ; retourne le nombre de tâches supprimées"""
+        return (
+            self.connection()
+            .execute("DELETE FROM jobs WHERE status IN (?, ?) AND finished < ?", (DONE, FAILED, older_than))
+            .rowcount
+        )
+
+
+def run_items(items, offload=None, flight=None):
+    """Exécute un lot : un résultat ou une erreur par élément, dans l'ordre"""
+    results = []
+    for item in items:
+        try:
+            results.append(evaluate(item, offload, flight))
+        except (ValidationError, OffloadError) as e:
+            results.append(e.to_dict())
+    return results
+
+
+class JobQueue:
+    """
+    File de tâches et pool de workers (threads démarrés à la première soumission,
+    ou dès la création par init_jobs si la base contient des tâches non terminées)
+    Les workers interrogent aussi la base : une file partagée entre processus reste servie
+    """
+
+    def __init__(
+        self,
+        store,
+        workers=2,
+        result_ttl=3600.0,
+        stale_after=300.0,
+        poll_interval=0.5,
+        offload=None,
+        flight=None,
+        logger=None,
+        clock=time.time,
+    ):
+        self.store = store
+        self.workers = workers
+        self.result_ttl = result_ttl
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+        self.offload = offload
+        self.flight = flight
+        self.logger = logger
+        self.clock = clock
+        self._threads = []
+        self._stop = threading.Event()
+        self._changed = threading.Condition()
+        self._next_purge = 0.0
+        self._next_requeue = 0.0
+        self.requeue_stale()
+
+    def submit(self, items):
+        """Enregistre un lot de calculs et retourne l'identifiant de la tâche"""
+        job_id = self.store.submit(items, self.clock())
+        JOB_QUEUE_DEPTH.set(self.store.queue_depth())
+        self.start()
+        with self._changed:
+            self._changed.notify_all()
+        return job_id
+
+    def start(self):
+        """Démarre les workers s'ils ne tournent pas encore"""
+        with self._changed:
+            if self._threads:
+                return
+            self._stop.clear()
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout=5.0):
+        """Arrête les workers après la tâche en cours"""
+        self._stop.set()
+        with self._changed:
+            threads, self._threads = self._threads, []
+            self._changed.notify_all()
+        for thread in threads:
+            thread.join(timeout)
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                self.purge_expired()
+                self.requeue_stale()
+                job = self.store.claim(self.clock())
+            except sqlite3.Error as e:
+                self._log_error("Jobs: queue unavailable: %s", e)
+                job = None
+            if job is None:
+                with self._changed:
+                    self._changed.wait(self.poll_interval)
+                continue
+
+            try:
+                self._run(job)
+            except Exception as e:
+                # La tâche est marquée en échec ; si la base reste inaccessible, requeue_stale la reprendra
+                self._log_error("Jobs: job %s failed: %s", job["id"], e)
+                try:
+                    self.store.fail(job["id"], f"Job failed: {e}", self.clock())
+                except sqlite3.Error:
+                    pass
+            with self._changed:
+                self._changed.notify_all()
+
+    def _run(self, job):
+        """Exécute une tâche réclamée et enregistre ses résultats"""
+        started = self.clock()
+        JOB_QUEUE_DEPTH.set(self.store.queue_depth())
+        JOB_LATENCY.labels(phase="queued").observe(started - job["created"])
+        results = run_items(json.loads(job["items"]), self.offload, self.flight)
+        finished = self.clock()
+        self.store.complete(job["id"], results, finished)
+        JOB_LATENCY.labels(phase="running").observe(finished - started)
+
+    def _log_error(self, message, *args):
+        if self.logger is not None:
+            self.logger.error(message, *args)
+
+    def purge_expired(self):
+        """Supprime les résultats plus vieux que result_ttl (au plus une fois par minute)"""
+        now = self.clock()
+        if now < self._next_purge:
+            return 0
+        self._next_purge = now + min(60.0, self.result_ttl)
+        return self.store.purge(now - self.result_ttl)
+
+    def requeue_stale(self):
+        """
+        Remet en file les tâches en cours depuis plus de stale_after secondes (au plus une fois par minute)
+        La base est partagée entre processus : une tâche récente peut être en cours ailleurs
+        """
+        now = self.clock()
+        if now < self._next_requeue:
+            return
+        self._next_requeue = now + min(60.0, self.stale_after)
+        self.store.requeue_running(now - self.stale_after)
+
+    def wait(self, job_id, timeout):
+        """Attend la fin d'une tâche au plus timeout secondes ; retourne sa ligne (None si inconnue)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.store.get(job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job["status"] in (DONE, FAILED) or remaining <= 0:
+                return job
+            # Réveil à chaque fin de tâche locale, et interrogation pour celles des autres processus
+            with self._changed:
+                self._changed.wait(min(remaining, self.poll_interval))
+
+
+def job_representation(job):
+    """Charge utile JSON d'une tâche"""
+    payload = {"id": job["id"], "status": job["status"], "created": job["created"]}
+    if job["status"] == DONE:
+        payload["finished"] = job["finished"]
+        payload["results"] = json.loads(job["results"])
+    elif job["status"] == FAILED:
+        payload["finished"] = job["finished"]
+        payload["error"] = json.loads(job["results"])["error"]
+    return payload
+
+
+def validate_items(data, max_items):
+    """Valide un lot {"items": [...]} avant mise en file ; les erreurs d'exécution restent par élément"""
+    if not isinstance(data, dict) or not isinstance(data.get("items"), list) or not data["items"]:
+        raise ValidationError("Request body must be a JSON object with a non-empty items list")
+    items = data["items"]
+    if len(items) > max_items:
+        raise ValidationError(f"A job is limited to {max_items} items")
+    for index, item in enumerate(items):
+        try:
+            validate_calculation(item)
+        except ValidationError as e:
+            raise ValidationError(f"Item {index}: {e.message}")
+    return items
+
+
+@jobs_bp.route("/jobs", methods=["POST"])
+def submit_job():
+    """
+    Soumission d'un lot de calculs
+    Retourne 202 avec l'identifiant de la tâche et son URL de suivi
+    """
+    if not request.is_json:
+        return jsonify({"error": "Content-Type must be application/json"}), 400
+    try:
+        items = validate_items(request.get_json(), current_app.config["JOB_MAX_ITEMS"])
+    except ValidationError as e:
+        return jsonify(e.to_dict()), e.status_code
+
+    job_id = current_app.extensions["jobs"].submit(items)
+    response = jsonify({"id": job_id, "status": QUEUED})
+    response.status_code = 202
+    response.headers["Location"] = url_for("jobs.get_job", job_id=job_id)
+    return response
+
+
+@jobs_bp.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """
+    État et résultats d'une tâche
+    ?wait=N attend jusqu'à N secondes (plafonné à JOB_MAX_WAIT) que la tâche se termine
+    """
+    try:
+        wait = float(request.args.get("wait", 0))
+    except ValueError:
+        return jsonify({"error": "wait must be a number of seconds"}), 400
+    wait = max(0.0, min(wait, current_app.config["JOB_MAX_WAIT"]))
+
+    job = current_app.extensions["jobs"].wait(job_id, wait)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job_representation(job))
+
+
+def init_jobs(app):
+    """
+    Crée la file de tâches (JOBS_DATABASE, JOB_WORKERS, JOB_RESULT_TTL)
+    Les workers démarrent à la demande, ou immédiatement s'il reste des tâches d'une exécution précédente
+    """
+    queue = JobQueue(
+        JobStore(app.config["JOBS_DATABASE"]),
+        workers=app.config["JOB_WORKERS"],
+        result_ttl=app.config["JOB_RESULT_TTL"],
+        offload=app.extensions.get("offload"),
+        flight=app.extensions.get("singleflight"),
+        logger=app.logger,
+    )
+    app.extensions["jobs"] = queue
+    if queue.store.unfinished():
+        queue.start()
+    return queue
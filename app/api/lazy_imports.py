@@ -0,0 +1,26 @@
+"""
+Imports différés (importlib.util.LazyLoader)
+
+lazy_import(name) enregistre le module sans l'exécuter : le coût de l'import est payé
+au premier accès à un attribut. Réservé aux dépendances lourdes absentes du chemin des
+premières requêtes (psutil pour /metrics, multiprocessing pour le pool de processus).
+"""
+
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """Module name chargé au premier accès à un attribut (ou le module déjà importé)"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,178 @@
+"""
+Opérations vectorielles et matricielles (noyaux NumPy)
+
+Les formes sont validées avant toute allocation ou tout calcul : au plus deux
+dimensions et un nombre d'éléments borné, en entrée comme en sortie.
+
+Format binaire (little-endian) :
+    0   4   magic b"MATX" (b"MATR" pour la réponse)
+    4   1   version (1)
+    5   1   code d'opération (voir ARRAY_OPERATION_CODES)
+    6   1   nombre de dimensions de a (du résultat pour la réponse)
+    7   1   nombre de dimensions de b (0 pour la réponse)
+    8   4d  dimensions de a puis de b (uint32)
+    ..      données de a puis de b (float64, ordre C)
+"""
+
+import math
+import struct
+
+import numpy as np
+
+from api.columnar import FLOAT64
+from api.schema import ValidationError
+
+ARRAYS_MIMETYPE = "application/vnd.calculator.arrays"
+REQUEST_MAGIC = b"MATX"
+RESPONSE_MAGIC = b"MATR"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBB")
+DIMENSION = struct.Struct("<I")
+MAX_NDIM = 2
+
+
+def elementwise_shape(shape_a, shape_b):
+    """Opérations élément par élément : formes identiques"""
+    if shape_a != shape_b:
+        raise ValidationError(f"Shapes {list(shape_a)} and {list(shape_b)} must match")
+    return shape_a
+
+
+def dot_shape(shape_a, shape_b):
+    """Produit scalaire : deux vecteurs de même longueur"""
+    if len(shape_a) != 1 or shape_a != shape_b:
+        raise ValidationError("dot requires two vectors of the same length")
+    return ()
+
+
+def matmul_shape(shape_a, shape_b):
+    """Produit matriciel : (n, k) @ (k,) ou (n, k) @ (k, m)"""
+    if len(shape_a) != 2 or shape_a[1] != shape_b[0]:
+        raise ValidationError(f"Cannot multiply shapes {list(shape_a)} and {list(shape_b)}")
+    return (shape_a[0],) + shape_b[1:]
+
+
+def solve_shape(shape_a, shape_b):
+    """Système linéaire : a carrée (n, n), b de forme (n,) ou (n, m)"""
+    if len(shape_a) != 2 or shape_a[0] != shape_a[1]:
+        raise ValidationError("solve requires a square matrix a")
+    if shape_b[0] != shape_a[0]:
+        raise ValidationError(f"Cannot solve shapes {list(shape_a)} and {list(shape_b)}")
+    return shape_b
+
+
+def solve(a, b):
+    """Résout a @ x = b ; une matrice singulière est une erreur de l'appelant"""
+    try:
+        return np.linalg.solve(a, b)
+    except np.linalg.LinAlgError:
+        raise ValidationError("Matrix is singular")
+
+
+# Noyaux matriciels : nom -> (noyau, règle de forme)
+MATRIX_OPERATIONS = {
+    "dot": (np.dot, dot_shape),
+    "matmul": (np.matmul, matmul_shape),
+    "solve": (solve, solve_shape),
+}
+
+# Codes binaires des opérations matricielles (les opérations élément par élément ont ceux du registre)
+MATRIX_OPERATION_CODES = {"dot": 4, "matmul": 5, "solve": 6}
+
+
+def check_shapes(shape_rule, shape_a, shape_b, max_elements):
+    """
+    Valide les formes des opérandes et du résultat sans rien allouer
+    Retourne la forme du résultat ; lève ValidationError si une limite est dépassée
+    """
+    for shape in (shape_a, shape_b):
+        if not 1 <= len(shape) <= MAX_NDIM:
+            raise ValidationError(f"Arrays must have between 1 and {MAX_NDIM} dimensions")
+        if 0 in shape:
+            raise ValidationError("Arrays must not be empty")
+        if math.prod(shape) > max_elements:
+            raise ValidationError(f"Arrays are limited to {max_elements} elements")
+    shape = shape_rule(shape_a, shape_b)
+    if math.prod(shape) > max_elements:
+        raise ValidationError(f"Result is limited to {max_elements} elements")
+    return shape
+
+
+def infer_shape(value):
+    """Forme d'une liste JSON imbriquée, déduite du premier élément de chaque niveau"""
+    shape = []
+    while isinstance(value, list):
+        shape.append(len(value))
+        if not value or len(shape) > MAX_NDIM:
+            break
+        value = value[0]
+    return tuple(shape)
+
+
+def to_array(value, shape):
+    """Convertit une liste JSON déjà validée ; refuse les tableaux irréguliers ou non numériques"""
+    try:
+        array = np.asarray(value, dtype=FLOAT64)
+    except (TypeError, ValueError):
+        raise ValidationError("Arrays must be rectangular lists of numbers")
+    if array.shape != shape:
+        raise ValidationError("Arrays must be rectangular lists of numbers")
+    if not np.isfinite(array).all():
+        raise ValidationError("Arrays must contain finite numbers")
+    return array
+
+
+def encode_arrays(operation_code, a, b):
+    """Construit une requête binaire (utilisé par les clients et les tests)"""
+    a = np.ascontiguousarray(a, dtype=FLOAT64)
+    b = np.ascontiguousarray(b, dtype=FLOAT64)
+    dims = b"".join(DIMENSION.pack(d) for d in a.shape + b.shape)
+    return HEADER.pack(REQUEST_MAGIC, VERSION, operation_code, a.ndim, b.ndim) + dims + a.tobytes() + b.tobytes()
+
+
+def decode_header(data):
+    """
+    Lit l'en-tête d'une requête binaire sans toucher aux données
+    Retourne (code d'opération, forme de a, forme de b)
+    """
+    if len(data) < HEADER.size:
+        raise ValidationError("Truncated array header")
+    magic, version, operation_code, ndim_a, ndim_b = HEADER.unpack_from(data)
+    if magic != REQUEST_MAGIC or version != VERSION:
+        raise ValidationError("Unsupported array frame")
+    if len(data) < HEADER.size + (ndim_a + ndim_b) * DIMENSION.size:
+        raise ValidationError("Truncated array header")
+    dims = [DIMENSION.unpack_from(data, HEADER.size + i * DIMENSION.size)[0] for i in range(ndim_a + ndim_b)]
+    return operation_code, tuple(dims[:ndim_a]), tuple(dims[ndim_a:])
+
+
+def decode_arrays(data, shape_a, shape_b):
+    """Vues sans copie sur les données d'une requête dont les formes ont été validées"""
+    offset = HEADER.size + (len(shape_a) + len(shape_b)) * DIMENSION.size
+    size_a, size_b = math.prod(shape_a), math.prod(shape_b)
+    if len(data) != offset + (size_a + size_b) * FLOAT64.itemsize:
+        raise ValidationError("Array frame length does not match its header")
+
+    view = memoryview(data)
+    a = np.frombuffer(view, dtype=FLOAT64, count=size_a, offset=offset).reshape(shape_a)
+    b = np.frombuffer(view, dtype=FLOAT64, count=size_b, offset=offset + size_a * FLOAT64.itemsize).reshape(shape_b)
+    if not (np.isfinite(a).all() and np.isfinite(b).all()):
+        raise ValidationError("Arrays must contain finite numbers")
+    return a, b
+
+
+def encode_array_result(operation_code, result):
+    """Construit la réponse binaire (un produit scalaire donne un tableau de dimension 0)"""
+    result = np.asarray(result, dtype=FLOAT64)
+    dims = b"".join(DIMENSION.pack(d) for d in result.shape)
+    return HEADER.pack(RESPONSE_MAGIC, VERSION, operation_code, result.ndim, 0) + dims + result.tobytes()
+
+
+def decode_array_result(data):
+    """Décode une réponse binaire ; retourne (code d'opération, tableau résultat)"""
+    magic, version, operation_code, ndim, _ = HEADER.unpack_from(data)
+    if magic != RESPONSE_MAGIC or version != VERSION:
+        raise ValueError("not an array result frame")
+    shape = tuple(DIMENSION.unpack_from(data, HEADER.size + i * DIMENSION.size)[0] for i in range(ndim))
+    offset = HEADER.size + ndim * DIMENSION.size
+    return operation_code, np.frombuffer(data, dtype=FLOAT64, count=math.prod(shape), offset=offset).reshape(shape)
@@ -3,10 +3,14 @@ Metrics endpoint for Prometheus monitoring
 """
 
 import time
-import psutil
 from flask import Blueprint, Response
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
 
+from api.lazy_imports import lazy_import
+
+# Only needed by /metrics: loaded on the first scrape instead of at startup
+psutil = lazy_import("psutil")
+
 # Create Blueprint
 metrics_bp = Blueprint("metrics", __name__)
 
@@ -24,6 +28,50 @@ DISK_USAGE = Gauge("system_disk_usage_percent", "Current disk usage percentage")
 # Application metrics
 APP_INFO = Gauge("flask_app_info", "Application information", ["version", "python_version"])
 ACTIVE_CONNECTIONS = Gauge("flask_active_connections", "Number of active connections")
+WARMUP_DURATION = Gauge("flask_warmup_duration_seconds", "Duration of the startup warmup phase")
+SHUTDOWN_DRAIN_DURATION = Gauge("flask_shutdown_drain_seconds", "Time spent draining in-flight requests on shutdown")
+SHUTDOWN_ABANDONED_REQUESTS = Gauge(
+    "flask_shutdown_abandoned_requests", "Requests still in flight when the shutdown drain deadline expired"
+)
+
+# Admission control metrics
+ADMISSION_DECISIONS = Counter(
+    "flask_admission_decisions_total", "Admission control decisions (admitted, rate_limited, shed)", ["decision"]
+)
+CONCURRENCY_LIMIT = Gauge("flask_concurrency_limit", "Current per-worker in-flight request limit")
+CALCULATOR_IN_FLIGHT = Gauge("calculator_in_flight", "Calculator requests admitted and not yet finished (per worker)")
+
+# WebSocket calculation sessions
+WEBSOCKET_SESSIONS = Gauge("websocket_sessions_active", "Number of open WebSocket calculation sessions")
+WEBSOCKET_MESSAGES = Counter("websocket_messages_total", "WebSocket calculation messages processed", ["status"])
+
+# Unix domain socket binary calculation server (app/uds_server.py)
+UDS_CONNECTIONS = Gauge("uds_connections_active", "Number of open Unix socket calculation connections")
+UDS_FRAMES = Counter("uds_frames_total", "Unix socket calculation frames processed", ["status"])
+
+# Process pool for heavy calculator operations
+OFFLOAD_QUEUE_DEPTH = Gauge("flask_offload_queue_depth", "Heavy operations submitted to the process pool and not yet finished")
+OFFLOAD_TASK_DURATION = Histogram(
+    "flask_offload_task_duration_seconds", "Execution time of heavy operations in the process pool", ["outcome"]
+)
+
+# Asynchronous calculation jobs
+JOB_QUEUE_DEPTH = Gauge("calculator_jobs_queued", "Calculation jobs waiting in the local queue")
+JOB_LATENCY = Histogram("calculator_job_latency_seconds", "Calculation job latency by phase (queued, running)", ["phase"])
+
+# Single-flight coalescing of identical in-flight heavy operations
+COALESCED_REQUESTS = Counter(
+    "calculator_coalesced_requests_total", "Calculations served from an identical in-flight computation", ["operation"]
+)
+
+# Per-operation instrumentation of the calculator dispatch table (scalar and vectorized calls)
+# The histogram _count series is the per-operation call counter
+OPERATION_DURATION = Histogram(
+    "calculator_operation_duration_seconds", "Calculator operation execution time", ["operation", "mode"]
+)
+OPERATION_ERRORS = Counter(
+    "calculator_operation_errors_total", "Calculator operation calls that raised", ["operation", "mode"]
+)
 
 
 def update_system_metrics():
@@ -68,13 +116,17 @@ def init_metrics(app):
 
 def record_request_metrics(response, request_start_time, endpoint, method):
     """Record request metrics"""
+    observe_request(method, endpoint, response.status_code, time.time() - request_start_time)
+
+
+def observe_request(method, endpoint, status, duration):
+    """Record request count and duration (shared by the WSGI and ASGI apps)"""
     try:
         # Record request count
-        REQUEST_COUNT.labels(method=method, endpoint=endpoint, status=response.status_code).inc()
+        REQUEST_COUNT.labels(method=method, endpoint=endpoint, status=status).inc()
 
         # Record request duration
-        request_duration = time.time() - request_start_time
-        REQUEST_DURATION.labels(method=method, endpoint=endpoint).observe(request_duration)
+        REQUEST_DURATION.labels(method=method, endpoint=endpoint).observe(duration)
 
     except Exception as e:
         print(f"Error recording request metrics: {e}")
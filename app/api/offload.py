@@ -0,0 +1,135 @@
+"""
+Délestage des opérations coûteuses vers un pool de processus borné
+Les opérations légères restent exécutées dans le worker ; les lourdes passent par
+un ProcessPoolExecutor avec file d'attente bornée, délai maximal et annulation
+"""
+
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from api.lazy_imports import lazy_import
+from api.metrics import OFFLOAD_QUEUE_DEPTH, OFFLOAD_TASK_DURATION
+
+# multiprocessing n'est chargé qu'à la création du pool (première opération lourde)
+futures_process = lazy_import("concurrent.futures.process")
+multiprocessing = lazy_import("multiprocessing")
+
+# Les workers ne sont pas forkés depuis le serveur multi-thread (verrous hérités dans un état quelconque)
+START_METHOD = "forkserver"
+
+
+class OffloadError(Exception):
+    """Tâche refusée ou interrompue par le pool"""
+
+    status_code = 503
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.message = message
+        self.retry_after = retry_after
+
+    def to_dict(self):
+        """Charge utile d'erreur commune à tous les endpoints"""
+        payload = {"error": self.message}
+        if self.retry_after is not None:
+            payload["retry_after"] = self.retry_after
+        return payload
+
+
+class PoolSaturated(OffloadError):
+    """File d'attente pleine (503)"""
+
+
+class OffloadTimeout(OffloadError):
+    """Délai maximal dépassé (504)"""
+
+    status_code = 504
+
+
+def timed_call(function, args):
+    """Exécuté dans le processus enfant : retourne (résultat, durée d'exécution)"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+class OffloadPool:
+    """
+    Pool de processus créé au premier besoin
+    Au plus max_workers tâches s'exécutent et max_queue attendent ; au-delà, PoolSaturated
+    """
+
+    def __init__(self, max_workers, max_queue, timeout):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.pending = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = futures_process.ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context(START_METHOD)
+            )
+        return self._executor
+
+    def run(self, function, *args):
+        """
+        Exécute function(*args) dans le pool et attend le résultat
+        Les exceptions de la fonction (ValidationError...) sont propagées telles quelles
+        """
+        with self._lock:
+            if self.pending >= self.max_workers + self.max_queue:
+                OFFLOAD_TASK_DURATION.labels(outcome="rejected").observe(0)
+                raise PoolSaturated("Too many pending heavy operations", retry_after=1)
+            self.pending += 1
+            OFFLOAD_QUEUE_DEPTH.set(self.pending)
+            executor = self._get_executor()
+
+        try:
+            future = executor.submit(timed_call, function, args)
+            try:
+                result, duration = future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                if not future.cancel():
+                    # Déjà en cours : seul l'arrêt des processus interrompt le calcul
+                    self._recycle(executor)
+                OFFLOAD_TASK_DURATION.labels(outcome="timeout").observe(self.timeout)
+                raise OffloadTimeout(f"Operation exceeded {self.timeout}s")
+            except futures_process.BrokenProcessPool:
+                self._recycle(executor)
+                OFFLOAD_TASK_DURATION.labels(outcome="error").observe(0)
+                raise OffloadError("Worker pool restarted, retry the operation", retry_after=1)
+            OFFLOAD_TASK_DURATION.labels(outcome="success").observe(duration)
+            return result
+
+        finally:
+            with self._lock:
+                self.pending -= 1
+                OFFLOAD_QUEUE_DEPTH.set(self.pending)
+
+    def _recycle(self, executor):
+        """Arrête les processus d'un pool et le remplace au prochain appel"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        # ProcessPoolExecutor n'expose pas ses processus : accès à l'attribut interne
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """Arrête le pool (fin de l'application ou des tests)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def init_offload(app):
+    """Crée le pool de processus de l'application (OFFLOAD_WORKERS, OFFLOAD_QUEUE_SIZE, OFFLOAD_TIMEOUT)"""
+    pool = OffloadPool(app.config["OFFLOAD_WORKERS"], app.config["OFFLOAD_QUEUE_SIZE"], app.config["OFFLOAD_TIMEOUT"])
+    app.extensions["offload"] = pool
+    return pool
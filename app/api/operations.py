@@ -0,0 +1,178 @@
+"""
+Registre des opérations du calculateur
+
+Chaque opération est enregistrée par décorateur (ou par un module déclaré dans le
+groupe d'entry points "calculator.operations") avec ses métadonnées : code binaire,
+arité, implémentation vectorisée et classe de coût. Au démarrage, le registre est résolu
+en une table de dispatch (dict) dont les appels sont instrumentés par opération.
+
+Les codes circulent sur les formats binaires (colonnaire, tableaux, UDS) et dans
+l'historique : ils sont déclarés explicitement et ne dépendent jamais de l'ordre
+d'enregistrement ou de découverte des plugins.
+"""
+
+import time
+from importlib.metadata import entry_points
+
+from api.metrics import OPERATION_DURATION, OPERATION_ERRORS
+
+ENTRY_POINT_GROUP = "calculator.operations"
+
+# Classes de coût : les opérations lourdes sont déléguées au pool de processus (api/offload.py)
+CHEAP = "cheap"
+HEAVY = "heavy"
+
+# Les codes tiennent sur un octet (trames binaires, historique en uint8)
+MAX_CODE = 255
+
+REGISTRY = {}
+
+
+class Operation:
+    """Entrée du registre : implémentation et métadonnées"""
+
+    __slots__ = ("name", "function", "code", "array_code", "arity", "vectorized", "cost")
+
+    def __init__(self, name, function, code, array_code=None, arity=2, vectorized=None, cost=CHEAP):
+        self.name = name
+        self.function = function
+        self.code = code
+        self.array_code = array_code
+        self.arity = arity
+        self.vectorized = vectorized
+        self.cost = cost
+
+
+def register(name, function, *, code, array_code=None, arity=2, vectorized=None, cost=CHEAP):
+    """
+    Enregistre une opération ; un nom ou un code déjà pris est une erreur de configuration
+    code identifie l'opération sur les formats scalaires et colonnaires ; array_code (par défaut
+    égal à code) sur le format tableaux, où les opérations matricielles ont leurs propres codes
+    """
+    if name in REGISTRY:
+        raise ValueError(f"operation already registered: {name}")
+    array_code = resolve_codes(name, code, array_code, vectorized)
+    if arity not in (1, 2):
+        raise ValueError(f"unsupported arity for {name}: {arity}")
+    if cost not in (CHEAP, HEAVY):
+        raise ValueError(f"unknown cost class for {name}: {cost}")
+    REGISTRY[name] = Operation(name, function, code, array_code, arity, vectorized, cost)
+    return function
+
+
+def resolve_codes(name, code, array_code, vectorized):
+    """
+    Valide les codes d'une opération et retourne son code tableaux (None sans implémentation vectorisée)
+    Lève ValueError pour un code hors de 0..MAX_CODE ou déjà pris dans le registre
+    """
+    if vectorized is None:
+        array_code = None
+    elif array_code is None:
+        array_code = code
+    for kind, value in (("code", code), ("array code", array_code)):
+        if value is not None and (not isinstance(value, int) or not 0 <= value <= MAX_CODE):
+            raise ValueError(f"{kind} for {name} must be an integer between 0 and {MAX_CODE}: {value!r}")
+    for entry in REGISTRY.values():
+        if entry.code == code:
+            raise ValueError(f"operation code {code} of {name} already used by {entry.name}")
+        if array_code is not None and entry.array_code == array_code:
+            raise ValueError(f"array code {array_code} of {name} already used by {entry.name}")
+    return array_code
+
+
+def operation(name, **metadata):
+    """Décorateur d'enregistrement : @operation("divide", code=3, vectorized=..., cost=HEAVY)"""
+
+    def decorator(function):
+        return register(name, function, **metadata)
+
+    return decorator
+
+
+def load_plugins(group=ENTRY_POINT_GROUP):
+    """Importe les modules des entry points du groupe ; leurs décorateurs enregistrent les opérations"""
+    for entry_point in entry_points(group=group):
+        entry_point.load()
+
+
+def code_table(codes):
+    """Table nom -> code à partir de paires (nom, code) ; lève ValueError si un code est pris deux fois"""
+    table = {}
+    names = {}
+    for name, code in codes:
+        if code in names:
+            raise ValueError(f"operation code {code} of {name} already used by {names[code]}")
+        names[code] = name
+        table[name] = code
+    return table
+
+
+class Dispatch:
+    """Opération résolue : appels scalaire et vectorisé instrumentés"""
+
+    __slots__ = ("operation", "call", "vectorized")
+
+    def __init__(self, entry):
+        self.operation = entry
+        self.call = instrument_scalar(entry)
+        self.vectorized = instrument_vectorized(entry) if entry.vectorized is not None else None
+
+
+def flight_key(name, operands):
+    """Clé single-flight : représentation hexadécimale exacte des opérandes (0.0 et -0.0 distincts)"""
+    return (name,) + tuple(float(operand).hex() for operand in operands)
+
+
+def instrument_scalar(entry):
+    """
+    Appel scalaire : opérations légères exécutées directement, lourdes via offload
+    (regroupées par flight si fourni) ; durée et erreurs par opération
+    """
+    name, function, heavy, binary = entry.name, entry.function, entry.cost == HEAVY, entry.arity == 2
+    failed = OPERATION_ERRORS.labels(operation=name, mode="scalar")
+    duration = OPERATION_DURATION.labels(operation=name, mode="scalar")
+
+    def call(a, b, offload=None, flight=None):
+        operands = (a, b) if binary else (a,)
+        start = time.perf_counter()
+        try:
+            if not heavy or offload is None:
+                result = function(*operands)
+            elif flight is not None:
+                result = flight.do(flight_key(name, operands), offload.run, function, *operands)
+            else:
+                result = offload.run(function, *operands)
+        except Exception:
+            failed.inc()
+            raise
+        finally:
+            duration.observe(time.perf_counter() - start)
+        return result
+
+    return call
+
+
+def instrument_vectorized(entry):
+    """Appel vectorisé (colonnes numpy) : durée et erreurs par opération"""
+    vectorized, binary = entry.vectorized, entry.arity == 2
+    failed = OPERATION_ERRORS.labels(operation=entry.name, mode="vectorized")
+    duration = OPERATION_DURATION.labels(operation=entry.name, mode="vectorized")
+
+    def call(a, b):
+        start = time.perf_counter()
+        try:
+            result = vectorized(a, b) if binary else vectorized(a)
+        except Exception:
+            failed.inc()
+            raise
+        finally:
+            duration.observe(time.perf_counter() - start)
+        return result
+
+    return call
+
+
+def build_dispatch_table(registry=None):
+    """Résout le registre en table de dispatch nom -> Dispatch (ordre d'enregistrement conservé)"""
+    registry = REGISTRY if registry is None else registry
+    return {name: Dispatch(entry) for name, entry in registry.items()}
@@ -0,0 +1,88 @@
+"""
+Validation déclarative des charges utiles JSON
+Les schémas sont compilés une seule fois au démarrage en fonctions de validation
+"""
+
+
+class ValidationError(Exception):
+    """Erreur de validation d'une charge utile (réponse 400)"""
+
+    status_code = 400
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+    def to_dict(self):
+        """Charge utile d'erreur commune à tous les endpoints"""
+        return {"error": self.message}
+
+
+class Field:
+    """Déclaration d'un champ : conversion optionnelle et valeurs autorisées"""
+
+    __slots__ = ("name", "coerce", "choices", "error")
+
+    def __init__(self, name, coerce=None, choices=None, error=None):
+        self.name = name
+        self.coerce = coerce
+        self.choices = choices
+        self.error = error or f"Invalid value for field: {name}"
+
+
+def compile_schema(fields):
+    """
+    Compile une liste de Field en fonction validate(data) -> tuple des valeurs
+    (dans l'ordre de déclaration). Le code de la fonction est généré pour le schéma :
+    pas de boucle ni de recherche de règle à l'exécution.
+    Ordre des contrôles : champs manquants, conversions, puis valeurs autorisées
+    Lève ValidationError au premier champ invalide
+    """
+    names = tuple(field.name for field in fields)
+    namespace = {"ValidationError": ValidationError}
+
+    def missing(data):
+        if not isinstance(data, dict):
+            raise ValidationError("Request body must be a JSON object")
+        for name in names:
+            if name not in data:
+                raise ValidationError(f"Missing required field: {name}")
+
+    namespace["missing"] = missing
+
+    lines = ["def validate(data):", "    try:"]
+    for i, field in enumerate(fields):
+        lines.append(f"        v{i} = data[{field.name!r}]")
+    # TypeError : corps JSON qui n'est pas un objet (liste, chaîne, null...)
+    lines += ["    except (KeyError, TypeError):", "        missing(data)", "        raise"]
+
+    for i, field in enumerate(fields):
+        if field.coerce is not None:
+            namespace[f"coerce{i}"] = field.coerce
+            namespace[f"error{i}"] = field.error
+            lines += [
+                "    try:",
+                f"        v{i} = coerce{i}(v{i})",
+                "    except (ValueError, TypeError):",
+                f"        raise ValidationError(error{i}) from None",
+            ]
+
+    for i, field in enumerate(fields):
+        if field.choices is not None:
+            namespace[f"choices{i}"] = field.choices
+            namespace[f"error{i}"] = field.error
+            lines += [
+                "    try:",
+                f"        allowed = v{i} in choices{i}",
+                "    except TypeError:",
+                "        allowed = False",
+                "    if not allowed:",
+                f"        raise ValidationError(error{i})",
+            ]
+
+    lines.append(f"    return ({''.join(f'v{i}, ' for i in range(len(fields)))})")
+    exec(compile("\n".join(lines), f"<schema {', '.join(names)}>", "exec"), namespace)  # nosec B102
+
+    validate = namespace["validate"]
+    validate.fields = names
+    return validate
@@ -0,0 +1,143 @@
+"""
+Arrêt progressif (SIGTERM) : drainage des requêtes en cours
+
+Au début de l'arrêt, la disponibilité (GET /ready) passe à faux et les nouvelles
+requêtes reçoivent 503 avec Connection: close ; les requêtes en cours, comptées par
+des hooks before/teardown_request, peuvent se terminer jusqu'à SHUTDOWN_DRAIN_TIMEOUT.
+Les services d'arrière-plan enregistrés (workers de tâches, pools) sont ensuite
+arrêtés dans l'ordre inverse de leur enregistrement.
+
+Les sondes et le scraping (blueprints health et metrics) restent servis et ne
+retardent pas le drainage.
+
+Sous gunicorn, le serveur draine lui-même ses requêtes : le drainage de l'application
+commence à la réception de SIGTERM (begin_drain) et shutdown(timeout=0), appelé à la
+sortie du worker, se limite aux métriques et à l'arrêt des services (gunicorn.conf.py).
+"""
+
+import threading
+import time
+
+from flask import g, jsonify, request
+
+from api.metrics import SHUTDOWN_ABANDONED_REQUESTS, SHUTDOWN_DRAIN_DURATION
+
+EXEMPT_BLUEPRINTS = ("health", "metrics")
+
+
+class ShutdownCoordinator:
+    """Compteur de requêtes en cours, état de drainage et services à arrêter"""
+
+    def __init__(self, readiness, drain_timeout=25.0, logger=None, clock=time.monotonic):
+        self.readiness = readiness
+        self.drain_timeout = drain_timeout
+        self.logger = logger
+        self.clock = clock
+        self.in_flight = 0
+        self.draining = threading.Event()
+        self.services = []
+        self._idle = threading.Condition()
+        self._shutdown_lock = threading.Lock()
+        self._drained = None
+        self._drain_started = None
+
+    def register(self, name, stop, *args):
+        """Service arrêté après le drainage par stop(*args)"""
+        self.services.append((name, stop, args))
+
+    def enter(self):
+        """Compte une requête ; False si l'arrêt a commencé (requête à refuser)"""
+        with self._idle:
+            if self.draining.is_set():
+                return False
+            self.in_flight += 1
+            return True
+
+    def exit(self):
+        with self._idle:
+            self.in_flight -= 1
+            if self.in_flight == 0:
+                self._idle.notify_all()
+
+    def begin_drain(self):
+        """Disponibilité à faux et refus des nouvelles requêtes (le premier appel date le début du drainage)"""
+        with self._idle:
+            if self._drain_started is None:
+                self._drain_started = self.clock()
+            self.draining.set()
+        self.readiness.clear()
+
+    def wait_idle(self, timeout):
+        """Attend la fin des requêtes en cours ; retourne le nombre de requêtes encore en cours"""
+        deadline = self.clock() + timeout
+        with self._idle:
+            while self.in_flight > 0:
+                remaining = deadline - self.clock()
+                if remaining <= 0:
+                    break
+                self._idle.wait(remaining)
+            return self.in_flight
+
+    def stop_services(self):
+        for name, stop, args in reversed(self.services):
+            try:
+                stop(*args)
+            except Exception as e:
+                if self.logger is not None:
+                    self.logger.error("Shutdown: failed to stop %s: %s", name, e)
+
+    def shutdown(self, timeout=None):
+        """
+        Arrêt complet (idempotent) : drainage jusqu'au délai (drain_timeout par défaut) puis arrêt des services
+        La durée de drainage est comptée depuis begin_drain si le drainage a déjà commencé
+        Retourne True si toutes les requêtes en cours se sont terminées à temps
+        """
+        with self._shutdown_lock:
+            if self._drained is not None:
+                return self._drained
+            timeout = self.drain_timeout if timeout is None else timeout
+            self.begin_drain()
+            abandoned = self.wait_idle(timeout)
+            duration = self.clock() - self._drain_started
+            SHUTDOWN_DRAIN_DURATION.set(duration)
+            SHUTDOWN_ABANDONED_REQUESTS.set(abandoned)
+            if abandoned and self.logger is not None:
+                self.logger.warning("Shutdown: %d requests still in flight after %.1fs", abandoned, duration)
+            self.stop_services()
+            self._drained = abandoned == 0
+            return self._drained
+
+
+def init_shutdown(app):
+    """
+    Installe le coordinateur d'arrêt (SHUTDOWN_DRAIN_TIMEOUT secondes de drainage)
+    À enregistrer avant les autres hooks pour que le refus précède tout traitement
+    """
+    coordinator = ShutdownCoordinator(app.extensions["readiness"], app.config.get("SHUTDOWN_DRAIN_TIMEOUT", 25.0), app.logger)
+    app.extensions["shutdown"] = coordinator
+
+    @app.before_request
+    def track_in_flight():
+        if request.blueprint in EXEMPT_BLUEPRINTS:
+            return None
+        if not coordinator.enter():
+            response = jsonify({"error": "Server is shutting down"})
+            response.status_code = 503
+            response.headers["Retry-After"] = "1"
+            return response
+        g.in_flight = True
+        return None
+
+    @app.after_request
+    def close_connection_when_draining(response):
+        # Les clients keep-alive se reconnectent à une autre instance
+        if coordinator.draining.is_set():
+            response.headers["Connection"] = "close"
+        return response
+
+    @app.teardown_request
+    def release_in_flight(exc):
+        if g.pop("in_flight", False):
+            coordinator.exit()
+
+    return coordinator
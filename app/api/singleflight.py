@@ -0,0 +1,72 @@
+"""
+Regroupement des calculs identiques en cours (single-flight)
+Le premier appel pour une clé calcule ; les appels simultanés pour la même clé
+attendent son résultat (ou son erreur) au lieu de recalculer
+"""
+
+import threading
+
+from api.metrics import COALESCED_REQUESTS
+
+
+class Flight:
+    """Calcul en cours pour une clé"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Table des calculs en cours, partagée par les threads du worker"""
+
+    def __init__(self, on_coalesced=None):
+        self.on_coalesced = on_coalesced
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function, *args):
+        """
+        Exécute function(*args), sauf si un calcul pour key est déjà en cours :
+        dans ce cas, attend et retourne son résultat (ou relève son exception)
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Flight()
+
+        if not leader:
+            if self.on_coalesced is not None:
+                self.on_coalesced(key)
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = function(*args)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            # Retrait avant le réveil : un appel ultérieur recalcule au lieu de lire un résultat périmé
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def in_flight(self):
+        """Nombre de clés en cours de calcul"""
+        with self._lock:
+            return len(self._flights)
+
+
+def init_singleflight(app):
+    """Crée la table single-flight de l'application (utilisée pour les opérations lourdes)"""
+    flight = SingleFlight(on_coalesced=lambda key: COALESCED_REQUESTS.labels(operation=key[0]).inc())
+    app.extensions["singleflight"] = flight
+    return flight
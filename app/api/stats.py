@@ -0,0 +1,165 @@
+"""
+Statistiques en une passe sur des flux de nombres, en mémoire bornée
+- StreamingStats : somme compensée, moyenne et variance (Welford / Chan), min, max
+- QuantileSketch : t-digest fusionnant pour les percentiles approchés
+"""
+
+import math
+
+import numpy as np
+
+
+class StreamingStats:
+    """Agrégats numériquement stables, mis à jour par blocs"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._sum = 0.0
+        self._compensation = 0.0
+
+    def update(self, values):
+        """Intègre un bloc de valeurs (tableau numpy 1-D)"""
+        n = len(values)
+        if n == 0:
+            return
+
+        # Somme de Neumaier entre blocs (sommation par paires de numpy dans le bloc)
+        chunk_sum = float(np.sum(values))
+        total = self._sum + chunk_sum
+        if abs(self._sum) >= abs(chunk_sum):
+            self._compensation += (self._sum - total) + chunk_sum
+        else:
+            self._compensation += (chunk_sum - total) + self._sum
+        self._sum = total
+
+        # Fusion de Chan et al. des moments du bloc avec les moments courants
+        chunk_mean = chunk_sum / n
+        chunk_m2 = float(np.sum(np.square(values - chunk_mean)))
+        count = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / count
+        self.m2 += chunk_m2 + delta * delta * self.count * n / count
+        self.count = count
+
+        self.minimum = min(self.minimum, float(np.min(values)))
+        self.maximum = max(self.maximum, float(np.max(values)))
+
+    @property
+    def total(self):
+        """Somme compensée"""
+        return self._sum + self._compensation
+
+    @property
+    def variance(self):
+        """Variance de l'échantillon (n - 1), None sous deux valeurs"""
+        if self.count < 2:
+            return None
+        return self.m2 / (self.count - 1)
+
+
+class QuantileSketch:
+    """
+    t-digest fusionnant (fonction d'échelle k1) : mémoire O(compression)
+    quelle que soit la taille du flux, précision maximale vers les extrêmes
+    Le minimum et le maximum observés bornent l'interpolation des queues
+    """
+
+    def __init__(self, compression=200, buffer_size=None):
+        self.compression = compression
+        self.buffer_size = buffer_size or 10 * compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self._buffer = []
+        self._buffered = 0
+        self.total_weight = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def update(self, values):
+        """Ajoute un bloc de valeurs (tableau numpy 1-D)"""
+        if len(values) == 0:
+            return
+        values = np.asarray(values, dtype=np.float64)
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        self._buffer.append(values)
+        self._buffered += len(values)
+        if self._buffered >= self.buffer_size:
+            self._compress()
+
+    def _k(self, q):
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _k_inverse(self, k):
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def _compress(self):
+        """Fusionne le tampon dans les centroïdes"""
+        if not self._buffer:
+            return
+        means = np.concatenate([self.means, *self._buffer])
+        weights = np.concatenate([self.weights, np.ones(self._buffered)])
+        self._buffer = []
+        self._buffered = 0
+
+        order = np.argsort(means, kind="stable")
+        means = means[order]
+        weights = weights[order]
+        total = float(weights.sum())
+        self.total_weight = total
+
+        # Bornes cumulées de poids autorisées par la fonction d'échelle
+        merged_means = []
+        merged_weights = []
+        cumulative = 0.0
+        limit = total * self._k_inverse(self._k(0.0) + 1)
+        current_mean = float(means[0])
+        current_weight = float(weights[0])
+        for mean, weight in zip(means[1:].tolist(), weights[1:].tolist()):
+            if cumulative + current_weight + weight <= limit:
+                current_weight += weight
+                current_mean += (mean - current_mean) * weight / current_weight
+            else:
+                merged_means.append(current_mean)
+                merged_weights.append(current_weight)
+                cumulative += current_weight
+                limit = total * self._k_inverse(min(self._k(cumulative / total) + 1, self.compression / 4))
+                current_mean = mean
+                current_weight = weight
+        merged_means.append(current_mean)
+        merged_weights.append(current_weight)
+
+        self.means = np.array(merged_means)
+        self.weights = np.array(merged_weights)
+
+    def quantile(self, q):
+        """Quantile approché pour q dans [0, 1] (None si le flux est vide)"""
+        self._compress()
+        if len(self.means) == 0:
+            return None
+
+        # Position de chaque centroïde : milieu de son poids cumulé ; au-delà du premier et du
+        # dernier centroïde, interpolation vers le minimum (poids 0) et le maximum (poids total)
+        centers = np.concatenate(([0.0], np.cumsum(self.weights) - self.weights / 2, [self.total_weight]))
+        means = np.concatenate(([self.minimum], self.means, [self.maximum]))
+        return float(np.interp(q * self.total_weight, centers, means))
+
+
+def summarize(stats, sketch, percentiles):
+    """Charge utile de réponse de l'endpoint d'agrégation"""
+    variance = stats.variance
+    empty = stats.count == 0
+    return {
+        "count": stats.count,
+        "sum": stats.total,
+        "mean": None if empty else stats.mean,
+        "variance": variance,
+        "stddev": None if variance is None else math.sqrt(variance),
+        "min": None if empty else stats.minimum,
+        "max": None if empty else stats.maximum,
+        "percentiles": {f"{p:g}": sketch.quantile(p / 100) for p in percentiles},
+    }
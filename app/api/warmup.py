@@ -0,0 +1,127 @@
+"""
+Préchauffage au démarrage et disponibilité (readiness)
+
+create_app() se termine par un appel de chaque route enregistrée via le client de
+test : imports différés, providers JSON/MessagePack/CBOR, schémas, connexions SQLite
+et caches sont initialisés avant la première requête réelle. La disponibilité
+(GET /ready) ne passe à vrai qu'ensuite, et seulement si aucune route n'a répondu 5xx.
+
+Les requêtes de préchauffage sont marquées dans l'environnement WSGI : elles ne sont
+ni comptées dans les métriques de requêtes ni enregistrées dans l'historique, et
+utilisent leur propre adresse pour la limitation de débit.
+"""
+
+import json
+import threading
+import time
+
+from flask import request
+
+from api.codecs import CODECS, MIMETYPES
+from api.metrics import WARMUP_DURATION
+
+WARMUP_ENVIRON = "calculator.warmup"
+WARMUP_REMOTE_ADDR = "warmup"
+
+# Routes non préchauffées : effets de bord (tâche persistée), échantillonnage CPU bloquant,
+# ou disponibilité elle-même (503 pendant le préchauffage)
+SKIPPED_ENDPOINTS = {"static", "metrics.metrics", "jobs.submit_job", "health.readiness"}
+
+
+def is_warmup_request():
+    """Vrai pour une requête émise par le préchauffage"""
+    return request.environ.get(WARMUP_ENVIRON, False)
+
+
+def warmup_samples():
+    """Requêtes d'exemple par endpoint (arguments de test_client.open)"""
+    # Import différé : api.calculator importe ce module
+    from api.calculator import OPERATION_CODES
+    from api.columnar import COLUMNAR_MIMETYPE, encode_columns
+    from api.csv_stream import CSV_MIMETYPE
+
+    # Opérations légères uniquement : une opération lourde démarrerait le pool de processus
+    calculation = {"operation": "multiply", "a": 6, "b": 7}
+    return {
+        "calculator.calculate": [
+            {"method": "POST", "data": CODECS[mimetype].dumps(calculation), "content_type": mimetype} for mimetype in MIMETYPES
+        ],
+        "calculator.calculate_columnar": [
+            {
+                "method": "POST",
+                "data": encode_columns(OPERATION_CODES["multiply"], [1.0, 2.0], [3.0, 4.0]),
+                "content_type": COLUMNAR_MIMETYPE,
+            }
+        ],
+        "calculator.calculate_csv": [
+            {"method": "POST", "data": "operation,a,b\nadd,1,2\ndivide,1,0\n", "content_type": CSV_MIMETYPE}
+        ],
+        "calculator.aggregate": [
+            {"method": "POST", "data": json.dumps({"values": [1, 2, 3, 4]}), "content_type": "application/json"}
+        ],
+        "calculator.linalg": [
+            {
+                "method": "POST",
+                "data": json.dumps({"operation": "matmul", "a": [[1, 2], [3, 4]], "b": [[1, 0], [0, 1]]}),
+                "content_type": "application/json",
+            }
+        ],
+        # Identifiant inconnu (404) : ouvre la connexion SQLite sans créer de tâche
+        "jobs.get_job": [{"method": "GET", "path": "/api/jobs/warmup"}],
+    }
+
+
+def warmup(app):
+    """
+    Appelle chaque route enregistrée puis marque l'application disponible
+    Retourne {endpoint: [statuts]} ; les routes sans exemple ni GET sans argument sont ignorées
+    """
+    readiness = app.extensions["readiness"]
+    samples = warmup_samples()
+    client = app.test_client()
+    environ = {WARMUP_ENVIRON: True, "REMOTE_ADDR": WARMUP_REMOTE_ADDR}
+    statuses = {}
+
+    start = time.perf_counter()
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint in SKIPPED_ENDPOINTS:
+            continue
+        requests = samples.get(rule.endpoint)
+        if requests is None:
+            if "GET" not in rule.methods or rule.arguments:
+                app.logger.info("Warmup: no sample request for %s", rule.endpoint)
+                continue
+            requests = [{"method": "GET"}]
+        for sample in requests:
+            sample = dict(sample)
+            response = client.open(sample.pop("path", rule.rule), environ_base=environ, **sample)
+            statuses.setdefault(rule.endpoint, []).append(response.status_code)
+            response.close()
+    duration = time.perf_counter() - start
+    WARMUP_DURATION.set(duration)
+
+    failed = sorted(endpoint for endpoint, codes in statuses.items() if any(code >= 500 for code in codes))
+    if failed:
+        app.logger.error("Warmup failed for %s: application stays not ready", ", ".join(failed))
+    else:
+        readiness.set()
+        app.logger.info("Warmup completed in %.3fs (%d routes)", duration, len(statuses))
+    return statuses
+
+
+def init_readiness(app):
+    """Crée l'indicateur de disponibilité (threading.Event), faux jusqu'à complete_startup()"""
+    readiness = threading.Event()
+    app.extensions["readiness"] = readiness
+    return readiness
+
+
+def complete_startup(app):
+    """
+    À appeler en dernier dans create_app() : préchauffage si WARMUP_ENABLED, sinon
+    l'application est disponible immédiatement
+    """
+    if app.config.get("WARMUP_ENABLED", True):
+        warmup(app)
+    else:
+        app.extensions["readiness"].set()
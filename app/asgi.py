@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Application ASGI exposant les mêmes endpoints que create_app() (health, hello, calculate, metrics)
+Partage la logique du calculateur et les métriques Prometheus avec la version Flask
+
+Lancement : uvicorn asgi:app --app-dir app --host 0.0.0.0 --port 5000
+
+Sessions WebSocket (/ws/calculate) : chaque message texte est un objet JSON
+{"id": ..., "operation": ..., "a": ..., "b": ...} ; la réponse reprend "id" avec
+soit le résultat de POST /api/calculate, soit {"error": ...}. Les réponses peuvent
+arriver dans un ordre différent des requêtes.
+
+Les opérations HEAVY sont attendues hors de la boucle d'événements (thread qui délègue
+au pool de processus, avec single-flight) : elles ne bloquent ni les autres connexions
+ni les autres messages de la session.
+"""
+
+import asyncio
+import json
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from api.body_limits import resolve_body_limit
+from api.caching import compute_etag, etag_matches
+from api.calculator import evaluate, is_heavy
+from api.config import load_config
+from api.codecs import CODECS, JSON_MIMETYPE, UNSUPPORTED_CONTENT_TYPE, dump_json, negotiate
+from api.health import health_status
+from api.hello import HELLO_MESSAGE
+from api.metrics import (
+    WEBSOCKET_MESSAGES,
+    WEBSOCKET_SESSIONS,
+    init_metrics,
+    observe_request,
+    update_system_metrics,
+)
+from api.offload import OffloadError, init_offload
+from api.schema import ValidationError
+from api.singleflight import init_singleflight
+
+
+def get_header(scope, name):
+    """Retourne la valeur décodée d'un en-tête de la requête (nom en minuscules) ou None"""
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class Response:
+    """Réponse HTTP minimale"""
+
+    __slots__ = ("status", "body", "headers")
+
+    def __init__(self, status, body=b"", content_type=JSON_MIMETYPE, headers=None):
+        self.status = status
+        self.body = body
+        self.headers = [(b"content-type", content_type.encode())]
+        for name, value in (headers or {}).items():
+            self.headers.append((name.lower().encode(), str(value).encode()))
+
+
+def json_response(payload, status=200, headers=None):
+    """Réponse JSON au format de l'API"""
+    return Response(status, dump_json(payload), headers=headers)
+
+
+class AsgiApp:
+    """Application ASGI équivalente à create_app()"""
+
+    def __init__(self, config):
+        self.config = config
+        # chemin -> (nom d'endpoint Flask, méthodes, handler)
+        self.routes = {
+            "/health": ("health.health_check", ("GET", "HEAD"), self.health),
+            "/api/hello": ("hello.hello", ("GET", "HEAD"), self.hello),
+            "/api/calculate": ("calculator.calculate", ("POST",), self.calculate),
+            "/metrics": ("metrics.metrics", ("GET", "HEAD"), self.metrics),
+        }
+        self.websocket_routes = {"/ws/calculate": self.calculation_session}
+        self.extensions = {}
+        init_metrics(self)
+        init_offload(self)
+        init_singleflight(self)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            await self.handle_http(scope, receive, send)
+        elif scope["type"] == "websocket":
+            handler = self.websocket_routes.get(scope["path"])
+            if handler is None:
+                await receive()
+                await send({"type": "websocket.close", "code": 1008})
+            else:
+                await handler(scope, receive, send)
+        elif scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+
+    async def lifespan(self, receive, send):
+        """Protocole lifespan : rien à initialiser au-delà du constructeur ; arrêt du pool de processus"""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await asyncio.to_thread(self.extensions["offload"].shutdown)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def handle_http(self, scope, receive, send):
+        """Route la requête, envoie la réponse et enregistre les métriques"""
+        start_time = time.time()
+        method = scope["method"]
+        route = self.routes.get(scope["path"])
+
+        if route is None:
+            endpoint = "unknown"
+            response = json_response({"error": "Not found"}, 404)
+        else:
+            endpoint, methods, handler = route
+            if method not in methods:
+                response = json_response({"error": "Method not allowed"}, 405, {"Allow": ", ".join(methods)})
+            else:
+                response = await handler(scope, receive)
+
+        headers = response.headers + [(b"content-length", str(len(response.body)).encode())]
+        await send({"type": "http.response.start", "status": response.status, "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if method == "HEAD" else response.body})
+        observe_request(method, endpoint, response.status, time.time() - start_time)
+
+    def cached(self, scope, blueprint, payload):
+        """Applique la politique de cache du blueprint (ETag fort, If-None-Match -> 304)"""
+        body = dump_json(payload)
+        policy = self.config["HTTP_CACHE_POLICIES"].get(blueprint)
+        if policy is None:
+            return Response(200, body)
+
+        etag = compute_etag(body)
+        headers = {"Cache-Control": policy, "ETag": f'"{etag}"'}
+        if_none_match = get_header(scope, b"if-none-match")
+        if if_none_match is not None and etag_matches(if_none_match, etag):
+            return Response(304, headers=headers)
+        return Response(200, body, headers=headers)
+
+    async def health(self, scope, receive):
+        """Équivalent de GET /health"""
+        return self.cached(scope, "health", health_status())
+
+    async def hello(self, scope, receive):
+        """Équivalent de GET /api/hello"""
+        return self.cached(scope, "hello", HELLO_MESSAGE)
+
+    async def calculate(self, scope, receive):
+        """Équivalent de POST /api/calculate (même validation et mêmes erreurs)"""
+        content_type = (get_header(scope, b"content-type") or "").split(";")[0].strip().lower()
+        codec = CODECS.get(content_type)
+        if codec is None:
+            return json_response({"error": UNSUPPORTED_CONTENT_TYPE}, 400)
+
+        limit = resolve_body_limit(self.config["BODY_SIZE_LIMITS"], "calculator.calculate", "calculator")
+        content_length = get_header(scope, b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            return json_response({"error": "Request body too large", "max_bytes": limit}, 413)
+
+        body = await read_body(receive, limit)
+        if body is None:
+            return json_response({"error": "Request body too large", "max_bytes": limit}, 413)
+
+        headers = {"Vary": "Accept"}
+        try:
+            payload, status = await self.evaluate(codec.decode(body)), 200
+        except ValidationError as e:
+            payload, status = e.to_dict(), e.status_code
+        except OffloadError as e:
+            payload, status = e.to_dict(), e.status_code
+            if e.retry_after is not None:
+                headers["Retry-After"] = e.retry_after
+        except Exception as e:
+            return json_response({"error": "Internal server error", "details": str(e)}, 500)
+
+        response_codec = CODECS[negotiate(get_header(scope, b"accept"), codec.mimetype)]
+        return Response(status, response_codec.dumps(payload), response_codec.mimetype, headers)
+
+    async def evaluate(self, payload):
+        """evaluate() sans bloquer la boucle : les opérations HEAVY sont attendues dans un thread"""
+        if is_heavy(payload):
+            return await asyncio.to_thread(evaluate, payload, self.extensions["offload"], self.extensions["singleflight"])
+        return evaluate(payload)
+
+    async def metrics(self, scope, receive):
+        """Équivalent de GET /metrics"""
+        # L'échantillonnage CPU bloque : exécuté hors de la boucle d'événements
+        await asyncio.to_thread(update_system_metrics)
+        return Response(200, generate_latest(), content_type=CONTENT_TYPE_LATEST)
+
+    async def calculation_session(self, scope, receive, send):
+        """
+        Session de calcul WebSocket avec pipelining
+        Au plus WS_MAX_IN_FLIGHT messages sont traités simultanément ; au-delà,
+        la lecture est suspendue (contre-pression jusqu'au client via TCP)
+        """
+        message = await receive()
+        if message["type"] != "websocket.connect":
+            return
+        await send({"type": "websocket.accept"})
+        WEBSOCKET_SESSIONS.inc()
+
+        slots = asyncio.Semaphore(self.config["WS_MAX_IN_FLIGHT"])
+        send_lock = asyncio.Lock()
+        pending = set()
+
+        async def process(text):
+            try:
+                reply = await self.calculation_reply(text)
+                async with send_lock:
+                    await send({"type": "websocket.send", "text": dump_json(reply).decode()})
+            finally:
+                slots.release()
+
+        try:
+            while True:
+                await slots.acquire()
+                message = await receive()
+                if message["type"] != "websocket.receive":
+                    slots.release()
+                    break
+                text = message.get("text")
+                if text is None:
+                    text = (message.get("bytes") or b"").decode("utf-8", "replace")
+                task = asyncio.ensure_future(process(text))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        finally:
+            for task in pending:
+                task.cancel()
+            WEBSOCKET_SESSIONS.dec()
+
+    async def calculation_reply(self, text):
+        """Traite un message de calcul WebSocket et retourne la réponse à envoyer"""
+        try:
+            message = json.loads(text)
+        except ValueError:
+            WEBSOCKET_MESSAGES.labels(status="error").inc()
+            return {"id": None, "error": "Invalid JSON message"}
+
+        message_id = message.get("id") if isinstance(message, dict) else None
+        try:
+            reply = await self.evaluate(message)
+        except (ValidationError, OffloadError) as e:
+            WEBSOCKET_MESSAGES.labels(status="error").inc()
+            reply = e.to_dict()
+        except Exception as e:
+            WEBSOCKET_MESSAGES.labels(status="error").inc()
+            reply = {"error": "Internal server error", "details": str(e)}
+        else:
+            WEBSOCKET_MESSAGES.labels(status="ok").inc()
+        reply["id"] = message_id
+        return reply
+
+
+async def read_body(receive, limit):
+    """Lit le corps de la requête ; retourne None dès que limit est dépassée"""
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > limit:
+            return None
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def create_asgi_app():
+    """Factory de l'application ASGI (même configuration que create_app, voir api/config.py)"""
+    return AsgiApp(load_config())
+
+
+app = create_asgi_app()
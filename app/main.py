@@ -3,25 +3,33 @@
 Application Flask principale pour le pipeline CI/CD Python
 """
 
-import os
+import signal
+import threading
 import time
 from flask import Flask, request, g
+from werkzeug.serving import make_server
 from api.health import health_bp
 from api.hello import hello_bp
-from api.calculator import calculator_bp
+from api.calculator import calculator_bp, stop_linalg_executor
+from api.jobs import jobs_bp, init_jobs
+from api.history import history_bp, init_history
 from api.metrics import metrics_bp, init_metrics, record_request_metrics
+from api.caching import init_http_cache
+from api.config import load_config
+from api.admission import init_admission_control
+from api.body_limits import init_body_limits
+from api.idempotency import init_idempotency
+from api.offload import init_offload
+from api.shutdown import init_shutdown
+from api.singleflight import init_singleflight
+from api.warmup import complete_startup, init_readiness, is_warmup_request
 
 
 def create_app():
     """Factory function pour créer l'application Flask"""
     app = Flask(__name__)
 
-    # Configuration de base
-    app.config["DEBUG"] = os.getenv("DEBUG", "false").lower() == "true"
-    app.config["HOST"] = os.getenv("HOST", "127.0.0.1")  # Default to localhost for security
-    app.config["PORT"] = int(os.getenv("PORT", 5000))
-    app.config["VERSION"] = os.getenv("VERSION", "1.0.0")
-    app.config["LOG_LEVEL"] = os.getenv("LOG_LEVEL", "INFO")
+    app.config.update(load_config())
 
     # Initialize metrics
     init_metrics(app)
@@ -31,23 +39,71 @@ def create_app():
     def before_request():
         g.start_time = time.time()
 
+    # Disponibilité, puis refus des requêtes et comptage des requêtes en cours pendant l'arrêt
+    init_readiness(app)
+    shutdown = init_shutdown(app)
+
+    # Rejet des corps trop volumineux avant lecture, délestage, puis rejeu des requêtes idempotentes
+    init_body_limits(app)
+    init_admission_control(app)
+    init_idempotency(app)
+    init_offload(app)
+    init_singleflight(app)
+    init_jobs(app)
+    init_history(app)
+
+    # Services arrêtés après le drainage, dans l'ordre inverse
+    shutdown.register("offload", app.extensions["offload"].shutdown)
+    shutdown.register("jobs", app.extensions["jobs"].stop)
+    shutdown.register("linalg", stop_linalg_executor, app)
+
     @app.after_request
     def after_request(response):
-        if hasattr(g, "start_time"):
+        if hasattr(g, "start_time") and not is_warmup_request():
             endpoint = request.endpoint or "unknown"
             method = request.method
             record_request_metrics(response, g.start_time, endpoint, method)
         return response
 
+    # ETag / If-None-Match (enregistré après le timing pour que les 304 soient comptés)
+    init_http_cache(app)
+
     # Enregistrement des blueprints
     app.register_blueprint(health_bp)
     app.register_blueprint(hello_bp, url_prefix="/api")
     app.register_blueprint(calculator_bp, url_prefix="/api")
+    app.register_blueprint(jobs_bp, url_prefix="/api")
+    app.register_blueprint(history_bp, url_prefix="/api")
     app.register_blueprint(metrics_bp)
 
+    # En dernier : toutes les routes et extensions sont en place
+    complete_startup(app)
+
     return app
 
 
+def serve(app):
+    """
+    Serveur HTTP multi-thread ; sur SIGTERM, le drainage s'exécute dans un thread dédié
+    pendant que le thread principal continue d'accepter les connexions (503 et /ready en échec),
+    puis le serveur s'arrête une fois les requêtes en cours terminées
+    """
+    server = make_server(app.config["HOST"], app.config["PORT"], app, threaded=True)
+
+    def drain_and_stop():
+        app.extensions["shutdown"].shutdown()
+        server.shutdown()
+
+    def handle_sigterm(signum, frame):
+        threading.Thread(target=drain_and_stop, name="shutdown-drain", daemon=True).start()
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    server.serve_forever()
+
+
 if __name__ == "__main__":
     app = create_app()
-    app.run(host=app.config["HOST"], port=app.config["PORT"], debug=app.config["DEBUG"])
+    if app.config["DEBUG"]:
+        app.run(host=app.config["HOST"], port=app.config["PORT"], debug=app.config["DEBUG"])
+    else:
+        serve(app)
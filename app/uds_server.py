@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Serveur de calcul sur socket Unix, en trames binaires préfixées par leur longueur
+Destiné aux services co-localisés (sidecars) : pas de HTTP, pas de JSON, pas de TCP
+
+Lancement : python app/uds_server.py --path /tmp/calculator.sock [--metrics-port 9101]
+
+Requête (little-endian) :
+    0   4   longueur de la suite de la trame (uint32, 21)
+    4   4   identifiant de requête (uint32, renvoyé tel quel)
+    8   1   code d'opération (voir OPERATION_CODES)
+    9   8   a (float64)
+    17  8   b (float64)
+
+Réponse :
+    0   4   longueur de la suite de la trame (uint32)
+    4   4   identifiant de requête
+    8   1   statut : 0 succès, 1 entrée invalide, 2 erreur interne
+    9   ..  succès : résultat (float64) ; erreur : message UTF-8
+
+Les requêtes peuvent être envoyées en rafale sans attendre les réponses : toutes
+les trames complètes reçues sont traitées dans l'ordre et leurs réponses écrites
+en une seule fois. Les opérations passent par la table de dispatch du calculateur
+(mêmes implémentations, mêmes erreurs et mêmes métriques par opération).
+Les opérations HEAVY sont refusées (statut 1) : elles bloqueraient la boucle
+d'événements et toutes les connexions ; elles restent disponibles en HTTP.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import struct
+import sys
+import tempfile
+
+from prometheus_client import start_http_server
+
+from api.calculator import DISPATCH, HEAVY_OPERATIONS, OPERATION_CODES, OPERATION_NAMES
+from api.metrics import UDS_CONNECTIONS, UDS_FRAMES
+from api.schema import ValidationError
+
+LENGTH = struct.Struct("<I")
+REQUEST = struct.Struct("<IBdd")
+RESPONSE_HEADER = struct.Struct("<IIB")
+RESULT = struct.Struct("<d")
+MAX_FRAME_SIZE = 64 * 1024
+
+OK = 0
+INVALID = 1
+INTERNAL_ERROR = 2
+
+UNSUPPORTED_OPERATION = f"Unsupported operation. Use: {', '.join(OPERATION_CODES)}"
+MALFORMED_FRAME = "Malformed calculation frame"
+
+
+def encode_request(request_id, operation_code, a, b):
+    """Construit une trame de requête (utilisé par les clients et les tests)"""
+    return LENGTH.pack(REQUEST.size) + REQUEST.pack(request_id, operation_code, a, b)
+
+
+def encode_response(request_id, status, payload):
+    return RESPONSE_HEADER.pack(RESPONSE_HEADER.size - LENGTH.size + len(payload), request_id, status) + payload
+
+
+def decode_response(frame):
+    """
+    Décode une trame de réponse complète (préfixe de longueur inclus)
+    Retourne (identifiant, statut, résultat float ou message d'erreur)
+    """
+    _, request_id, status = RESPONSE_HEADER.unpack_from(frame)
+    payload = bytes(frame[RESPONSE_HEADER.size :])
+    if status == OK:
+        return request_id, status, RESULT.unpack(payload)[0]
+    return request_id, status, payload.decode("utf-8")
+
+
+def calculation_frame(view):
+    """Traite le corps d'une trame de requête et retourne la trame de réponse"""
+    if len(view) != REQUEST.size:
+        request_id = LENGTH.unpack_from(view)[0] if len(view) >= LENGTH.size else 0
+        UDS_FRAMES.labels(status="error").inc()
+        return encode_response(request_id, INVALID, MALFORMED_FRAME.encode())
+
+    request_id, code, a, b = REQUEST.unpack_from(view)
+    try:
+        if code not in OPERATION_NAMES:
+            raise ValidationError(UNSUPPORTED_OPERATION)
+        if OPERATION_NAMES[code] in HEAVY_OPERATIONS:
+            raise ValidationError(f"Operation {OPERATION_NAMES[code]} is not available over the Unix socket")
+        result = DISPATCH[OPERATION_NAMES[code]].call(a, b)
+    except ValidationError as e:
+        UDS_FRAMES.labels(status="error").inc()
+        return encode_response(request_id, INVALID, e.message.encode())
+    except Exception as e:
+        UDS_FRAMES.labels(status="error").inc()
+        return encode_response(request_id, INTERNAL_ERROR, f"Internal server error: {e}".encode())
+    UDS_FRAMES.labels(status="ok").inc()
+    return encode_response(request_id, OK, RESULT.pack(result))
+
+
+class CalculatorProtocol(asyncio.Protocol):
+    """Une connexion : découpe le flux en trames et répond dans l'ordre"""
+
+    def __init__(self):
+        self.transport = None
+        self.buffer = bytearray()
+
+    def connection_made(self, transport):
+        self.transport = transport
+        UDS_CONNECTIONS.inc()
+
+    def connection_lost(self, exc):
+        UDS_CONNECTIONS.dec()
+
+    def data_received(self, data):
+        self.buffer += data
+        view = memoryview(self.buffer)
+        replies = []
+        offset = 0
+        try:
+            while len(view) - offset >= LENGTH.size:
+                length = LENGTH.unpack_from(view, offset)[0]
+                if length > MAX_FRAME_SIZE:
+                    # Flux désynchronisé ou client hostile : la connexion est fermée
+                    self.transport.close()
+                    return
+                end = offset + LENGTH.size + length
+                if end > len(view):
+                    break
+                replies.append(calculation_frame(view[offset + LENGTH.size : end]))
+                offset = end
+        finally:
+            view.release()
+        del self.buffer[:offset]
+        if replies:
+            self.transport.write(b"".join(replies))
+
+    # Contre-pression : un client qui ne lit pas ses réponses n'est plus lu
+    def pause_writing(self):
+        self.transport.pause_reading()
+
+    def resume_writing(self):
+        self.transport.resume_reading()
+
+
+async def serve(path, mode=0o660):
+    """Écoute sur le socket Unix path jusqu'à SIGTERM/SIGINT"""
+    if os.path.exists(path):
+        os.unlink(path)
+    loop = asyncio.get_running_loop()
+    server = await loop.create_unix_server(CalculatorProtocol, path)
+    os.chmod(path, mode)
+
+    stop = asyncio.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stop.set)
+    print(f"Listening on {path}")
+    try:
+        await stop.wait()
+    finally:
+        server.close()
+        await server.wait_closed()
+        os.unlink(path)
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Serveur de calcul binaire sur socket Unix")
+    default_path = os.getenv("UDS_PATH", os.path.join(tempfile.gettempdir(), "calculator.sock"))
+    parser.add_argument("--path", default=default_path, help="Chemin du socket")
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=int(os.getenv("UDS_METRICS_PORT", 0)),
+        help="Port HTTP des métriques Prometheus (0 : désactivé)",
+    )
+    args = parser.parse_args()
+
+    if args.metrics_port:
+        start_http_server(args.metrics_port)
+    asyncio.run(serve(args.path))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""
+Configuration gunicorn générée par scripts/capacity_sweep.py le 2026-10-19
+Mesuré : 1545 req/s, p99 43.7 ms, 78 MiB (32 connections, 20s, mix health=1,hello=1,calculate=8, 1 CPU (taskset 0))
+Lancement : gunicorn -c gunicorn.conf.py
+"""
+
+import os
+import signal
+
+wsgi_app = "main:create_app()"
+chdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app")
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
+
+worker_class = "gthread"
+workers = int(os.getenv("GUNICORN_WORKERS", 1))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+keepalive = 5
+timeout = 30
+# Drainage des requêtes en cours sur SIGTERM (voir SHUTDOWN_DRAIN_TIMEOUT)
+graceful_timeout = int(float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT", 25)))
+
+
+def post_worker_init(worker):
+    """
+    Sur SIGTERM, le drainage de l'application (GET /ready à 503) commence avec celui de gunicorn,
+    qui ferme lui-même les connexions keep-alive (l'en-tête Connection de l'application est ignoré)
+    """
+    shutdown = getattr(worker.wsgi, "extensions", {}).get("shutdown")
+    if shutdown is None:
+        return
+    handle_exit = worker.handle_exit
+
+    def drain_and_exit(signum, frame):
+        shutdown.begin_drain()
+        handle_exit(signum, frame)
+
+    # Le gestionnaire installé par gunicorn est la méthode liée d'origine : il est remplacé
+    signal.signal(signal.SIGTERM, drain_and_exit)
+    signal.siginterrupt(signal.SIGTERM, False)
+
+
+def worker_exit(server, worker):
+    """Arrête les services de l'application (tâches, pools) : gunicorn a déjà drainé les requêtes"""
+    shutdown = getattr(worker.wsgi, "extensions", {}).get("shutdown")
+    if shutdown is not None:
+        shutdown.shutdown(timeout=0)
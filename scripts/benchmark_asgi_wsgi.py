@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark comparatif des modes WSGI (Flask) et ASGI
+
+- Mode in-process (par défaut) : coût par requête de chaque application, sans réseau
+- Mode live (--wsgi-url / --asgi-url) : N connexions keep-alive simultanées contre
+  des serveurs démarrés, par exemple :
+    gunicorn --chdir app -w 2 --threads 8 'main:create_app()' -b 127.0.0.1:5000
+    uvicorn asgi:app --app-dir app --workers 2 --port 5001
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+CALCULATE_BODY = json.dumps({"operation": "multiply", "a": 7, "b": 6}).encode()
+
+SCENARIOS = {
+    "hello": ("GET", "/api/hello", b""),
+    "calculate": ("POST", "/api/calculate", CALCULATE_BODY),
+}
+
+
+def percentile(values, q):
+    """Percentile par rang le plus proche"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def run_in_process(requests_per_scenario):
+    """Mesure le coût par requête des deux applications dans le même processus"""
+    from asgi import create_asgi_app
+    from main import create_app
+
+    # Toutes les requêtes viennent du même client : pas de limitation de débit
+    os.environ.setdefault("RATE_LIMIT_RPS", "0")
+    client = create_app().test_client()
+    asgi_app = create_asgi_app()
+
+    async def asgi_requests(method, path, body, count):
+        async def send(message):
+            pass
+
+        for _ in range(count):
+            messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+            async def receive():
+                return messages.pop() if messages else {"type": "http.disconnect"}
+
+            scope = {"type": "http", "method": method, "path": path, "headers": [(b"content-type", b"application/json")]}
+            await asgi_app(scope, receive, send)
+
+    results = {}
+    for name, (method, path, body) in SCENARIOS.items():
+        start = time.perf_counter()
+        for _ in range(requests_per_scenario):
+            client.open(path, method=method, data=body, content_type="application/json")
+        wsgi = (time.perf_counter() - start) / requests_per_scenario
+
+        start = time.perf_counter()
+        asyncio.run(asgi_requests(method, path, body, requests_per_scenario))
+        asgi = (time.perf_counter() - start) / requests_per_scenario
+
+        results[name] = {"wsgi_us": wsgi * 1e6, "asgi_us": asgi * 1e6}
+    return results
+
+
+async def keep_alive_worker(host, port, request, deadline, latencies, counters):
+    """Une connexion keep-alive qui enchaîne les requêtes jusqu'à l'échéance"""
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        counters["connect_errors"] += 1
+        return
+    counters["connections"] += 1
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not head.startswith(b"HTTP/1.1 200"):
+                counters["errors"] += 1
+    except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+        counters["errors"] += 1
+    finally:
+        writer.close()
+
+
+async def run_live(url, scenario, connections, duration):
+    """Charge un serveur avec `connections` connexions keep-alive pendant `duration` secondes"""
+    parts = urlsplit(url)
+    method, path, body = SCENARIOS[scenario]
+    request = (
+        f"{method} {path} HTTP/1.1\r\nHost: {parts.hostname}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n"
+    ).encode() + body
+
+    latencies = []
+    counters = {"connections": 0, "connect_errors": 0, "errors": 0}
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(
+        *(
+            keep_alive_worker(parts.hostname, parts.port or 80, request, deadline, latencies, counters)
+            for _ in range(connections)
+        )
+    )
+    return {
+        "requests_per_second": len(latencies) / duration,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        **counters,
+    }
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Benchmark WSGI vs ASGI")
+    parser.add_argument("--requests", type=int, default=5000, help="Requêtes par scénario (mode in-process)")
+    parser.add_argument("--wsgi-url", help="URL du serveur WSGI (mode live)")
+    parser.add_argument("--asgi-url", help="URL du serveur ASGI (mode live)")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="calculate")
+    parser.add_argument("--connections", type=int, default=1000, help="Connexions keep-alive simultanées")
+    parser.add_argument("--duration", type=float, default=10.0, help="Durée de chaque mesure (secondes)")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    if args.wsgi_url or args.asgi_url:
+        results = {}
+        for mode, url in (("wsgi", args.wsgi_url), ("asgi", args.asgi_url)):
+            if url:
+                results[mode] = asyncio.run(run_live(url, args.scenario, args.connections, args.duration))
+        print(f"{'mode':<6} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'conns':>6} {'errors':>7}")
+        for mode, r in results.items():
+            print(
+                f"{mode:<6} {r['requests_per_second']:>10.0f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+                f"{r['connections']:>6} {r['errors'] + r['connect_errors']:>7}"
+            )
+    else:
+        results = run_in_process(args.requests)
+        print(f"{'scenario':<10} {'WSGI (µs)':>10} {'ASGI (µs)':>10}")
+        for name, r in results.items():
+            print(f"{name:<10} {r['wsgi_us']:>10.1f} {r['asgi_us']:>10.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'endpoint colonnaire : opérations par seconde pour un worker
+(requêtes envoyées via le client de test, sans réseau)
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from api.calculator import OPERATION_CODES  # noqa: E402
+from api.columnar import COLUMNAR_MIMETYPE, decode_result, encode_columns  # noqa: E402
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Benchmark du calcul colonnaire")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Lignes par requête")
+    parser.add_argument("--requests", type=int, default=20, help="Nombre de requêtes")
+    parser.add_argument("--operation", choices=sorted(OPERATION_CODES), default="multiply")
+    args = parser.parse_args()
+
+    os.environ.setdefault("RATE_LIMIT_RPS", "0")
+    from main import create_app
+
+    client = create_app().test_client()
+    rng = np.random.default_rng(0)
+    frame = encode_columns(OPERATION_CODES[args.operation], rng.random(args.rows), rng.random(args.rows) + 1)
+
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        response = client.post("/api/calculate/columnar", data=frame, content_type=COLUMNAR_MIMETYPE)
+        decode_result(response.get_data())
+    elapsed = time.perf_counter() - start
+
+    operations = args.rows * args.requests
+    print(f"{operations} operations in {elapsed:.3f}s -> {operations / elapsed / 1e6:.1f} M ops/s per worker")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'endpoint CSV en flux : lignes par seconde et mémoire maximale
+pour un fichier de plusieurs millions de lignes (client de test, sans réseau)
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from api.csv_stream import CSV_MIMETYPE  # noqa: E402
+
+
+def write_input(path, rows, seed=0, block=100_000):
+    """Génère un fichier operation,a,b aléatoire, par blocs"""
+    rng = np.random.default_rng(seed)
+    # Opérations élémentaires uniquement (primes est coûteux et borné)
+    names = np.array(["add", "subtract", "multiply", "divide"])
+    with open(path, "w", encoding="utf-8") as output:
+        output.write("operation,a,b\n")
+        for start in range(0, rows, block):
+            size = min(block, rows - start)
+            operations = names[rng.integers(0, len(names), size)]
+            a = rng.random(size) * 1000
+            b = rng.random(size) * 1000 + 1
+            output.writelines(f"{op},{x!r},{y!r}\n" for op, x, y in zip(operations, a.tolist(), b.tolist()))
+
+
+def max_rss_mib():
+    # ru_maxrss est en Kio sous Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Benchmark du calcul CSV en flux")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Lignes du fichier d'entrée")
+    parser.add_argument("--input", help="Fichier CSV existant (sinon généré dans un répertoire temporaire)")
+    args = parser.parse_args()
+
+    os.environ.setdefault("RATE_LIMIT_RPS", "0")
+    from main import create_app
+
+    client = create_app().test_client()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.input or os.path.join(directory, "input.csv")
+        if not args.input:
+            start = time.perf_counter()
+            write_input(path, args.rows)
+            print(f"Generated {args.rows} rows in {time.perf_counter() - start:.1f}s")
+        size = os.path.getsize(path)
+        baseline = max_rss_mib()
+
+        start = time.perf_counter()
+        with open(path, "rb") as body:
+            response = client.post("/api/calculate/csv", data=body, content_type=CSV_MIMETYPE, buffered=False)
+            lines = 0
+            output_bytes = 0
+            for chunk in response.response:
+                lines += chunk.count(b"\n") if isinstance(chunk, bytes) else chunk.count("\n")
+                output_bytes += len(chunk)
+            response.close()
+        elapsed = time.perf_counter() - start
+
+    rows = lines - 1
+    if response.status_code != 200:
+        print(f"Request failed with status {response.status_code}")
+        return 1
+    print(f"{rows} rows ({size / 2**20:.0f} MiB in, {output_bytes / 2**20:.0f} MiB out) in {elapsed:.2f}s")
+    print(f"Throughput: {rows / elapsed / 1e6:.2f} M rows/s, {size / 2**20 / elapsed:.0f} MiB/s")
+    print(f"Peak RSS: {max_rss_mib():.0f} MiB (before request: {baseline:.0f} MiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
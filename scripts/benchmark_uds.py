@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark du serveur de calcul sur socket Unix (app/uds_server.py)
+
+- aller-retour séquentiel : une requête en vol, latence par appel
+- rafale : BATCH requêtes écrites d'un bloc, débit en appels/s
+- comparaison optionnelle (--http-url) : POST /api/calculate en keep-alive sur TCP
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+APP_DIR = Path(__file__).parent.parent / "app"
+sys.path.insert(0, str(APP_DIR))
+
+from api.calculator import OPERATION_CODES  # noqa: E402
+from uds_server import LENGTH, decode_response, encode_request  # noqa: E402
+
+MULTIPLY = OPERATION_CODES["multiply"]
+
+
+def recv_exactly(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed by the server")
+        data += chunk
+    return data
+
+
+def recv_frame(sock):
+    header = recv_exactly(sock, LENGTH.size)
+    return decode_response(header + recv_exactly(sock, LENGTH.unpack(header)[0]))
+
+
+def wait_for_socket(path, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"{path} did not appear within {timeout}s")
+        time.sleep(0.05)
+
+
+def uds_sequential(path, calls):
+    """Latences (µs) d'appels successifs, une requête en vol"""
+    latencies = []
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        for i in range(calls):
+            start = time.perf_counter()
+            sock.sendall(encode_request(i, MULTIPLY, i, 2))
+            recv_frame(sock)
+            latencies.append((time.perf_counter() - start) * 1e6)
+    return latencies
+
+
+def uds_pipelined(path, calls, batch):
+    """Débit (appels/s) avec des rafales de batch requêtes"""
+    frames = b"".join(encode_request(i, MULTIPLY, i, 2) for i in range(batch))
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        start = time.perf_counter()
+        for _ in range(calls // batch):
+            sock.sendall(frames)
+            for _ in range(batch):
+                recv_frame(sock)
+        elapsed = time.perf_counter() - start
+    return calls // batch * batch / elapsed
+
+
+def http_sequential(url, calls):
+    """Latences (µs) de POST /api/calculate en keep-alive"""
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+    latencies = []
+    for i in range(calls):
+        body = json.dumps({"operation": "multiply", "a": i, "b": 2})
+        start = time.perf_counter()
+        connection.request("POST", "/api/calculate", body, {"Content-Type": "application/json"})
+        connection.getresponse().read()
+        latencies.append((time.perf_counter() - start) * 1e6)
+    connection.close()
+    return latencies
+
+
+def summary(latencies):
+    ordered = sorted(latencies)
+    return f"median {statistics.median(ordered):.1f} µs, p99 {ordered[int(0.99 * (len(ordered) - 1))]:.1f} µs"
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Benchmark du serveur de calcul sur socket Unix")
+    parser.add_argument("--calls", type=int, default=20_000, help="Appels par scénario")
+    parser.add_argument("--batch", type=int, default=100, help="Requêtes par rafale")
+    parser.add_argument("--path", help="Socket d'un serveur déjà démarré (sinon un serveur est lancé)")
+    parser.add_argument("--http-url", help="URL d'un serveur HTTP à comparer, ex. http://127.0.0.1:5000")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        server = None
+        path = args.path
+        if path is None:
+            path = os.path.join(directory, "calculator.sock")
+            server = subprocess.Popen([sys.executable, str(APP_DIR / "uds_server.py"), "--path", path])
+        try:
+            wait_for_socket(path)
+            print(f"UDS sequential: {summary(uds_sequential(path, args.calls))}")
+            print(f"UDS pipelined ({args.batch}/batch): {uds_pipelined(path, args.calls, args.batch):,.0f} calls/s")
+            if args.http_url:
+                print(f"HTTP sequential: {summary(http_sequential(args.http_url, args.calls))}")
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark du coût de validation par requête du calculateur
+Compare l'ancienne validation (boucle + if/elif) au schéma compilé
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from api.calculator import evaluate  # noqa: E402
+from api.schema import ValidationError  # noqa: E402
+
+PAYLOADS = {
+    "valid": {"operation": "multiply", "a": 7, "b": "6"},
+    "missing_field": {"operation": "add", "a": 1},
+    "not_numeric": {"operation": "add", "a": "x", "b": 1},
+    "bad_operation": {"operation": "power", "a": 2, "b": 3},
+}
+
+
+def legacy_evaluate(data):
+    """Validation et calcul tels qu'implémentés avant le schéma compilé"""
+    required_fields = ["operation", "a", "b"]
+    for field in required_fields:
+        if field not in data:
+            return {"error": f"Missing required field: {field}"}
+
+    operation = data["operation"]
+    try:
+        a = float(data["a"])
+        b = float(data["b"])
+    except (ValueError, TypeError):
+        return {"error": "Values a and b must be numeric"}
+
+    if operation == "add":
+        result = a + b
+    elif operation == "subtract":
+        result = a - b
+    elif operation == "multiply":
+        result = a * b
+    elif operation == "divide":
+        if b == 0:
+            return {"error": "Division by zero is not allowed"}
+        result = a / b
+    else:
+        return {"error": "Unsupported operation. Use: add, subtract, multiply, divide"}
+    return {"result": result, "operation": operation, "a": a, "b": b}
+
+
+def compiled_evaluate(data):
+    """Validation et calcul via le schéma compilé"""
+    try:
+        return evaluate(data)
+    except ValidationError as e:
+        return e.to_dict()
+
+
+def measure(func, payload, number, repeat):
+    """Meilleur temps par appel en nanosecondes"""
+    timings = timeit.repeat(lambda: func(payload), number=number, repeat=repeat)
+    return min(timings) / number * 1e9
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Benchmark de la validation du calculateur")
+    parser.add_argument("--number", type=int, default=100000, help="Appels par mesure")
+    parser.add_argument("--repeat", type=int, default=5, help="Nombre de mesures (le meilleur est retenu)")
+    args = parser.parse_args()
+
+    print(f"{'payload':<15} {'legacy (ns)':>12} {'compiled (ns)':>14} {'ratio':>7}")
+    for name, payload in PAYLOADS.items():
+        assert legacy_evaluate(payload) == compiled_evaluate(payload), name
+        legacy = measure(legacy_evaluate, payload, args.number, args.repeat)
+        compiled = measure(compiled_evaluate, payload, args.number, args.repeat)
+        print(f"{name:<15} {legacy:>12.0f} {compiled:>14.0f} {legacy / compiled:>6.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
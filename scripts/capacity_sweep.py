@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Balayage de capacité : workers × threads gunicorn sous un profil de charge fixe
+
+Pour chaque configuration, l'application est démarrée localement (gunicorn, worker
+gthread), éventuellement épinglée sur des CPU avec taskset pour reproduire la limite
+CPU du chart Helm, puis chargée en boucle fermée par scripts/load_generator.py.
+Le rapport donne débit, p99, erreurs et mémoire (RSS maître + workers) par
+configuration ; la configuration recommandée est écrite dans un gunicorn.conf.py
+utilisable tel quel en production :
+
+    gunicorn -c gunicorn.conf.py
+
+Exemple :
+    python scripts/capacity_sweep.py --workers 1,2,4 --threads 1,4,8 \\
+        --pin-from-values gitops-example/helm-chart/values-production.yaml --output /tmp/sweep.json
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import psutil
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from load_generator import DEFAULT_MIX, parse_mix, run_load  # noqa: E402
+
+ROOT_DIR = Path(__file__).parent.parent
+APP_DIR = ROOT_DIR / "app"
+
+CONFIG_TEMPLATE = '''"""
+Configuration gunicorn générée par scripts/capacity_sweep.py le {date}
+Mesuré : {throughput:.0f} req/s, p99 {p99:.1f} ms, {rss:.0f} MiB ({profile})
+Lancement : gunicorn -c gunicorn.conf.py
+"""
+
+import os
+import signal
+
+wsgi_app = "main:create_app()"
+chdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app")
+bind = f"{{os.getenv('HOST', '0.0.0.0')}}:{{os.getenv('PORT', '5000')}}"
+
+worker_class = "gthread"
+workers = int(os.getenv("GUNICORN_WORKERS", {workers}))
+threads = int(os.getenv("GUNICORN_THREADS", {threads}))
+keepalive = 5
+timeout = 30
+# Drainage des requêtes en cours sur SIGTERM (voir SHUTDOWN_DRAIN_TIMEOUT)
+graceful_timeout = int(float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT", 25)))
+
+
+def post_worker_init(worker):
+    """
+    Sur SIGTERM, le drainage de l'application (GET /ready à 503) commence avec celui de gunicorn,
+    qui ferme lui-même les connexions keep-alive (l'en-tête Connection de l'application est ignoré)
+    """
+    shutdown = getattr(worker.wsgi, "extensions", {{}}).get("shutdown")
+    if shutdown is None:
+        return
+    handle_exit = worker.handle_exit
+
+    def drain_and_exit(signum, frame):
+        shutdown.begin_drain()
+        handle_exit(signum, frame)
+
+    # Le gestionnaire installé par gunicorn est la méthode liée d'origine : il est remplacé
+    signal.signal(signal.SIGTERM, drain_and_exit)
+    signal.siginterrupt(signal.SIGTERM, False)
+
+
+def worker_exit(server, worker):
+    """Arrête les services de l'application (tâches, pools) : gunicorn a déjà drainé les requêtes"""
+    shutdown = getattr(worker.wsgi, "extensions", {{}}).get("shutdown")
+    if shutdown is not None:
+        shutdown.shutdown(timeout=0)
+'''
+
+
+def parse_counts(text):
+    """ "1,2,4" -> [1, 2, 4]"""
+    counts = sorted({int(part) for part in text.split(",") if part.strip()})
+    if not counts or counts[0] < 1:
+        raise ValueError(f"expected a comma-separated list of positive integers, got {text!r}")
+    return counts
+
+
+def cpu_limit_from_values(path):
+    """Limite CPU (en cœurs) de resources.limits.cpu d'un fichier values Helm"""
+    with open(path) as f:
+        values = yaml.safe_load(f)
+    limit = str(values["resources"]["limits"]["cpu"])
+    return float(limit[:-1]) / 1000 if limit.endswith("m") else float(limit)
+
+
+def pinned_cpus(cores):
+    """Liste taskset de ceil(cores) CPU parmi ceux disponibles"""
+    available = sorted(os.sched_getaffinity(0))
+    count = max(1, math.ceil(cores))
+    if count > len(available):
+        print(f"⚠️  {count} CPUs requested, only {len(available)} available")
+    return ",".join(str(cpu) for cpu in available[:count])
+
+
+def cpu_count(cpus):
+    """Nombre de CPU d'une liste taskset ("0", "0-1,4"), ou des CPU disponibles sans épinglage"""
+    if not cpus:
+        return len(os.sched_getaffinity(0))
+    count = 0
+    for part in cpus.split(","):
+        low, _, high = part.partition("-")
+        count += int(high or low) - int(low) + 1
+    return count
+
+
+def wait_ready(port, timeout=30.0):
+    """Attend GET /ready = 200 (préchauffage terminé)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/ready")
+            if connection.getresponse().status == 200:
+                return True
+        except OSError:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+class MemorySampler(threading.Thread):
+    """RSS maximal du processus maître et de ses enfants pendant la mesure"""
+
+    def __init__(self, pid, interval=0.25):
+        super().__init__(daemon=True)
+        self.process = psutil.Process(pid)
+        self.interval = interval
+        self.peak = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                processes = [self.process, *self.process.children(recursive=True)]
+                self.peak = max(self.peak, sum(p.memory_info().rss for p in processes))
+            except psutil.Error:
+                pass
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def run_configuration(workers, threads, args, cpus):
+    """Démarre gunicorn, applique le profil de charge et retourne les mesures"""
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "--chdir",
+        str(APP_DIR),
+        "--worker-class",
+        "gthread",
+        "--workers",
+        str(workers),
+        "--threads",
+        str(threads),
+        "--bind",
+        f"127.0.0.1:{args.port}",
+        "main:create_app()",
+    ]
+    if cpus:
+        command = ["taskset", "-c", cpus, *command]
+    # Un seul client local : la limitation de débit par adresse fausserait la mesure
+    env = {**os.environ, "RATE_LIMIT_RPS": "0"}
+    server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not wait_ready(args.port):
+            return {"workers": workers, "threads": threads, "error": "server did not become ready"}
+        url = f"http://127.0.0.1:{args.port}"
+        if args.warmup > 0:
+            asyncio.run(run_load(url, "closed", args.connections, args.warmup, mix=args.mix))
+        sampler = MemorySampler(server.pid)
+        sampler.start()
+        try:
+            report = asyncio.run(run_load(url, "closed", args.connections, args.duration, mix=args.mix))
+        finally:
+            sampler.stop()
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+    return {
+        "workers": workers,
+        "threads": threads,
+        "throughput_rps": report["throughput_rps"],
+        "p50_ms": report["latency"]["percentiles_ms"]["p50"],
+        "p99_ms": report["latency"]["percentiles_ms"]["p99"],
+        "errors": report["errors"],
+        "requests": report["requests"],
+        "rss_mib": sampler.peak / 2**20,
+    }
+
+
+def recommend(results, p99_budget_ms=None, tolerance=0.05):
+    """
+    Configuration sans erreur (et sous le budget p99) de débit maximal ; parmi celles à
+    moins de tolerance du meilleur débit, la moins gourmande en mémoire
+    """
+    eligible = [
+        r for r in results if "error" not in r and r["errors"] == 0 and (p99_budget_ms is None or r["p99_ms"] <= p99_budget_ms)
+    ]
+    if not eligible:
+        return None
+    best = max(r["throughput_rps"] for r in eligible)
+    close = [r for r in eligible if r["throughput_rps"] >= (1 - tolerance) * best]
+    return min(close, key=lambda r: (r["rss_mib"], r["workers"] * r["threads"]))
+
+
+def write_config(path, recommended, profile):
+    Path(path).write_text(
+        CONFIG_TEMPLATE.format(
+            date=datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+            throughput=recommended["throughput_rps"],
+            p99=recommended["p99_ms"],
+            rss=recommended["rss_mib"],
+            profile=profile,
+            workers=recommended["workers"],
+            threads=recommended["threads"],
+        )
+    )
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Balayage workers × threads et recommandation gunicorn")
+    parser.add_argument("--workers", default="1,2,4", help="Nombres de workers à tester")
+    parser.add_argument("--threads", default="1,4,8", help="Nombres de threads par worker à tester")
+    parser.add_argument("--cpus", help="CPU d'épinglage pour taskset, ex. 0 ou 0-1")
+    parser.add_argument("--pin-from-values", help="Fichier values Helm dont resources.limits.cpu fixe l'épinglage")
+    parser.add_argument("--connections", type=int, default=32, help="Connexions keep-alive du profil de charge")
+    parser.add_argument("--duration", type=float, default=20.0, help="Durée de mesure par configuration (secondes)")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Charge de chauffe non mesurée (secondes)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Scénarios pondérés (défaut : {DEFAULT_MIX})")
+    parser.add_argument("--p99-budget-ms", type=float, help="p99 maximal d'une configuration recommandable")
+    parser.add_argument("--port", type=int, default=5099, help="Port local des serveurs testés")
+    parser.add_argument("--output", help="Fichier JSON du rapport")
+    parser.add_argument("--config-output", default=str(ROOT_DIR / "gunicorn.conf.py"), help="gunicorn.conf.py généré")
+    args = parser.parse_args()
+
+    try:
+        worker_counts, thread_counts = parse_counts(args.workers), parse_counts(args.threads)
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    cpus = args.cpus
+    if args.pin_from_values:
+        cores = cpu_limit_from_values(args.pin_from_values)
+        cpus = pinned_cpus(cores)
+        print(f"📌 CPU limit {cores:g} from {args.pin_from_values}: pinned to CPUs {cpus}")
+    if cpus and shutil.which("taskset") is None:
+        parser.error("taskset is required for CPU pinning")
+
+    results = []
+    print(f"{'workers':>7} {'threads':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7} {'RSS MiB':>8}")
+    for workers in worker_counts:
+        for threads in thread_counts:
+            result = run_configuration(workers, threads, args, cpus)
+            results.append(result)
+            if "error" in result:
+                print(f"{workers:>7} {threads:>7}  ❌ {result['error']}")
+                continue
+            print(
+                f"{workers:>7} {threads:>7} {result['throughput_rps']:>9.0f} {result['p50_ms']:>8.2f} "
+                f"{result['p99_ms']:>8.2f} {result['errors']:>7} {result['rss_mib']:>8.0f}"
+            )
+
+    recommended = recommend(results, args.p99_budget_ms)
+    profile = f"{args.connections} connections, {args.duration:g}s, mix {args.mix}, {cpu_count(cpus)} CPU" + (
+        f" (taskset {cpus})" if cpus else ""
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"profile": profile, "results": results, "recommended": recommended}, f, indent=2)
+    if recommended is None:
+        print("❌ No configuration met the criteria (no errors, p99 budget)")
+        return 1
+
+    write_config(args.config_output, recommended, profile)
+    print(f"✅ Recommended: {recommended['workers']} workers × {recommended['threads']} threads -> {args.config_output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
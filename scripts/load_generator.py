@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Générateur de charge HTTP pour valider la capacité avant une mise en production
+
+Deux modes :
+- boucle fermée (--mode closed) : N connexions keep-alive enchaînent les requêtes ;
+  le débit s'adapte au serveur
+- boucle ouverte (--mode open) : les requêtes partent à débit constant (--rate), que
+  le serveur suive ou non ; la latence est mesurée depuis l'instant d'envoi prévu,
+  ce qui évite l'omission coordonnée (une requête retardée par la précédente compte
+  son attente)
+
+Scénarios pondérés (--mix health=1,hello=1,calculate=8), connexions réutilisées,
+histogrammes de latence à précision relative bornée (style HdrHistogram) et rapport
+de percentiles exportable en JSON.
+
+Exemples :
+    python scripts/load_generator.py --url http://127.0.0.1:5000 --mode closed --connections 32 --duration 30
+    python scripts/load_generator.py --mode open --rate 2000 --connections 64 --output /tmp/load.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+SCENARIOS = {
+    "health": ("GET", "/health", None),
+    "hello": ("GET", "/api/hello", None),
+    "calculate": ("POST", "/api/calculate", {"operation": "multiply", "a": 7, "b": 6}),
+}
+DEFAULT_MIX = "health=1,hello=1,calculate=8"
+REPORT_PERCENTILES = (50.0, 75.0, 90.0, 95.0, 99.0, 99.9, 99.99, 100.0)
+
+
+class LatencyHistogram:
+    """
+    Histogramme log-linéaire en microsecondes (principe de HdrHistogram)
+    Valeurs exactes jusqu'à 2^sub_bucket_bits, puis 2^(sub_bucket_bits - 1) sous-intervalles
+    par puissance de deux : erreur relative inférieure à 2^-(sub_bucket_bits - 1)
+    (0,1 % avec la valeur par défaut), mémoire indépendante du nombre de mesures
+    """
+
+    def __init__(self, sub_bucket_bits=11):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count >> 1
+        self.counts = Counter()
+        self.total = 0
+        self.sum = 0
+        self.min = None
+        self.max = 0
+
+    def _index(self, value):
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return self.sub_bucket_count + (shift - 1) * self.half_count + ((value >> shift) - self.half_count)
+
+    def _highest_equivalent(self, index):
+        """Plus grande valeur représentée par un intervalle"""
+        if index < self.sub_bucket_count:
+            return index
+        shift, offset = divmod(index - self.sub_bucket_count, self.half_count)
+        shift += 1
+        return ((self.half_count + offset + 1) << shift) - 1
+
+    def record(self, seconds):
+        value = max(0, int(seconds * 1e6))
+        self.counts[self._index(value)] += 1
+        self.total += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        self.counts.update(other.counts)
+        self.total += other.total
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def value_at_percentile(self, percentile):
+        """Latence (µs) sous laquelle se trouvent percentile % des mesures"""
+        if self.total == 0:
+            return 0
+        rank = max(1, math.ceil(percentile / 100 * self.total))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def report(self):
+        return {
+            "count": self.total,
+            "mean_ms": self.sum / self.total / 1000 if self.total else 0.0,
+            "min_ms": (self.min or 0) / 1000,
+            "max_ms": self.max / 1000,
+            "percentiles_ms": {f"p{p:g}": self.value_at_percentile(p) / 1000 for p in REPORT_PERCENTILES},
+        }
+
+
+def parse_mix(text):
+    """ "health=1,calculate=8" -> [(scénario, poids)]"""
+    mix = []
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"unknown scenario {name!r}, use: {', '.join(SCENARIOS)}")
+        mix.append((name, float(weight or 1)))
+    if not any(weight > 0 for _, weight in mix):
+        raise ValueError("at least one scenario needs a positive weight")
+    return mix
+
+
+def build_request(host, method, path, payload):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    head = f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\nContent-Length: {len(body)}\r\n"
+    if payload is not None:
+        head += "Content-Type: application/json\r\n"
+    return (head + "\r\n").encode() + body
+
+
+class Results:
+    """Mesures par scénario : latences, temps de service et statuts"""
+
+    def __init__(self, names):
+        self.latency = {name: LatencyHistogram() for name in names}
+        self.service = {name: LatencyHistogram() for name in names}
+        self.statuses = {name: Counter() for name in names}
+
+    def record(self, name, status, latency, service_time):
+        self.latency[name].record(latency)
+        self.service[name].record(service_time)
+        self.statuses[name][status] += 1
+
+    def report(self, elapsed):
+        total_latency, total_service = LatencyHistogram(), LatencyHistogram()
+        statuses = Counter()
+        scenarios = {}
+        for name, histogram in self.latency.items():
+            if histogram.total == 0:
+                continue
+            total_latency.merge(histogram)
+            total_service.merge(self.service[name])
+            statuses.update(self.statuses[name])
+            scenarios[name] = {
+                "latency": histogram.report(),
+                "service_time": self.service[name].report(),
+                "statuses": {str(status): count for status, count in self.statuses[name].items()},
+            }
+        errors = sum(count for status, count in statuses.items() if not (isinstance(status, int) and status < 400))
+        return {
+            "duration_s": elapsed,
+            "requests": total_latency.total,
+            "errors": errors,
+            "throughput_rps": total_latency.total / elapsed if elapsed else 0.0,
+            "latency": total_latency.report(),
+            "service_time": total_service.report(),
+            "statuses": {str(status): count for status, count in statuses.items()},
+            "scenarios": scenarios,
+        }
+
+
+class ConnectionClosed(ConnectionError):
+    """Connexion fermée par le serveur avant tout octet de réponse"""
+
+
+class Connection:
+    """Connexion HTTP/1.1 keep-alive, rouverte si le serveur la ferme"""
+
+    def __init__(self, host, port, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+
+    async def send(self, request):
+        """
+        Envoie une requête et lit la réponse ; retourne le statut HTTP ou un libellé d'erreur
+        Une connexion réutilisée que le serveur a fermée pendant l'inactivité (aucun octet de
+        réponse reçu) est rouverte une fois avant de compter une erreur
+        """
+        for attempt in range(2):
+            reused = self.writer is not None
+            try:
+                return await self.exchange(request)
+            except asyncio.TimeoutError:
+                self.close()
+                return "timeout"
+            except ConnectionClosed:
+                self.close()
+                if reused and attempt == 0:
+                    continue
+                return "connection_error"
+            except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                self.close()
+                return "connection_error"
+
+    async def exchange(self, request):
+        """Un aller-retour requête/réponse ; ouvre la connexion si nécessaire"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+        try:
+            self.writer.write(request)
+            head = await asyncio.wait_for(self.reader.readuntil(b"\r\n\r\n"), self.timeout)
+        except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError) as e:
+            if getattr(e, "partial", b""):
+                raise
+            raise ConnectionClosed() from e
+        status = int(head[9:12])
+        length, close = 0, False
+        for line in head.split(b"\r\n")[1:]:
+            name, _, value = line.partition(b":")
+            name = name.strip().lower()
+            if name == b"content-length":
+                length = int(value)
+            elif name == b"connection" and value.strip().lower() == b"close":
+                close = True
+        await asyncio.wait_for(self.reader.readexactly(length), self.timeout)
+        if close:
+            self.close()
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def closed_loop(connection, requests, mix, results, deadline, remaining):
+    """Une connexion qui enchaîne les requêtes jusqu'à l'échéance ou au quota"""
+    names, weights = zip(*mix)
+    while time.perf_counter() < deadline and remaining[0] > 0:
+        remaining[0] -= 1
+        name = random.choices(names, weights)[0]
+        start = time.perf_counter()
+        status = await connection.send(requests[name])
+        elapsed = time.perf_counter() - start
+        results.record(name, status, elapsed, elapsed)
+
+
+async def open_loop_worker(connection, requests, queue, results):
+    """Consomme les envois planifiés ; la latence part de l'instant prévu"""
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        name, intended = item
+        start = time.perf_counter()
+        status = await connection.send(requests[name])
+        done = time.perf_counter()
+        results.record(name, status, done - intended, done - start)
+
+
+async def open_loop_schedule(rate, mix, queue, deadline, total, workers):
+    """Planifie les envois à intervalles réguliers de 1/rate secondes"""
+    names, weights = zip(*mix)
+    start = time.perf_counter()
+    for i in range(total):
+        intended = start + i / rate
+        if intended >= deadline:
+            break
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        queue.put_nowait((random.choices(names, weights)[0], intended))
+    for _ in range(workers):
+        queue.put_nowait(None)
+
+
+def parse_target(url):
+    """Retourne (hôte, port, en-tête Host) ; seul http:// est pris en charge (pas de TLS)"""
+    parts = urlsplit(url)
+    if parts.scheme != "http" or not parts.hostname:
+        raise ValueError(f"unsupported URL {url!r}: expected http://host[:port]")
+    return parts.hostname, parts.port or 80, parts.netloc
+
+
+async def run_load(
+    url, mode="closed", connections=10, duration=10.0, requests=None, rate=100.0, mix=DEFAULT_MIX, timeout=10.0
+):
+    """
+    Exécute une campagne de charge et retourne le rapport (dict sérialisable en JSON)
+    requests borne le nombre total de requêtes (sinon seule la durée compte)
+    """
+    host, port, netloc = parse_target(url)
+    mix = parse_mix(mix) if isinstance(mix, str) else mix
+    encoded = {name: build_request(netloc, *SCENARIOS[name]) for name, _ in mix}
+    results = Results(encoded)
+    pool = [Connection(host, port, timeout) for _ in range(connections)]
+    total = requests if requests is not None else sys.maxsize
+
+    start = time.perf_counter()
+    deadline = start + duration
+    if mode == "closed":
+        remaining = [total]
+        await asyncio.gather(*(closed_loop(c, encoded, mix, results, deadline, remaining) for c in pool))
+    elif mode == "open":
+        queue = asyncio.Queue()
+        await asyncio.gather(
+            open_loop_schedule(rate, mix, queue, deadline, total, connections),
+            *(open_loop_worker(c, encoded, queue, results) for c in pool),
+        )
+    else:
+        raise ValueError(f"unknown mode {mode!r}")
+    elapsed = time.perf_counter() - start
+    for connection in pool:
+        connection.close()
+
+    report = results.report(elapsed)
+    report["config"] = {
+        "url": url,
+        "mode": mode,
+        "connections": connections,
+        "duration_s": duration,
+        "requests": requests,
+        "rate": rate if mode == "open" else None,
+        "mix": dict(mix),
+    }
+    return report
+
+
+def print_report(report):
+    config = report["config"]
+    rate = f" at {config['rate']:g} req/s" if config["rate"] else ""
+    print(f"📈 {config['mode']}-loop{rate}, {config['connections']} connections, {report['duration_s']:.1f}s")
+    print(f"   {report['requests']} requests, {report['errors']} errors, {report['throughput_rps']:.0f} req/s")
+    print(f"   {'scenario':<10} {'count':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'p99.9 ms':>9} {'max ms':>8}")
+    rows = [(name, data["latency"]) for name, data in report["scenarios"].items()] + [("total", report["latency"])]
+    for name, latency in rows:
+        p = latency["percentiles_ms"]
+        print(
+            f"   {name:<10} {latency['count']:>8} {p['p50']:>8.2f} {p['p90']:>8.2f} {p['p99']:>8.2f} "
+            f"{p['p99.9']:>9.2f} {latency['max_ms']:>8.2f}"
+        )
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Générateur de charge HTTP (boucle fermée ou ouverte)")
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="URL de base de l'API")
+    parser.add_argument("--mode", choices=("closed", "open"), default="closed")
+    parser.add_argument("--connections", type=int, default=10, help="Connexions keep-alive")
+    parser.add_argument("--duration", type=float, default=10.0, help="Durée maximale (secondes)")
+    parser.add_argument("--requests", type=int, help="Nombre total de requêtes (optionnel)")
+    parser.add_argument("--rate", type=float, default=100.0, help="Débit d'arrivée en boucle ouverte (req/s)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Pondération des scénarios (défaut : {DEFAULT_MIX})")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Délai maximal par requête (secondes)")
+    parser.add_argument("--output", help="Fichier JSON du rapport")
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+        parse_target(args.url)
+    except ValueError as e:
+        parser.error(str(e))
+    report = asyncio.run(
+        run_load(args.url, args.mode, args.connections, args.duration, args.requests, args.rate, mix, args.timeout)
+    )
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["requests"] == 0 or report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
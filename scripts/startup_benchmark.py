@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Budget de démarrage à froid : temps jusqu'à la première requête servie
+
+Chaque mesure lance un interpréteur neuf qui importe main, appelle create_app()
+(préchauffage compris) puis sert une première requête via le client de test.
+Une exécution supplémentaire avec -X importtime fournit le détail des imports.
+Code de sortie 1 si la médiane dépasse le budget absolu (--budget-ms) ou, avec
+--baseline, si elle dépasse de plus de --max-regression celle d'un rapport de
+référence mesuré sur la même machine (en CI : le commit de base, via --app-dir).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).parent.parent / "app"
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+app = main.create_app()
+created = time.perf_counter()
+status = app.test_client().get(sys.argv[1]).status_code
+served = time.perf_counter()
+print(json.dumps({"wall_clock": time.time(), "import": imported - start, "create_app": created - imported,
+                  "first_request": served - created, "status": status}))
+"""
+
+
+def run_child(path, app_dir=APP_DIR, importtime=False):
+    """Lance un processus neuf ; retourne (phases en secondes, sortie stderr)"""
+    command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", CHILD, path]
+    spawned = time.time()
+    completed = subprocess.run(command, cwd=app_dir, capture_output=True, text=True, check=True)
+    phases = json.loads(completed.stdout.strip().splitlines()[-1])
+    phases["time_to_first_request"] = phases.pop("wall_clock") - spawned
+    return phases, completed.stderr
+
+
+def parse_importtime(stderr):
+    """Lignes « import time: self | cumulative | nom » -> [(module, profondeur, self µs, cumulé µs)]"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return modules
+
+
+def import_report(modules, top):
+    """Imports directs de l'application (enfants de main) et modules les plus coûteux (temps propre)"""
+    # -X importtime écrit les enfants avant leur parent
+    direct, children = [], []
+    total_us = 0
+    for name, depth, own, cumulative in modules:
+        if depth == 1:
+            children.append((name, cumulative))
+        elif depth == 0:
+            if name == "main":
+                direct, total_us = children, cumulative
+            children = []
+    return {
+        "main_ms": total_us / 1000,
+        "direct_imports_ms": {name: cumulative / 1000 for name, cumulative in sorted(direct, key=lambda m: -m[1])},
+        "slowest_modules_ms": {name: own / 1000 for name, _, own, _ in sorted(modules, key=lambda m: -m[2])[:top]},
+    }
+
+
+def budget_failures(elapsed, budget_ms, baseline_ms=None, max_regression=0.25):
+    """Messages d'échec : budget absolu dépassé, ou régression au-delà de max_regression par rapport à la baseline"""
+    failures = []
+    if elapsed > budget_ms:
+        failures.append(f"Time to first request {elapsed:.0f} ms exceeds the {budget_ms:.0f} ms budget")
+    if baseline_ms is not None and elapsed > baseline_ms * (1 + max_regression):
+        failures.append(
+            f"Time to first request {elapsed:.0f} ms is more than {max_regression:.0%} above the baseline ({baseline_ms:.0f} ms)"
+        )
+    return failures
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Budget de démarrage à froid de l'application")
+    parser.add_argument("--runs", type=int, default=5, help="Nombre de démarrages mesurés")
+    parser.add_argument("--budget-ms", type=float, default=1500, help="Médiane maximale jusqu'à la première requête")
+    parser.add_argument("--baseline", help="Rapport JSON de référence (même machine) pour la comparaison relative")
+    parser.add_argument(
+        "--max-regression", type=float, default=0.25, help="Hausse relative maximale de la médiane (0.25 = 25 %%)"
+    )
+    parser.add_argument("--app-dir", default=str(APP_DIR), help="Répertoire de l'application mesurée")
+    parser.add_argument("--path", default="/health", help="Route de la première requête")
+    parser.add_argument("--top", type=int, default=15, help="Modules listés dans le rapport d'imports")
+    parser.add_argument("--output", help="Fichier JSON du rapport")
+    args = parser.parse_args()
+
+    os.environ.setdefault("RATE_LIMIT_RPS", "0")
+    runs = [run_child(args.path, args.app_dir)[0] for _ in range(args.runs)]
+    _, stderr = run_child(args.path, args.app_dir, importtime=True)
+
+    phases = ("import", "create_app", "first_request", "time_to_first_request")
+    report = {
+        "runs": args.runs,
+        "budget_ms": args.budget_ms,
+        "median_ms": {phase: statistics.median(run[phase] for run in runs) * 1000 for phase in phases},
+        "imports": import_report(parse_importtime(stderr), args.top),
+    }
+
+    for phase, value in report["median_ms"].items():
+        print(f"{phase:>22}: {value:8.1f} ms")
+    print("Slowest imports (self time):")
+    for name, value in report["imports"]["slowest_modules_ms"].items():
+        print(f"  {value:7.1f} ms  {name}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    elapsed = report["median_ms"]["time_to_first_request"]
+    baseline_ms = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline_ms = json.load(f)["median_ms"]["time_to_first_request"]
+    failures = budget_failures(elapsed, args.budget_ms, baseline_ms, args.max_regression)
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        return 1
+    reference = f", baseline {baseline_ms:.0f} ms" if baseline_ms is not None else ""
+    print(f"✅ Time to first request {elapsed:.0f} ms within the {args.budget_ms:.0f} ms budget{reference}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,11 +5,17 @@ Peut être utilisé pour des tests manuels ou automatisés
 """
 
 import requests
+import asyncio
 import json
+import os
 import sys
 import time
 from typing import Dict, Any, Optional
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+
+from load_generator import print_report, run_load  # noqa: E402
+
 
 class APITester:
     def __init__(self, base_url: str = "http://localhost:5000"):
@@ -147,44 +153,39 @@ class APITester:
 
         return results
 
-    def performance_test(self, num_requests: int = 10):
-        """Test de performance basique"""
-        print(f"\n⚡ TEST DE PERFORMANCE ({num_requests} requêtes)")
-
-        response_times = []
-        successful_requests = 0
-
-        for i in range(num_requests):
-            print(f"Requête {i+1}/{num_requests}...", end=" ")
-            result = self.make_request("GET", "/health")
-
-            if result.get("response_time"):
-                response_times.append(result["response_time"])
-                successful_requests += 1
-                print(f"✅ {result['response_time']:.3f}s")
-            else:
-                print("❌ Échec")
-
-        if response_times:
-            avg_time = sum(response_times) / len(response_times)
-            min_time = min(response_times)
-            max_time = max(response_times)
-
-            print(f"\n📊 Statistiques de performance:")
-            print(f"   Requêtes réussies: {successful_requests}/{num_requests}")
-            print(f"   Temps moyen: {avg_time:.3f}s")
-            print(f"   Temps minimum: {min_time:.3f}s")
-            print(f"   Temps maximum: {max_time:.3f}s")
-
-            return {
-                "successful_requests": successful_requests,
-                "total_requests": num_requests,
-                "avg_response_time": avg_time,
-                "min_response_time": min_time,
-                "max_response_time": max_time,
-            }
-
-        return None
+    def performance_test(
+        self, num_requests: int = 10, connections: int = 1, mode: str = "closed", rate: float = 100.0, mix: str = "health=1"
+    ):
+        """Test de performance délégué au générateur de charge (scripts/load_generator.py)"""
+        print(f"\n⚡ TEST DE PERFORMANCE ({num_requests} requêtes, {connections} connexions, boucle {mode})")
+
+        report = asyncio.run(
+            run_load(
+                self.base_url,
+                mode=mode,
+                connections=connections,
+                duration=max(10.0, num_requests / rate) if mode == "open" else 300.0,
+                requests=num_requests,
+                rate=rate,
+                mix=mix,
+            )
+        )
+        print_report(report)
+
+        latency = report["latency"]
+        if latency["count"] == 0:
+            return None
+        successful_requests = report["requests"] - report["errors"]
+        print(f"\n📊 Requêtes réussies: {successful_requests}/{report['requests']}")
+        return {
+            "successful_requests": successful_requests,
+            "total_requests": report["requests"],
+            "avg_response_time": latency["mean_ms"] / 1000,
+            "min_response_time": latency["min_ms"] / 1000,
+            "max_response_time": latency["max_ms"] / 1000,
+            "p99_response_time": latency["percentiles_ms"]["p99"] / 1000,
+            "report": report,
+        }
 
     def run_all_tests(self):
         """Exécuter tous les tests"""
@@ -235,6 +236,17 @@ def main():
     parser.add_argument(
         "--performance-requests", type=int, default=10, help="Nombre de requêtes pour le test de performance (défaut: 10)"
     )
+    parser.add_argument(
+        "--performance-connections", type=int, default=1, help="Connexions simultanées du test de performance (défaut: 1)"
+    )
+    parser.add_argument(
+        "--performance-mode",
+        choices=["closed", "open"],
+        default="closed",
+        help="Boucle fermée ou débit constant (--performance-rate) pour le test de performance",
+    )
+    parser.add_argument("--performance-rate", type=float, default=100.0, help="Débit en boucle ouverte (req/s)")
+    parser.add_argument("--performance-mix", default="health=1", help="Scénarios pondérés, ex. health=1,calculate=8")
 
     args = parser.parse_args()
 
@@ -249,7 +261,13 @@ def main():
     elif args.endpoint == "errors":
         tester.test_error_cases()
     elif args.endpoint == "performance":
-        tester.performance_test(args.performance_requests)
+        tester.performance_test(
+            args.performance_requests,
+            args.performance_connections,
+            args.performance_mode,
+            args.performance_rate,
+            args.performance_mix,
+        )
     else:
         tester.run_all_tests()
 
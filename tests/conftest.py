@@ -12,6 +12,13 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
 from main import create_app
 
 
+@pytest.fixture(autouse=True)
+def isolated_environment(tmp_path, monkeypatch):
+    """Base de tâches propre à chaque test, sans préchauffage (réactivé dans test_warmup.py)"""
+    monkeypatch.setenv("JOBS_DATABASE", str(tmp_path / "jobs.db"))
+    monkeypatch.setenv("WARMUP_ENABLED", "false")
+
+
 @pytest.fixture
 def app():
     """Fixture pour créer l'application Flask en mode test"""
@@ -30,3 +37,8 @@ def client(app):
 def runner(app):
     """Fixture pour créer un runner de commandes CLI"""
     return app.test_cli_runner()
+
+
+def pytest_configure(config):
+    """Enregistre le marqueur des benchmarks (la section de pytest.ini n'est pas lue : en-tête [tool:pytest])"""
+    config.addinivalue_line("markers", "benchmark: micro-benchmarks comparés aux baselines (RUN_BENCHMARKS=1)")
@@ -0,0 +1,227 @@
+"""
+Tests pour le contrôle d'admission (limitation de débit et délestage)
+"""
+
+import json
+
+from api.admission import AdaptiveConcurrencyLimiter, ConcurrencyLimiter, TokenBucketLimiter
+from api.metrics import ACTIVE_CONNECTIONS, CALCULATOR_IN_FLIGHT
+from main import create_app
+
+
+class FakeClock:
+    """Horloge contrôlable pour les tests"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def calculate(client):
+    data = {"operation": "add", "a": 1, "b": 2}
+    return client.post("/api/calculate", data=json.dumps(data), content_type="application/json")
+
+
+class TestTokenBucketLimiter:
+    """Tests unitaires du seau de jetons"""
+
+    def test_burst_then_reject(self):
+        """Test que la rafale est admise puis la requête suivante refusée"""
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(rate=1, burst=3, clock=clock)
+
+        assert [limiter.acquire("c") for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert limiter.acquire("c") > 0
+
+    def test_refill_over_time(self):
+        """Test que les jetons se rechargent au débit configuré"""
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(rate=2, burst=1, clock=clock)
+
+        assert limiter.acquire("c") == 0.0
+        wait = limiter.acquire("c")
+        assert abs(wait - 0.5) < 1e-9
+
+        clock.now += 0.5
+        assert limiter.acquire("c") == 0.0
+
+    def test_clients_are_isolated(self):
+        """Test que chaque client dispose de son propre seau"""
+        limiter = TokenBucketLimiter(rate=1, burst=1, clock=FakeClock())
+
+        assert limiter.acquire("a") == 0.0
+        assert limiter.acquire("b") == 0.0
+        assert limiter.acquire("a") > 0
+
+    def test_idle_buckets_are_evicted(self):
+        """Test que les seaux inactifs sont supprimés"""
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(rate=1, burst=1, idle_timeout=10, clock=clock)
+        limiter.acquire("old")
+
+        clock.now += 11
+        limiter.acquire("new")
+
+        assert "old" not in limiter.buckets
+        assert "new" in limiter.buckets
+
+
+class TestConcurrencyLimiter:
+    """Tests unitaires du plafond de concurrence"""
+
+    def test_cap_and_release(self):
+        """Test que le plafond est respecté et libéré"""
+        limiter = ConcurrencyLimiter(2)
+
+        assert limiter.try_acquire()
+        assert limiter.try_acquire()
+        assert not limiter.try_acquire()
+
+        limiter.release()
+        assert limiter.try_acquire()
+
+    def test_in_flight_gauge(self):
+        """Test que les requêtes admises sont exportées par calculator_in_flight, pas par flask_active_connections"""
+        limiter = ConcurrencyLimiter(2)
+        connections = ACTIVE_CONNECTIONS._value.get()
+
+        limiter.try_acquire()
+        assert CALCULATOR_IN_FLIGHT._value.get() == 1
+        limiter.release()
+        assert CALCULATOR_IN_FLIGHT._value.get() == 0
+        assert ACTIVE_CONNECTIONS._value.get() == connections
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Tests unitaires du limiteur adaptatif"""
+
+    def saturate(self, limiter, latency, rounds=50):
+        """Remplit le limiteur puis libère toutes les places avec la latence donnée"""
+        for _ in range(rounds):
+            acquired = 0
+            while limiter.try_acquire():
+                acquired += 1
+            for _ in range(acquired):
+                limiter.release(latency)
+
+    def test_limit_grows_while_latency_is_stable(self):
+        """Test que la limite augmente tant que la latence reste stable"""
+        limiter = AdaptiveConcurrencyLimiter(10, max_limit=200)
+        self.saturate(limiter, 0.010)
+
+        assert limiter.limit > 10
+
+    def test_limit_drops_when_latency_rises(self):
+        """Test que la limite diminue quand la latence dépasse la référence"""
+        limiter = AdaptiveConcurrencyLimiter(10, max_limit=200)
+        self.saturate(limiter, 0.010)
+        grown = limiter.limit
+
+        self.saturate(limiter, 0.100, rounds=1)
+
+        assert limiter.limit < grown / 2
+
+    def test_limit_does_not_grow_when_underused(self):
+        """Test que la limite ne croît pas si le worker est peu sollicité"""
+        limiter = AdaptiveConcurrencyLimiter(20)
+        for _ in range(100):
+            limiter.try_acquire()
+            limiter.release(0.010)
+
+        assert limiter.limit == 20
+
+    def test_limit_respects_bounds(self):
+        """Test que la limite reste dans [min_limit, max_limit]"""
+        limiter = AdaptiveConcurrencyLimiter(10, min_limit=4, max_limit=12)
+        self.saturate(limiter, 0.010)
+        assert limiter.limit == 12
+
+        self.saturate(limiter, 10.0, rounds=10)
+        assert limiter.limit == 4
+
+
+class TestAdmissionMiddleware:
+    """Tests d'intégration du contrôle d'admission"""
+
+    def test_rate_limited_returns_429(self, monkeypatch):
+        """Test qu'un client dépassant son débit reçoit 429 avec Retry-After"""
+        monkeypatch.setenv("RATE_LIMIT_RPS", "0.001")
+        monkeypatch.setenv("RATE_LIMIT_BURST", "2")
+        client = create_app().test_client()
+
+        assert calculate(client).status_code == 200
+        assert calculate(client).status_code == 200
+        response = calculate(client)
+
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        assert "error" in response.get_json()
+
+    def test_overloaded_worker_returns_503(self, app, client):
+        """Test que le délestage renvoie 503 lorsque le plafond est atteint"""
+        concurrency = app.extensions["admission"].concurrency
+        for _ in range(concurrency.limit):
+            concurrency.try_acquire()
+
+        response = calculate(client)
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+    def test_shed_request_keeps_its_token(self, monkeypatch):
+        """Test qu'une requête délestée en 503 ne consomme pas de jeton"""
+        monkeypatch.setenv("RATE_LIMIT_RPS", "0.001")
+        monkeypatch.setenv("RATE_LIMIT_BURST", "1")
+        app = create_app()
+        client = app.test_client()
+        concurrency = app.extensions["admission"].concurrency
+        for _ in range(concurrency.limit):
+            concurrency.try_acquire()
+
+        assert calculate(client).status_code == 503
+        for _ in range(concurrency.limit):
+            concurrency.release()
+
+        assert calculate(client).status_code == 200
+        assert calculate(client).status_code == 429
+        assert concurrency.in_flight == 0
+
+    def test_rate_limit_disabled_by_default(self, app):
+        """Test que la limite de débit est désactivée sans RATE_LIMIT_RPS"""
+        assert app.extensions["admission"].rate_limiter is None
+
+    def test_slot_released_after_request(self, app, client):
+        """Test que la place est libérée à la fin de la requête"""
+        calculate(client)
+
+        assert app.extensions["admission"].concurrency.in_flight == 0
+
+    def test_other_blueprints_not_limited(self, monkeypatch):
+        """Test que les routes hors calculateur ne sont pas limitées"""
+        monkeypatch.setenv("RATE_LIMIT_RPS", "0.001")
+        monkeypatch.setenv("RATE_LIMIT_BURST", "1")
+        client = create_app().test_client()
+
+        for _ in range(3):
+            assert client.get("/api/hello").status_code == 200
+
+    def test_admission_metrics_exported(self, client):
+        """Test que les décisions d'admission sont exportées"""
+        calculate(client)
+        data = client.get("/metrics").get_data(as_text=True)
+
+        assert 'flask_admission_decisions_total{decision="admitted"}' in data
+
+    def test_adaptive_limit_exported(self, monkeypatch):
+        """Test que la limite adaptative est exportée comme jauge"""
+        monkeypatch.setenv("ADAPTIVE_CONCURRENCY", "true")
+        app = create_app()
+        client = app.test_client()
+
+        assert isinstance(app.extensions["admission"].concurrency, AdaptiveConcurrencyLimiter)
+        calculate(client)
+        data = client.get("/metrics").get_data(as_text=True)
+
+        assert "flask_concurrency_limit" in data
@@ -0,0 +1,343 @@
+"""
+Tests pour l'application ASGI
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from asgi import create_asgi_app
+
+
+def call(app, method, path, body=b"", headers=None, chunks=None):
+    """Exécute une requête ASGI et retourne (status, en-têtes, corps)"""
+    return asyncio.run(request(app, method, path, body, headers, chunks))
+
+
+async def request(app, method, path, body=b"", headers=None, chunks=None):
+    """Version asynchrone de call (requêtes simultanées sur une même boucle)"""
+    messages = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks or []]
+    messages.append({"type": "http.request", "body": body, "more_body": False})
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    await app(scope, receive, send)
+
+    start, body_message = sent
+    return start["status"], {k.decode(): v.decode() for k, v in start["headers"]}, body_message["body"]
+
+
+def post_json(app, payload):
+    return call(app, "POST", "/api/calculate", json.dumps(payload).encode(), {"Content-Type": "application/json"})
+
+
+@pytest.fixture
+def asgi_app():
+    app = create_asgi_app()
+    yield app
+    app.extensions["offload"].shutdown()
+
+
+class TestAsgiApp:
+    """Tests de parité entre les modes ASGI et WSGI"""
+
+    def test_health(self, asgi_app):
+        """Test que /health répond comme la version Flask"""
+        status, headers, body = call(asgi_app, "GET", "/health")
+
+        assert status == 200
+        assert headers["content-type"] == "application/json"
+        assert json.loads(body)["status"] == "healthy"
+        assert headers["cache-control"] == "no-cache"
+
+    def test_hello_identical_to_flask(self, asgi_app, client):
+        """Test que le corps et l'ETag de /api/hello sont identiques aux deux modes"""
+        status, headers, body = call(asgi_app, "GET", "/api/hello")
+        flask_response = client.get("/api/hello")
+
+        assert status == 200
+        assert body == flask_response.get_data()
+        assert headers["etag"] == flask_response.headers["ETag"]
+
+    def test_hello_not_modified(self, asgi_app):
+        """Test qu'un If-None-Match correspondant renvoie 304"""
+        _, headers, _ = call(asgi_app, "GET", "/api/hello")
+        status, _, body = call(asgi_app, "GET", "/api/hello", headers={"If-None-Match": headers["etag"]})
+
+        assert status == 304
+        assert body == b""
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"operation": "add", "a": 5, "b": 3},
+            {"operation": "divide", "a": 1, "b": 0},
+            {"operation": "modulo", "a": 2, "b": 3},
+            {"operation": "add", "a": "x", "b": 3},
+            {"a": 1, "b": 2},
+        ],
+    )
+    def test_calculate_identical_to_flask(self, asgi_app, client, payload):
+        """Test que les résultats et erreurs du calculateur sont identiques"""
+        status, _, body = post_json(asgi_app, payload)
+        flask_response = client.post("/api/calculate", data=json.dumps(payload), content_type="application/json")
+
+        assert status == flask_response.status_code
+        assert json.loads(body) == flask_response.get_json()
+
+    @pytest.mark.parametrize("body", [b"{not json", b"", b"\xff"])
+    def test_invalid_json_identical_to_flask(self, asgi_app, client, body):
+        """Test qu'un corps JSON illisible renvoie 400 dans les deux modes"""
+        status, _, asgi_body = call(asgi_app, "POST", "/api/calculate", body, {"Content-Type": "application/json"})
+        flask_response = client.post("/api/calculate", data=body, content_type="application/json")
+
+        assert status == flask_response.status_code == 400
+        assert json.loads(asgi_body) == flask_response.get_json() == {"error": "Invalid request body"}
+
+    def test_calculate_body_limit_shared_with_flask(self, monkeypatch):
+        """Test que BODY_LIMIT_CALCULATOR s'applique aussi en ASGI (configuration partagée)"""
+        monkeypatch.setenv("BODY_LIMIT_CALCULATOR", "10")
+        status, _, body = post_json(create_asgi_app(), {"operation": "add", "a": 1, "b": 2})
+
+        assert status == 413
+        assert json.loads(body)["max_bytes"] == 10
+
+    def test_calculate_streamed_body(self, asgi_app):
+        """Test qu'un corps reçu en plusieurs messages est réassemblé"""
+        status, _, body = call(
+            asgi_app,
+            "POST",
+            "/api/calculate",
+            b'"b": 6}',
+            {"Content-Type": "application/json"},
+            chunks=[b'{"operation": "multiply", ', b'"a": 7, '],
+        )
+
+        assert status == 200
+        assert json.loads(body)["result"] == 42
+
+    def test_calculate_requires_json(self, asgi_app):
+        """Test que le Content-Type JSON est exigé"""
+        status, _, body = call(asgi_app, "POST", "/api/calculate", b"a=1", {"Content-Type": "text/plain"})
+
+        assert status == 400
+        assert "Content-Type must be application/json" in json.loads(body)["error"]
+
+    def test_calculate_body_limit(self, asgi_app):
+        """Test que les corps trop volumineux sont rejetés"""
+        status, _, _ = call(
+            asgi_app, "POST", "/api/calculate", b"x" * 100, {"Content-Type": "application/json", "Content-Length": "999999"}
+        )
+
+        assert status == 413
+
+    def test_heavy_operation_does_not_block_loop(self, asgi_app):
+        """Test qu'une opération lourde n'empêche pas la boucle de servir les autres requêtes"""
+        completed = []
+
+        async def post(payload):
+            response = await request(
+                asgi_app, "POST", "/api/calculate", json.dumps(payload).encode(), {"Content-Type": "application/json"}
+            )
+            completed.append(payload["operation"])
+            return response
+
+        async def scenario():
+            heavy = asyncio.ensure_future(post({"operation": "primes", "a": 0, "b": 10_000_000}))
+            await asyncio.sleep(0)
+            cheap = await post({"operation": "add", "a": 1, "b": 2})
+            return await heavy, cheap
+
+        (heavy_status, _, heavy_body), (cheap_status, _, _) = asyncio.run(scenario())
+
+        assert heavy_status == cheap_status == 200
+        assert json.loads(heavy_body)["result"] == 664579
+        assert completed == ["add", "primes"]
+
+    def test_saturated_pool_returns_503(self, asgi_app):
+        """Test qu'un pool saturé renvoie 503 avec Retry-After, comme en WSGI"""
+        asgi_app.extensions["offload"].max_workers = 0
+        asgi_app.extensions["offload"].max_queue = 0
+        status, headers, _ = post_json(asgi_app, {"operation": "primes", "a": 2, "b": 3})
+
+        assert status == 503
+        assert headers["retry-after"] == "1"
+
+    def test_method_not_allowed(self, asgi_app):
+        """Test que les méthodes non autorisées renvoient 405"""
+        status, headers, _ = call(asgi_app, "POST", "/health")
+
+        assert status == 405
+        assert headers["allow"] == "GET, HEAD"
+
+    def test_not_found(self, asgi_app):
+        """Test qu'un chemin inconnu renvoie 404"""
+        status, _, _ = call(asgi_app, "GET", "/unknown")
+
+        assert status == 404
+
+    def test_metrics_shared_with_flask(self, asgi_app):
+        """Test que /metrics expose les métriques partagées"""
+        call(asgi_app, "GET", "/api/hello")
+        status, headers, body = call(asgi_app, "GET", "/metrics")
+
+        assert status == 200
+        assert "text/plain" in headers["content-type"]
+        assert 'endpoint="hello.hello"' in body.decode()
+
+    def test_calculate_msgpack(self, asgi_app):
+        """Test que le mode ASGI négocie aussi MessagePack"""
+        msgpack = pytest.importorskip("msgpack")
+        status, headers, body = call(
+            asgi_app,
+            "POST",
+            "/api/calculate",
+            msgpack.packb({"operation": "add", "a": 2, "b": 3}),
+            {"Content-Type": "application/msgpack"},
+        )
+
+        assert status == 200
+        assert headers["content-type"] == "application/msgpack"
+        assert msgpack.unpackb(body)["result"] == 5.0
+
+
+class FakeWebSocketClient:
+    """Client WebSocket simulé au niveau du protocole ASGI"""
+
+    def __init__(self, app, path="/ws/calculate"):
+        self.app = app
+        self.path = path
+        self.incoming = asyncio.Queue()
+        self.outgoing = asyncio.Queue()
+        self.receive_calls = 0
+
+    async def receive(self):
+        self.receive_calls += 1
+        return await self.incoming.get()
+
+    async def send(self, message):
+        await self.outgoing.put(message)
+
+    async def run(self, messages, expected_replies):
+        """Ouvre la session, envoie les messages et collecte les réponses"""
+        scope = {"type": "websocket", "path": self.path, "headers": []}
+        session = asyncio.ensure_future(self.app(scope, self.receive, self.send))
+        await self.incoming.put({"type": "websocket.connect"})
+        accept = await self.outgoing.get()
+        for message in messages:
+            await self.incoming.put({"type": "websocket.receive", "text": message})
+        replies = [json.loads((await self.outgoing.get())["text"]) for _ in range(expected_replies)]
+        await self.incoming.put({"type": "websocket.disconnect", "code": 1000})
+        await session
+        return accept, replies
+
+
+class TestWebSocketSessions:
+    """Tests pour les sessions de calcul WebSocket"""
+
+    def test_pipelined_calculations(self, asgi_app):
+        """Test que plusieurs calculs envoyés d'affilée reçoivent chacun leur réponse"""
+        messages = [json.dumps({"id": i, "operation": "multiply", "a": i, "b": 2}) for i in range(20)]
+        accept, replies = asyncio.run(FakeWebSocketClient(asgi_app).run(messages, 20))
+
+        assert accept["type"] == "websocket.accept"
+        assert {reply["id"]: reply["result"] for reply in replies} == {i: i * 2.0 for i in range(20)}
+
+    def test_results_identical_to_http(self, asgi_app, client):
+        """Test que les réponses sont identiques à celles de POST /api/calculate"""
+        payloads = [
+            {"operation": "divide", "a": 9, "b": 3},
+            {"operation": "divide", "a": 1, "b": 0},
+            {"operation": "modulo", "a": 1, "b": 2},
+            {"operation": "add", "a": 1},
+        ]
+        messages = [json.dumps(dict(payload, id=f"req-{i}")) for i, payload in enumerate(payloads)]
+        _, replies = asyncio.run(FakeWebSocketClient(asgi_app).run(messages, len(payloads)))
+        by_id = {reply.pop("id"): reply for reply in replies}
+
+        for i, payload in enumerate(payloads):
+            expected = client.post("/api/calculate", data=json.dumps(payload), content_type="application/json").get_json()
+            assert by_id[f"req-{i}"] == expected
+
+    def test_heavy_message_answered_out_of_order(self, asgi_app):
+        """Test qu'un calcul léger envoyé après un calcul lourd reçoit sa réponse en premier"""
+        messages = [
+            json.dumps({"id": "heavy", "operation": "primes", "a": 0, "b": 10_000_000}),
+            json.dumps({"id": "cheap", "operation": "add", "a": 1, "b": 2}),
+        ]
+        _, replies = asyncio.run(FakeWebSocketClient(asgi_app).run(messages, 2))
+
+        assert [reply["id"] for reply in replies] == ["cheap", "heavy"]
+        assert replies[1]["result"] == 664579
+
+    def test_invalid_json_message(self, asgi_app):
+        """Test qu'un message non JSON reçoit une erreur sans fermer la session"""
+        messages = ["not json", json.dumps({"id": 1, "operation": "add", "a": 1, "b": 1})]
+        _, replies = asyncio.run(FakeWebSocketClient(asgi_app).run(messages, 2))
+
+        assert {"id": None, "error": "Invalid JSON message"} in replies
+        assert {"id": 1, "result": 2.0, "operation": "add", "a": 1.0, "b": 1.0} in replies
+
+    def test_backpressure_limits_reads(self, monkeypatch):
+        """Test que la lecture est suspendue lorsque WS_MAX_IN_FLIGHT réponses sont en attente"""
+        monkeypatch.setenv("WS_MAX_IN_FLIGHT", "2")
+        app = create_asgi_app()
+
+        async def scenario():
+            release = asyncio.Event()
+            ws = FakeWebSocketClient(app)
+            original_send = ws.send
+
+            async def blocking_send(message):
+                if message["type"] == "websocket.send":
+                    await release.wait()
+                await original_send(message)
+
+            ws.send = blocking_send
+            scope = {"type": "websocket", "path": "/ws/calculate", "headers": []}
+            session = asyncio.ensure_future(app(scope, ws.receive, ws.send))
+            await ws.incoming.put({"type": "websocket.connect"})
+            await ws.outgoing.get()
+            for i in range(5):
+                await ws.incoming.put(
+                    {"type": "websocket.receive", "text": json.dumps({"id": i, "operation": "add", "a": 1, "b": i})}
+                )
+            for _ in range(10):
+                await asyncio.sleep(0)
+            reads_while_blocked = ws.receive_calls
+
+            release.set()
+            for _ in range(5):
+                await ws.outgoing.get()
+            await ws.incoming.put({"type": "websocket.disconnect", "code": 1000})
+            await session
+            return reads_while_blocked
+
+        # connect + 2 messages en cours ; le 3e n'est pas lu tant qu'aucune place ne se libère
+        assert asyncio.run(scenario()) == 3
+
+    def test_unknown_websocket_path_closed(self, asgi_app):
+        """Test qu'un chemin WebSocket inconnu est refusé"""
+        sent = []
+
+        async def receive():
+            return {"type": "websocket.connect"}
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(asgi_app({"type": "websocket", "path": "/ws/unknown", "headers": []}, receive, send))
+
+        assert sent == [{"type": "websocket.close", "code": 1008}]
@@ -0,0 +1,254 @@
+"""
+Micro-benchmarks en processus avec baselines JSON et seuil de régression
+
+Désactivés par défaut (coûteux et dépendants de la machine) :
+    RUN_BENCHMARKS=1 python -m pytest tests/test_benchmarks.py -m benchmark
+
+Chaque mesure répète ROUNDS séries d'appels et retient la médiane du temps par appel
+et sa dispersion (MAD). Une régression est signalée si la médiane dépasse celle de la
+baseline de plus de max(BENCHMARK_TOLERANCE × baseline, BENCHMARK_MAD_FACTOR × MAD
+combinés) : le seuil s'élargit automatiquement pour les mesures bruitées.
+
+- BENCHMARK_UPDATE_BASELINE=1 réécrit la baseline avec les mesures courantes
+- BENCHMARK_BASELINE : fichier de baseline (défaut tests/benchmark_baselines.json)
+- BENCHMARK_RESULTS : fichier JSON des mesures courantes (artefact CI)
+La comparaison n'a lieu que sur la machine de la baseline (même empreinte) : en CI,
+le job "benchmarks" enregistre la baseline du commit de base puis compare le commit
+testé sur le même runner ; le fichier versionné sert aux comparaisons locales.
+
+L'échantillonnage CPU de update_system_metrics (psutil.cpu_percent(interval=1)) dort
+une seconde : il est remplacé par sa forme non bloquante pour mesurer le reste du code.
+"""
+
+import json
+import os
+import platform
+import statistics
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from api.calculator import OPERATION_CODES, evaluate, validate_calculation
+from api.codecs import dump_json
+from api.columnar import COLUMNAR_MIMETYPE, encode_columns
+from api.metrics import psutil, record_request_metrics, update_system_metrics
+from main import create_app
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run benchmarks"),
+]
+
+BASELINE_PATH = Path(os.getenv("BENCHMARK_BASELINE", Path(__file__).parent / "benchmark_baselines.json"))
+TOLERANCE = float(os.getenv("BENCHMARK_TOLERANCE", 0.25))
+MAD_FACTOR = float(os.getenv("BENCHMARK_MAD_FACTOR", 5))
+ROUNDS = int(os.getenv("BENCHMARK_ROUNDS", 15))
+MIN_ROUND_SECONDS = 0.02
+
+CALCULATION = {"operation": "multiply", "a": 6, "b": 7}
+
+
+def machine_fingerprint():
+    """Empreinte de la machine : une baseline n'est comparable que sur la même"""
+    return f"{platform.system()}-{platform.machine()}-{os.cpu_count()}cpu-py{platform.python_version()}"
+
+
+def measure(function, rounds=ROUNDS):
+    """Temps par appel (secondes) : (médiane, MAD) sur rounds séries calibrées à MIN_ROUND_SECONDS"""
+    function()
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        if time.perf_counter() - start >= MIN_ROUND_SECONDS:
+            break
+        calls *= 2
+
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        samples.append((time.perf_counter() - start) / calls)
+    median = statistics.median(samples)
+    return median, statistics.median(abs(sample - median) for sample in samples)
+
+
+def regression_threshold(baseline, mad):
+    """Écart maximal toléré par rapport à la médiane de la baseline"""
+    # 1.4826 × MAD estime l'écart-type pour une distribution normale
+    noise = 1.4826 * (baseline["mad_us"] ** 2 + mad**2) ** 0.5
+    return max(TOLERANCE * baseline["median_us"], MAD_FACTOR * noise)
+
+
+@pytest.fixture(scope="session")
+def baselines():
+    """Baseline chargée, puis mesures de la session écrites en fin de session si demandé"""
+    stored = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    current = {}
+    yield stored, current
+    document = {"machine": machine_fingerprint(), "benchmarks": current}
+    if os.getenv("BENCHMARK_UPDATE_BASELINE"):
+        merged = {**stored.get("benchmarks", {}), **current}
+        BASELINE_PATH.write_text(json.dumps({**document, "benchmarks": dict(sorted(merged.items()))}, indent=2) + "\n")
+    if os.getenv("BENCHMARK_RESULTS"):
+        Path(os.getenv("BENCHMARK_RESULTS")).write_text(json.dumps(document, indent=2) + "\n")
+
+
+@pytest.fixture
+def bench(baselines):
+    """bench(nom, fonction, rounds=ROUNDS) : mesure puis compare à la baseline"""
+    stored, current = baselines
+
+    def run(name, function, rounds=ROUNDS):
+        median, mad = measure(function, rounds)
+        current[name] = {"median_us": round(median * 1e6, 3), "mad_us": round(mad * 1e6, 3)}
+        baseline = stored.get("benchmarks", {}).get(name)
+        if os.getenv("BENCHMARK_UPDATE_BASELINE") or baseline is None:
+            return
+        if stored.get("machine") != machine_fingerprint():
+            pytest.skip(f"baseline recorded on {stored.get('machine')}, not comparable on {machine_fingerprint()}")
+        threshold = regression_threshold(baseline, mad * 1e6)
+        assert median * 1e6 <= baseline["median_us"] + threshold, (
+            f"{name}: {median * 1e6:.1f} µs/call vs baseline {baseline['median_us']:.1f} µs "
+            f"(threshold +{threshold:.1f} µs)"
+        )
+
+    return run
+
+
+@pytest.fixture
+def nonblocking_cpu_sampler(monkeypatch):
+    """cpu_percent(interval=1) remplacé par cpu_percent(interval=None) (sans la seconde d'attente)"""
+    cpu_percent = psutil.cpu_percent
+    monkeypatch.setattr(psutil, "cpu_percent", lambda interval=None, percpu=False: cpu_percent(None, percpu))
+
+
+@pytest.fixture(scope="module")
+def bench_app(tmp_path_factory):
+    """Application sans limitation de débit ni de concurrence (toutes les requêtes viennent du même client)"""
+    overrides = {
+        "RATE_LIMIT_RPS": "0",
+        "MAX_CONCURRENT_REQUESTS": "0",
+        "JOBS_DATABASE": str(tmp_path_factory.mktemp("jobs") / "jobs.db"),
+    }
+    previous = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    try:
+        app = create_app()
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    yield app
+    app.extensions["shutdown"].shutdown()
+
+
+@pytest.fixture(scope="module")
+def bench_client(bench_app):
+    return bench_app.test_client()
+
+
+def checked(client, expected_status, method, path, **kwargs):
+    """Requête de benchmark dont le statut est vérifié une fois avant la mesure"""
+    response = client.open(path, method=method, **kwargs)
+    assert response.status_code == expected_status, response.get_data(as_text=True)
+    return lambda: client.open(path, method=method, **kwargs)
+
+
+class TestEndpointBenchmarks:
+    """Chaque endpoint via le client de test (pile Flask complète, sans réseau)"""
+
+    @pytest.mark.parametrize(
+        "name, method, path, kwargs, status",
+        [
+            ("health", "GET", "/health", {}, 200),
+            ("ready", "GET", "/ready", {}, 200),
+            ("hello", "GET", "/api/hello", {}, 200),
+            ("calculate_json", "POST", "/api/calculate", {"json": CALCULATION}, 200),
+            ("calculate_error", "POST", "/api/calculate", {"json": {"operation": "divide", "a": 1, "b": 0}}, 400),
+            ("aggregate_json", "POST", "/api/aggregate", {"json": {"values": list(range(1000))}}, 200),
+            (
+                "csv_1000_rows",
+                "POST",
+                "/api/calculate/csv",
+                {"data": "operation,a,b\n" + "add,1,2\n" * 1000, "content_type": "text/csv"},
+                200,
+            ),
+            (
+                "linalg_matmul_32",
+                "POST",
+                "/api/linalg",
+                {"json": {"operation": "matmul", "a": np.eye(32).tolist(), "b": np.eye(32).tolist()}},
+                200,
+            ),
+            ("history", "GET", "/api/history?limit=100", {}, 200),
+            ("job_unknown", "GET", "/api/jobs/unknown", {}, 404),
+        ],
+    )
+    def test_endpoint(self, bench, bench_client, name, method, path, kwargs, status):
+        """Test de non-régression du temps par requête de chaque endpoint"""
+        bench(f"endpoint.{name}", checked(bench_client, status, method, path, **kwargs))
+
+    def test_calculate_msgpack(self, bench, bench_client):
+        """Test de non-régression du calcul en MessagePack"""
+        msgpack = pytest.importorskip("msgpack")
+        data = msgpack.packb(CALCULATION)
+        bench(
+            "endpoint.calculate_msgpack",
+            checked(bench_client, 200, "POST", "/api/calculate", data=data, content_type="application/msgpack"),
+        )
+
+    def test_columnar(self, bench, bench_client):
+        """Test de non-régression du calcul colonnaire (10 000 lignes)"""
+        frame = encode_columns(OPERATION_CODES["multiply"], np.arange(10_000.0), np.ones(10_000))
+        bench(
+            "endpoint.columnar_10k_rows",
+            checked(bench_client, 200, "POST", "/api/calculate/columnar", data=frame, content_type=COLUMNAR_MIMETYPE),
+        )
+
+    def test_job_submit(self, bench, bench_client):
+        """Test de non-régression de la soumission d'une tâche"""
+        bench(
+            "endpoint.job_submit",
+            checked(bench_client, 202, "POST", "/api/jobs", json={"items": [CALCULATION]}),
+        )
+
+    def test_metrics(self, bench, bench_client, nonblocking_cpu_sampler):
+        """Test de non-régression de /metrics (échantillonnage système non bloquant)"""
+        bench("endpoint.metrics", checked(bench_client, 200, "GET", "/metrics"))
+
+
+class TestComponentBenchmarks:
+    """Composants isolés"""
+
+    def test_record_request_metrics(self, bench):
+        """Test de non-régression de l'enregistrement des métriques d'une requête"""
+        response = SimpleNamespace(status_code=200)
+        bench(
+            "component.record_request_metrics",
+            lambda: record_request_metrics(response, time.time(), "calculator.calculate", "POST"),
+        )
+
+    def test_update_system_metrics(self, bench, nonblocking_cpu_sampler):
+        """Test de non-régression de l'échantillonnage système (CPU non bloquant, mémoire, disque)"""
+        bench("component.update_system_metrics", update_system_metrics)
+
+    def test_json_serialization(self, bench):
+        """Test de non-régression de la sérialisation JSON des réponses"""
+        payload = {"result": 42.0, "operation": "multiply", "a": 6.0, "b": 7.0}
+        bench("component.dump_json", lambda: dump_json(payload))
+
+    def test_validation(self, bench):
+        """Test de non-régression de la validation d'une charge utile de calcul"""
+        bench("component.validate_calculation", lambda: validate_calculation(CALCULATION))
+
+    def test_evaluate(self, bench):
+        """Test de non-régression de la validation et du calcul"""
+        bench("component.evaluate", lambda: evaluate(CALCULATION))
@@ -0,0 +1,87 @@
+"""
+Tests pour les limites de taille du corps des requêtes
+"""
+
+import io
+import json
+
+
+class TestBodyLimits:
+    """Tests pour le rejet anticipé des corps trop volumineux"""
+
+    def test_small_body_accepted(self, client):
+        """Test qu'un corps sous la limite est traité normalement"""
+        data = {"operation": "add", "a": 1, "b": 2}
+        response = client.post("/api/calculate", data=json.dumps(data), content_type="application/json")
+
+        assert response.status_code == 200
+
+    def test_content_length_over_limit_rejected(self, app, client):
+        """Test qu'un Content-Length trop grand est rejeté avec 413"""
+        limit = app.config["BODY_SIZE_LIMITS"]["calculator"]
+        payload = json.dumps({"operation": "add", "a": 1, "b": 2, "padding": "x" * limit})
+        response = client.post("/api/calculate", data=payload, content_type="application/json")
+
+        assert response.status_code == 413
+        result = response.get_json()
+        assert result["error"] == "Request body too large"
+        assert result["max_bytes"] == limit
+
+    def test_rejected_before_body_is_read(self, app, client):
+        """Test que le corps n'est pas lu lorsque Content-Length dépasse la limite"""
+
+        class ExplodingStream(io.BytesIO):
+            def read(self, *args, **kwargs):
+                raise AssertionError("body should not be read")
+
+        response = client.post(
+            "/api/calculate",
+            input_stream=ExplodingStream(),
+            content_type="application/json",
+            environ_overrides={"CONTENT_LENGTH": str(10 * 1024 * 1024)},
+        )
+
+        assert response.status_code == 413
+
+    def test_chunked_body_over_limit_rejected(self, app, client):
+        """Test qu'un envoi sans Content-Length est borné pendant la lecture"""
+        limit = app.config["BODY_SIZE_LIMITS"]["calculator"]
+        payload = json.dumps({"operation": "add", "a": 1, "b": 2, "padding": "x" * limit}).encode()
+        response = client.post(
+            "/api/calculate",
+            input_stream=io.BytesIO(payload),
+            content_type="application/json",
+            headers={"Transfer-Encoding": "chunked"},
+            environ_overrides={"wsgi.input_terminated": True},
+        )
+
+        assert response.status_code == 413
+        assert response.get_json()["error"] == "Request body too large"
+
+    def test_chunked_body_under_limit_accepted(self, client):
+        """Test qu'un envoi chunked sous la limite est traité normalement"""
+        payload = json.dumps({"operation": "multiply", "a": 3, "b": 4}).encode()
+        response = client.post(
+            "/api/calculate",
+            input_stream=io.BytesIO(payload),
+            content_type="application/json",
+            headers={"Transfer-Encoding": "chunked"},
+            environ_overrides={"wsgi.input_terminated": True},
+        )
+
+        assert response.status_code == 200
+        assert response.get_json()["result"] == 12
+
+    def test_endpoint_limit_overrides_blueprint(self, app, client):
+        """Test qu'une limite par endpoint prime sur celle du blueprint"""
+        app.config["BODY_SIZE_LIMITS"]["calculator.calculate"] = 10
+        data = {"operation": "add", "a": 1, "b": 2}
+        response = client.post("/api/calculate", data=json.dumps(data), content_type="application/json")
+
+        assert response.status_code == 413
+
+    def test_other_blueprints_unlimited(self, client):
+        """Test que les routes sans limite ne sont pas affectées"""
+        response = client.get("/api/hello", data="x" * 100000)
+
+        assert response.status_code == 200
@@ -0,0 +1,74 @@
+"""
+Tests pour les requêtes conditionnelles et les en-têtes de cache HTTP
+"""
+
+import json
+
+
+class TestHttpCache:
+    """Tests pour ETag, If-None-Match et Cache-Control"""
+
+    def test_hello_has_etag_and_cache_control(self, client):
+        """Test que /api/hello expose un ETag fort et un Cache-Control public"""
+        response = client.get("/api/hello")
+
+        assert response.status_code == 200
+        etag, weak = response.get_etag()
+        assert etag is not None
+        assert weak is False
+        assert response.headers["Cache-Control"] == "public, max-age=60"
+
+    def test_hello_etag_is_stable(self, client):
+        """Test que l'ETag est identique pour un corps identique"""
+        first = client.get("/api/hello")
+        second = client.get("/api/hello")
+
+        assert first.headers["ETag"] == second.headers["ETag"]
+
+    def test_hello_if_none_match_returns_304(self, client):
+        """Test qu'un If-None-Match correspondant renvoie 304 sans corps"""
+        etag = client.get("/api/hello").headers["ETag"]
+        response = client.get("/api/hello", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.get_data() == b""
+        assert response.headers["ETag"] == etag
+
+    def test_hello_if_none_match_mismatch_returns_200(self, client):
+        """Test qu'un ETag différent renvoie la représentation complète"""
+        response = client.get("/api/hello", headers={"If-None-Match": '"stale"'})
+
+        assert response.status_code == 200
+        assert response.get_json()["message"] == "Hello World!"
+
+    def test_health_has_no_cache_policy(self, client):
+        """Test que /health impose une revalidation"""
+        response = client.get("/health")
+
+        assert response.status_code == 200
+        assert response.headers["Cache-Control"] == "no-cache"
+        assert "ETag" in response.headers
+
+    def test_policy_is_configurable(self, app, client):
+        """Test que la politique de cache est configurable par blueprint"""
+        app.config["HTTP_CACHE_POLICIES"]["hello"] = "private, max-age=5"
+        response = client.get("/api/hello")
+
+        assert response.headers["Cache-Control"] == "private, max-age=5"
+
+    def test_calculator_is_not_cached(self, client):
+        """Test que les POST du calculateur ne reçoivent pas d'en-têtes de cache"""
+        data = {"operation": "add", "a": 1, "b": 2}
+        response = client.post("/api/calculate", data=json.dumps(data), content_type="application/json")
+
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+        assert "Cache-Control" not in response.headers
+
+    def test_not_modified_is_counted_in_metrics(self, client):
+        """Test que les réponses 304 sont enregistrées dans les métriques"""
+        etag = client.get("/api/hello").headers["ETag"]
+        client.get("/api/hello", headers={"If-None-Match": etag})
+
+        data = client.get("/metrics").get_data(as_text=True)
+        assert 'status="304"' in data
@@ -81,7 +81,7 @@ class TestCalculatorEndpoint:
 
     def test_calculate_invalid_operation(self, client):
         """Test avec une opération invalide"""
-        data = {"operation": "power", "a": 2, "b": 3}
+        data = {"operation": "modulo", "a": 2, "b": 3}
         response = client.post("/api/calculate", data=json.dumps(data), content_type="application/json")
 
         assert response.status_code == 400
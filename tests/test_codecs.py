@@ -0,0 +1,112 @@
+"""
+Tests pour la négociation de contenu du calculateur (JSON, MessagePack, CBOR)
+"""
+
+import json
+
+import pytest
+
+from api.codecs import JSON_MIMETYPE, negotiate
+
+msgpack = pytest.importorskip("msgpack")
+cbor2 = pytest.importorskip("cbor2")
+
+PAYLOAD = {"operation": "multiply", "a": 7, "b": 6}
+EXPECTED = {"result": 42.0, "operation": "multiply", "a": 7.0, "b": 6.0}
+
+
+class TestNegotiate:
+    """Tests unitaires de la sélection du format de réponse"""
+
+    def test_no_accept_uses_request_format(self):
+        """Test que sans Accept, la réponse reprend le format de la requête"""
+        assert negotiate(None, "application/cbor") == "application/cbor"
+
+    def test_wildcard_prefers_json(self):
+        """Test que */* renvoie JSON"""
+        assert negotiate("*/*", "application/msgpack") == JSON_MIMETYPE
+
+    def test_quality_values(self):
+        """Test que les préférences q= sont respectées"""
+        assert negotiate("application/json;q=0.5, application/msgpack", JSON_MIMETYPE) == "application/msgpack"
+
+    def test_unknown_accept_falls_back_to_json(self):
+        """Test qu'un Accept non supporté retombe sur JSON"""
+        assert negotiate("text/html", "application/cbor") == JSON_MIMETYPE
+
+
+class TestCalculatorContentNegotiation:
+    """Tests d'intégration de POST /api/calculate"""
+
+    def test_msgpack_round_trip(self, client):
+        """Test d'un calcul envoyé et reçu en MessagePack"""
+        response = client.post("/api/calculate", data=msgpack.packb(PAYLOAD), content_type="application/msgpack")
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/msgpack"
+        assert msgpack.unpackb(response.get_data()) == EXPECTED
+        assert "Accept" in response.vary
+
+    def test_msgpack_alias(self, client):
+        """Test que application/x-msgpack est accepté"""
+        response = client.post("/api/calculate", data=msgpack.packb(PAYLOAD), content_type="application/x-msgpack")
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/msgpack"
+
+    def test_cbor_round_trip(self, client):
+        """Test d'un calcul envoyé et reçu en CBOR"""
+        response = client.post("/api/calculate", data=cbor2.dumps(PAYLOAD), content_type="application/cbor")
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/cbor"
+        assert cbor2.loads(response.get_data()) == EXPECTED
+
+    def test_json_request_msgpack_response(self, client):
+        """Test qu'une requête JSON peut demander une réponse MessagePack"""
+        response = client.post(
+            "/api/calculate",
+            data=json.dumps(PAYLOAD),
+            content_type="application/json",
+            headers={"Accept": "application/msgpack"},
+        )
+
+        assert response.mimetype == "application/msgpack"
+        assert msgpack.unpackb(response.get_data()) == EXPECTED
+
+    def test_binary_request_json_response(self, client):
+        """Test qu'une requête CBOR peut demander une réponse JSON"""
+        response = client.post(
+            "/api/calculate",
+            data=cbor2.dumps(PAYLOAD),
+            content_type="application/cbor",
+            headers={"Accept": "application/json"},
+        )
+
+        assert response.mimetype == "application/json"
+        assert response.get_json() == EXPECTED
+
+    def test_errors_use_negotiated_format(self, client):
+        """Test que les erreurs de validation sont encodées dans le format négocié"""
+        data = msgpack.packb({"operation": "divide", "a": 1, "b": 0})
+        response = client.post("/api/calculate", data=data, content_type="application/msgpack")
+
+        assert response.status_code == 400
+        assert msgpack.unpackb(response.get_data()) == {"error": "Division by zero is not allowed"}
+
+    def test_corrupt_binary_body(self, client):
+        """Test qu'un corps binaire illisible renvoie 400"""
+        response = client.post("/api/calculate", data=b"\xc1\xff\x00", content_type="application/msgpack")
+
+        assert response.status_code == 400
+        assert msgpack.unpackb(response.get_data()) == {"error": "Invalid request body"}
+
+    def test_unsupported_content_type_lists_formats(self, client):
+        """Test que le message d'erreur liste les formats acceptés"""
+        response = client.post("/api/calculate", data="a=1", content_type="text/plain")
+
+        assert response.status_code == 400
+        error = response.get_json()["error"]
+        assert error.startswith("Content-Type must be application/json")
+        assert "application/msgpack" in error
+        assert "application/cbor" in error
@@ -0,0 +1,100 @@
+"""
+Tests pour l'endpoint de calcul colonnaire /api/calculate/columnar
+"""
+
+import struct
+
+import numpy as np
+import pytest
+
+from api.calculator import OPERATION_CODES
+from api.columnar import COLUMNAR_MIMETYPE, decode_columns, decode_result, encode_columns
+
+
+def post_columns(client, data):
+    return client.post("/api/calculate/columnar", data=data, content_type=COLUMNAR_MIMETYPE)
+
+
+class TestColumnarFormat:
+    """Tests unitaires du format de trame"""
+
+    def test_decode_is_zero_copy(self):
+        """Test que les colonnes décodées partagent le tampon de la requête"""
+        frame = bytearray(encode_columns(0, [1.0, 2.0], [3.0, 4.0]))
+        _, a, b = decode_columns(frame)
+
+        frame[16:24] = struct.pack("<d", 42.0)
+        assert a[0] == 42.0
+        assert list(b) == [3.0, 4.0]
+
+    def test_length_mismatch_rejected(self):
+        """Test qu'une trame tronquée est refusée"""
+        frame = encode_columns(0, [1.0, 2.0], [3.0, 4.0])
+
+        with pytest.raises(Exception, match="does not match"):
+            decode_columns(frame[:-8])
+
+    def test_encode_requires_equal_lengths(self):
+        """Test que les colonnes doivent avoir la même longueur"""
+        with pytest.raises(ValueError):
+            encode_columns(0, [1.0], [1.0, 2.0])
+
+
+class TestColumnarEndpoint:
+    """Tests d'intégration de l'endpoint colonnaire"""
+
+    @pytest.mark.parametrize(
+        "operation,expected",
+        [
+            ("add", [5.0, 7.0, 9.0]),
+            ("subtract", [-3.0, -3.0, -3.0]),
+            ("multiply", [4.0, 10.0, 18.0]),
+            ("divide", [0.25, 0.4, 0.5]),
+        ],
+    )
+    def test_operations(self, client, operation, expected):
+        """Test des quatre opérations sur des colonnes"""
+        code = OPERATION_CODES[operation]
+        response = post_columns(client, encode_columns(code, [1, 2, 3], [4, 5, 6]))
+
+        assert response.status_code == 200
+        assert response.mimetype == COLUMNAR_MIMETYPE
+        result_code, result = decode_result(response.get_data())
+        assert result_code == code
+        assert np.allclose(result, expected)
+
+    def test_large_columns(self, client):
+        """Test d'un calcul sur un million de lignes"""
+        a = np.arange(1_000_000, dtype=np.float64)
+        b = np.full(1_000_000, 2.0)
+        response = post_columns(client, encode_columns(OPERATION_CODES["multiply"], a, b))
+
+        _, result = decode_result(response.get_data())
+        assert np.array_equal(result, a * 2)
+
+    def test_division_by_zero(self, client):
+        """Test que la division par zéro est refusée comme en mode unitaire"""
+        response = post_columns(client, encode_columns(OPERATION_CODES["divide"], [1, 2], [1, 0]))
+
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "Division by zero is not allowed"}
+
+    def test_unknown_operation_code(self, client):
+        """Test qu'un code d'opération inconnu est refusé"""
+        response = post_columns(client, encode_columns(200, [1], [1]))
+
+        assert response.status_code == 400
+        assert "Unsupported operation code" in response.get_json()["error"]
+
+    def test_bad_magic(self, client):
+        """Test qu'une trame mal formée est refusée"""
+        response = post_columns(client, b"NOPE" + bytes(12))
+
+        assert response.status_code == 400
+
+    def test_wrong_content_type(self, client):
+        """Test que le type MIME colonnaire est exigé"""
+        response = client.post("/api/calculate/columnar", data=b"", content_type="application/json")
+
+        assert response.status_code == 400
+        assert COLUMNAR_MIMETYPE in response.get_json()["error"]
@@ -0,0 +1,126 @@
+"""
+Tests pour l'endpoint de calcul CSV en flux /api/calculate/csv
+"""
+
+import csv
+import io
+
+import pytest
+
+from api.calculator import CSV_CALCULATOR
+
+
+def post_csv(client, text, **kwargs):
+    return client.post("/api/calculate/csv", data=text.encode(), content_type="text/csv", **kwargs)
+
+
+def read_rows(response):
+    return list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+
+
+class TestCsvEndpoint:
+    """Tests d'intégration de POST /api/calculate/csv"""
+
+    def test_rows_evaluated_in_order(self, client):
+        """Test que chaque ligne reçoit son résultat, dans l'ordre d'entrée"""
+        response = post_csv(client, "operation,a,b\nadd,1,2\nmultiply,3,4\nsubtract,10,4\ndivide,9,3\n")
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/csv"
+        rows = read_rows(response)
+        assert [(r["operation"], r["result"], r["error"]) for r in rows] == [
+            ("add", "3.0", ""),
+            ("multiply", "12.0", ""),
+            ("subtract", "6.0", ""),
+            ("divide", "3.0", ""),
+        ]
+
+    def test_row_errors(self, client):
+        """Test que les erreurs sont signalées ligne par ligne sans interrompre le fichier"""
+        text = "operation,a,b\ndivide,1,0\ndivide,8,2\nmodulo,1,2\nadd,x,2\nmodulo,x,2\nadd,1\nadd,1,2\n"
+        rows = read_rows(post_csv(client, text))
+
+        assert [r["result"] for r in rows] == ["", "4.0", "", "", "", "", "3.0"]
+        assert rows[0]["error"] == "Division by zero is not allowed"
+        assert rows[2]["error"].startswith("Unsupported operation")
+        assert rows[3]["error"] == "Values a and b must be numeric"
+        assert rows[4]["error"] == "Values a and b must be numeric"
+        assert rows[5]["error"] == "Row must have 3 columns: operation,a,b"
+
+    def test_power_errors_per_row(self, client):
+        """Test qu'un résultat non réel n'invalide que sa ligne"""
+        rows = read_rows(post_csv(client, "operation,a,b\npower,2,10\npower,-8,0.5\n"))
+
+        assert rows[0]["result"] == "1024.0"
+        assert rows[1]["error"] == "Result is not a real number"
+
+    def test_blank_lines_and_bom(self, client):
+        """Test que le BOM UTF-8 et les lignes vides sont ignorés"""
+        rows = read_rows(post_csv(client, "﻿Operation, A, B\r\n\r\nadd,1,1\r\n\r\n"))
+
+        assert [r["result"] for r in rows] == ["2.0"]
+
+    @pytest.mark.parametrize("text", ["", "op,x,y\nadd,1,2\n"])
+    def test_invalid_header(self, client, text):
+        """Test qu'un en-tête absent ou incorrect renvoie 400 avant tout calcul"""
+        response = post_csv(client, text)
+
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "CSV header must be: operation,a,b"}
+
+    def test_wrong_content_type(self, client):
+        """Test que le type text/csv est exigé"""
+        response = client.post("/api/calculate/csv", data="operation,a,b\n", content_type="application/json")
+
+        assert response.status_code == 400
+
+    def test_not_limited_by_calculator_body_size(self, client):
+        """Test qu'un fichier plus grand que la limite du calculateur est accepté"""
+        text = "operation,a,b\n" + "add,1,2\n" * 10_000
+        rows = read_rows(post_csv(client, text))
+
+        assert len(rows) == 10_000
+
+    def test_body_size_limit(self, app, client):
+        """Test que le CSV a sa propre limite de taille"""
+        app.config["BODY_SIZE_LIMITS"]["calculator.calculate_csv"] = 64
+        response = post_csv(client, "operation,a,b\n" + "add,1,2\n" * 10)
+
+        assert response.status_code == 413
+
+    def test_heavy_rows_through_pool(self, app, client):
+        """Test que les opérations lourdes passent par le pool de processus"""
+        try:
+            rows = read_rows(post_csv(client, "operation,a,b\nprimes,0,100\nadd,1,2\nprimes,0,10\n"))
+        finally:
+            app.extensions["offload"].shutdown()
+
+        assert [r["result"] for r in rows] == ["25.0", "3.0", "4.0"]
+
+    def test_saturated_pool_errors_per_row(self, app, client):
+        """Test qu'un pool saturé n'invalide que les lignes lourdes"""
+        app.extensions["offload"].max_workers = 0
+        app.extensions["offload"].max_queue = 0
+        rows = read_rows(post_csv(client, "operation,a,b\nprimes,0,100\nadd,1,2\n"))
+
+        assert rows[0]["error"] == "Too many pending heavy operations"
+        assert rows[1]["result"] == "3.0"
+
+
+class TestCsvChunks:
+    """Tests du découpage en blocs"""
+
+    def test_output_streamed_per_chunk(self):
+        """Test que la réponse est produite bloc par bloc"""
+        reader = csv.reader(io.StringIO("add,1,2\n" * 10))
+        chunks = list(CSV_CALCULATOR.stream(reader, chunk_rows=4))
+
+        assert chunks[0].startswith("operation,a,b,result,error\n")
+        assert [chunk.count("\n") for chunk in chunks] == [5, 4, 2, 0]
+
+    def test_blank_chunk_does_not_end_stream(self):
+        """Test qu'un bloc composé uniquement de lignes vides ne termine pas la lecture"""
+        reader = csv.reader(io.StringIO("\n\n\nadd,1,2\n"))
+        output = "".join(CSV_CALCULATOR.stream(reader, chunk_rows=2))
+
+        assert output.endswith("add,1,2,3.0,\n")
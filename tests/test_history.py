@@ -0,0 +1,135 @@
+"""
+Tests pour l'historique des calculs /api/history
+"""
+
+import pytest
+
+from api.calculator import OPERATION_CODES
+from api.history import CalculationHistory
+
+ADD = OPERATION_CODES["add"]
+MULTIPLY = OPERATION_CODES["multiply"]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def history():
+    clock = FakeClock()
+    history = CalculationHistory(capacity=8, clock=clock)
+    history.clock_value = clock
+    for i in range(5):
+        clock.now = 1000.0 + i
+        history.record(ADD if i % 2 == 0 else MULTIPLY, i, 1, i + 1)
+    return history
+
+
+class TestCalculationHistory:
+    """Tests unitaires du tampon circulaire"""
+
+    def test_fixed_memory(self):
+        """Test que la mémoire est allouée une fois : 33 octets par entrée"""
+        assert CalculationHistory(1_000_000).nbytes == 33_000_000
+
+    def test_query_all(self, history):
+        """Test que les entrées sont renvoyées dans l'ordre d'écriture"""
+        ids, codes, a, b, results, timestamps, cursor = history.query()
+
+        assert ids.tolist() == [0, 1, 2, 3, 4]
+        assert a.tolist() == [0, 1, 2, 3, 4]
+        assert results.tolist() == [1, 2, 3, 4, 5]
+        assert cursor is None
+
+    def test_time_range(self, history):
+        """Test du filtrage par intervalle de temps (bornes incluses)"""
+        ids = history.query(since=1001, until=1003)[0]
+
+        assert ids.tolist() == [1, 2, 3]
+
+    def test_operation_filter(self, history):
+        """Test du filtrage par opération"""
+        ids, codes = history.query(code=MULTIPLY)[:2]
+
+        assert ids.tolist() == [1, 3]
+        assert set(codes.tolist()) == {MULTIPLY}
+
+    def test_pagination(self, history):
+        """Test de la pagination par curseur"""
+        first = history.query(limit=2)
+        second = history.query(limit=2, cursor=first[-1])
+        third = history.query(limit=2, cursor=second[-1])
+
+        assert first[0].tolist() == [0, 1]
+        assert second[0].tolist() == [2, 3]
+        assert third[0].tolist() == [4]
+        assert third[-1] is None
+
+    def test_wraparound_keeps_latest(self, history):
+        """Test que les entrées les plus anciennes sont écrasées au-delà de la capacité"""
+        for i in range(5, 12):
+            history.clock_value.now = 1000.0 + i
+            history.record(ADD, i, 1, i + 1)
+
+        ids, _, a, _, _, timestamps, _ = history.query()
+        assert ids.tolist() == list(range(4, 12))
+        assert a.tolist() == list(range(4, 12))
+        assert history.query(since=1006, until=1008)[0].tolist() == [6, 7, 8]
+        assert history.query(cursor=0, limit=1)[0].tolist() == [4]
+
+    def test_operation_filter_across_wraparound(self, history):
+        """Test du filtrage sur un intervalle qui chevauche la fin du tampon"""
+        for i in range(5, 12):
+            history.clock_value.now = 1000.0 + i
+            history.record(MULTIPLY if i % 3 == 0 else ADD, i, 1, i + 1)
+
+        ids, codes, a = history.query(code=MULTIPLY)[:3]
+        assert ids.tolist() == [6, 9]
+        assert a.tolist() == [6, 9]
+        assert set(codes.tolist()) == {MULTIPLY}
+
+    def test_timestamps_monotonic(self, history):
+        """Test qu'un recul d'horloge ne casse pas l'ordre temporel"""
+        history.clock_value.now = 500.0
+        history.record(ADD, 9, 9, 18)
+
+        assert history.query(since=1004)[0].tolist() == [4, 5]
+
+
+class TestHistoryEndpoint:
+    """Tests d'intégration de GET /api/history"""
+
+    def test_records_calculations(self, client):
+        """Test que les calculs réussis sont enregistrés"""
+        client.post("/api/calculate", json={"operation": "add", "a": 2, "b": 3})
+        client.post("/api/calculate", json={"operation": "divide", "a": 1, "b": 0})
+        client.post("/api/calculate", json={"operation": "multiply", "a": 4, "b": 5})
+
+        entries = client.get("/api/history").get_json()["entries"]
+        assert [(e["operation"], e["a"], e["b"], e["result"]) for e in entries] == [
+            ("add", 2.0, 3.0, 5.0),
+            ("multiply", 4.0, 5.0, 20.0),
+        ]
+        assert entries[0]["timestamp"] <= entries[1]["timestamp"]
+
+    def test_filters_and_pagination(self, client):
+        """Test des filtres et du curseur via l'API"""
+        for i in range(5):
+            client.post("/api/calculate", json={"operation": "add" if i % 2 else "subtract", "a": i, "b": 1})
+
+        page = client.get("/api/history?operation=subtract&limit=2").get_json()
+        assert [e["a"] for e in page["entries"]] == [0.0, 2.0]
+
+        page = client.get(f"/api/history?operation=subtract&limit=2&cursor={page['next_cursor']}").get_json()
+        assert [e["a"] for e in page["entries"]] == [4.0]
+        assert page["next_cursor"] is None
+
+    @pytest.mark.parametrize("query", ["since=yesterday", "limit=many", "operation=modulo"])
+    def test_invalid_parameters(self, client, query):
+        """Test que les paramètres invalides renvoient 400"""
+        assert client.get(f"/api/history?{query}").status_code == 400
@@ -0,0 +1,163 @@
+"""
+Tests pour l'en-tête Idempotency-Key
+"""
+
+import threading
+
+import pytest
+
+from api.idempotency import (
+    CONFLICT,
+    IN_PROGRESS,
+    NEW,
+    REPLAY,
+    MemoryIdempotencyStore,
+    SqliteIdempotencyStore,
+)
+
+RESPONSE = (200, [("Content-Type", "application/json")], b'{"result":1}\n')
+
+
+def post(client, payload, key="key-1", **kwargs):
+    return client.post("/api/calculate", json=payload, headers={"Idempotency-Key": key}, **kwargs)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    clock = [0.0]
+    if request.param == "memory":
+        store = MemoryIdempotencyStore(max_entries=3, ttl=60, clock=lambda: clock[0])
+    else:
+        store = SqliteIdempotencyStore(str(tmp_path / "idempotency.db"), max_entries=3, ttl=60, clock=lambda: clock[0])
+        store.TRIM_EVERY = 1
+    store.now = clock
+    return store
+
+
+class TestIdempotencyStores:
+    """Tests communs aux stockages mémoire et SQLite"""
+
+    def test_lifecycle(self, store):
+        """Test nouvelle clé, requête en cours, rejeu et conflit"""
+        assert store.begin("k", "fp") == (NEW, None)
+        assert store.begin("k", "fp") == (IN_PROGRESS, None)
+        store.complete("k", RESPONSE)
+
+        assert store.begin("k", "fp") == (REPLAY, RESPONSE)
+        assert store.begin("k", "other") == (CONFLICT, None)
+
+    def test_abandon_allows_retry(self, store):
+        """Test qu'une clé abandonnée peut être réutilisée"""
+        store.begin("k", "fp")
+        store.abandon("k")
+
+        assert store.begin("k", "fp") == (NEW, None)
+
+    def test_ttl_expiry(self, store):
+        """Test qu'une clé expirée est oubliée"""
+        store.begin("k", "fp")
+        store.complete("k", RESPONSE)
+        store.now[0] = 61
+
+        assert store.begin("k", "other") == (NEW, None)
+
+    def test_bounded_entries(self, store):
+        """Test que les clés les plus anciennes sont évincées au-delà de la capacité"""
+        for index in range(5):
+            store.now[0] = index
+            store.begin(f"k{index}", "fp")
+            store.complete(f"k{index}", RESPONSE)
+
+        assert store.begin("k0", "other") == (NEW, None)
+        assert store.begin("k4", "fp") == (REPLAY, RESPONSE)
+
+
+class TestIdempotentEndpoints:
+    """Tests d'intégration des endpoints POST"""
+
+    def test_replay_is_byte_for_byte(self, client):
+        """Test qu'une reprise renvoie la même réponse sans recalcul"""
+        first = post(client, {"operation": "add", "a": 1, "b": 2})
+        second = post(client, {"operation": "add", "a": 1, "b": 2})
+
+        assert second.status_code == first.status_code == 200
+        assert second.get_data() == first.get_data()
+        assert second.headers["Content-Type"] == first.headers["Content-Type"]
+        assert second.headers["Idempotent-Replayed"] == "true"
+        assert "Idempotent-Replayed" not in first.headers
+
+    def test_validation_errors_replayed(self, client):
+        """Test que les erreurs 4xx sont aussi rejouées"""
+        post(client, {"operation": "divide", "a": 1, "b": 0})
+        response = post(client, {"operation": "divide", "a": 1, "b": 0})
+
+        assert response.status_code == 400
+        assert response.headers["Idempotent-Replayed"] == "true"
+
+    def test_conflicting_body(self, client):
+        """Test qu'une même clé avec un autre corps renvoie 422"""
+        post(client, {"operation": "add", "a": 1, "b": 2})
+        response = post(client, {"operation": "add", "a": 1, "b": 3})
+
+        assert response.status_code == 422
+
+    def test_in_flight_duplicate(self, app, client):
+        """Test qu'une reprise pendant le calcul d'origine renvoie 409"""
+        started, release = threading.Event(), threading.Event()
+        offload = app.extensions["offload"]
+
+        class BlockingOffload:
+            def run(self, function, *args):
+                started.set()
+                release.wait(5)
+                return function(*args)
+
+        app.extensions["offload"] = BlockingOffload()
+        payload = {"operation": "primes", "a": 2, "b": 3}
+        thread = threading.Thread(target=lambda: post(app.test_client(), payload))
+        thread.start()
+        started.wait(5)
+
+        response = post(client, payload)
+        release.set()
+        thread.join()
+        app.extensions["offload"] = offload
+
+        assert response.status_code == 409
+        assert response.headers["Retry-After"] == "1"
+        assert post(client, payload).headers["Idempotent-Replayed"] == "true"
+
+    def test_without_header(self, client):
+        """Test que les requêtes sans clé ne sont pas enregistrées"""
+        client.post("/api/calculate", json={"operation": "add", "a": 1, "b": 2})
+
+        response = client.post("/api/calculate", json={"operation": "add", "a": 1, "b": 2})
+        assert "Idempotent-Replayed" not in response.headers
+
+    def test_key_too_long(self, client):
+        """Test qu'une clé trop longue est refusée"""
+        response = post(client, {"operation": "add", "a": 1, "b": 2}, key="x" * 300)
+
+        assert response.status_code == 400
+
+    def test_job_submission_replayed(self, client):
+        """Test qu'une soumission de tâche reprise ne crée pas de seconde tâche"""
+        body = {"items": [{"operation": "add", "a": 1, "b": 2}]}
+        headers = {"Idempotency-Key": "job-1"}
+        first = client.post("/api/jobs", json=body, headers=headers)
+        second = client.post("/api/jobs", json=body, headers=headers)
+
+        assert second.status_code == 202
+        assert second.get_json()["id"] == first.get_json()["id"]
+        assert second.headers["Location"] == first.headers["Location"]
+
+    def test_shared_store(self, tmp_path, monkeypatch):
+        """Test que deux applications partagent les réponses via le stockage SQLite"""
+        from main import create_app
+
+        monkeypatch.setenv("IDEMPOTENCY_SHARED_PATH", str(tmp_path / "shared.db"))
+        first = post(create_app().test_client(), {"operation": "add", "a": 1, "b": 2})
+        second = post(create_app().test_client(), {"operation": "add", "a": 1, "b": 2})
+
+        assert second.headers["Idempotent-Replayed"] == "true"
+        assert second.get_data() == first.get_data()
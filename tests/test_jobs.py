@@ -0,0 +1,202 @@
+"""
+Tests pour les calculs asynchrones /api/jobs
+"""
+
+import sqlite3
+
+import pytest
+
+from api.jobs import DONE, FAILED, QUEUED, RUNNING, JobQueue, JobStore
+from main import create_app
+
+
+@pytest.fixture
+def jobs_app(tmp_path, monkeypatch):
+    monkeypatch.setenv("JOBS_DATABASE", str(tmp_path / "jobs.db"))
+    app = create_app()
+    app.config["TESTING"] = True
+    yield app
+    app.extensions["jobs"].stop()
+
+
+@pytest.fixture
+def jobs_client(jobs_app):
+    return jobs_app.test_client()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.db"))
+
+
+class TestJobApi:
+    """Tests d'intégration de l'API de tâches"""
+
+    def test_submit_and_wait(self, jobs_client):
+        """Test qu'une tâche soumise est exécutée et ses résultats récupérés"""
+        items = [{"operation": "add", "a": 1, "b": 2}, {"operation": "divide", "a": 1, "b": 0}]
+        response = jobs_client.post("/api/jobs", json={"items": items})
+
+        assert response.status_code == 202
+        job_id = response.get_json()["id"]
+        assert response.headers["Location"].endswith(f"/api/jobs/{job_id}")
+
+        job = jobs_client.get(f"/api/jobs/{job_id}?wait=10").get_json()
+        assert job["status"] == DONE
+        assert job["results"] == [
+            {"result": 3.0, "operation": "add", "a": 1.0, "b": 2.0},
+            {"error": "Division by zero is not allowed"},
+        ]
+
+    def test_workers_start_on_first_submit(self, jobs_app, jobs_client):
+        """Test que les workers ne démarrent qu'à la première soumission"""
+        queue = jobs_app.extensions["jobs"]
+        assert queue._threads == []
+
+        jobs_client.post("/api/jobs", json={"items": [{"operation": "add", "a": 1, "b": 1}]})
+        assert len(queue._threads) == jobs_app.config["JOB_WORKERS"]
+
+    @pytest.mark.parametrize(
+        "payload,error",
+        [
+            ({"items": []}, "non-empty items list"),
+            ([1, 2], "non-empty items list"),
+            ({"items": [{"operation": "add", "a": 1, "b": 2}, {"operation": "add", "a": 1}]}, "Item 1: Missing required"),
+        ],
+    )
+    def test_invalid_batches(self, jobs_client, payload, error):
+        """Test que les lots invalides sont refusés avant mise en file"""
+        response = jobs_client.post("/api/jobs", json=payload)
+
+        assert response.status_code == 400
+        assert error in response.get_json()["error"]
+
+    def test_batch_size_limit(self, jobs_app, jobs_client):
+        """Test que JOB_MAX_ITEMS borne la taille d'un lot"""
+        jobs_app.config["JOB_MAX_ITEMS"] = 2
+        response = jobs_client.post("/api/jobs", json={"items": [{"operation": "add", "a": 1, "b": 1}] * 3})
+
+        assert response.status_code == 400
+
+    def test_unknown_job(self, jobs_client):
+        """Test qu'une tâche inconnue renvoie 404"""
+        assert jobs_client.get("/api/jobs/missing").status_code == 404
+
+    def test_invalid_wait(self, jobs_client):
+        """Test que wait doit être numérique"""
+        assert jobs_client.get("/api/jobs/missing?wait=soon").status_code == 400
+
+    def test_pending_jobs_run_after_restart(self, tmp_path, monkeypatch):
+        """Test que les tâches laissées en file par une exécution précédente s'exécutent sans nouvelle soumission"""
+        path = tmp_path / "jobs.db"
+        store = JobStore(str(path))
+        job_id = store.submit([{"operation": "add", "a": 1, "b": 2}], now=1.0)
+        monkeypatch.setenv("JOBS_DATABASE", str(path))
+        app = create_app()
+        try:
+            job = app.test_client().get(f"/api/jobs/{job_id}?wait=10").get_json()
+        finally:
+            app.extensions["jobs"].stop()
+
+        assert job["status"] == DONE
+        assert job["results"] == [{"result": 3.0, "operation": "add", "a": 1.0, "b": 2.0}]
+
+
+class TestJobQueue:
+    """Tests unitaires de la file SQLite"""
+
+    def test_wal_mode(self, store):
+        """Test que la base est en mode WAL"""
+        assert store.connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_claim_in_submission_order(self, store):
+        """Test que les tâches sont prises dans l'ordre de soumission, une seule fois"""
+        first = store.submit([{"operation": "add", "a": 1, "b": 1}], now=1.0)
+        second = store.submit([{"operation": "add", "a": 2, "b": 2}], now=2.0)
+
+        assert store.claim(now=3.0)["id"] == first
+        assert store.claim(now=3.0)["id"] == second
+        assert store.claim(now=3.0) is None
+        assert store.get(first)["status"] == RUNNING
+
+    def test_interrupted_jobs_requeued(self, store):
+        """Test que les tâches interrompues par un arrêt sont remises en file"""
+        job_id = store.submit([{"operation": "add", "a": 1, "b": 1}], now=1.0)
+        store.claim(now=2.0)
+
+        queue = JobQueue(store, workers=1, poll_interval=0.05, clock=lambda: 1000.0)
+        assert store.get(job_id)["status"] == QUEUED
+
+        queue.start()
+        try:
+            assert queue.wait(job_id, 5)["status"] == DONE
+        finally:
+            queue.stop()
+
+    def test_recent_running_jobs_kept(self, store):
+        """Test qu'une tâche en cours dans un autre processus n'est pas reprise"""
+        job_id = store.submit([{"operation": "add", "a": 1, "b": 1}], now=1.0)
+        store.claim(now=999.0)
+
+        JobQueue(store, clock=lambda: 1000.0)
+        assert store.get(job_id)["status"] == RUNNING
+
+    def test_stale_jobs_requeued_while_running(self, store):
+        """Test qu'une tâche interrompue récemment est reprise plus tard, sans redémarrage"""
+        now = [1000.0]
+        job_id = store.submit([{"operation": "add", "a": 1, "b": 1}], now=1.0)
+        store.claim(now=999.0)
+        queue = JobQueue(store, stale_after=300, clock=lambda: now[0])
+        assert store.get(job_id)["status"] == RUNNING
+
+        now[0] = 1400.0
+        queue.requeue_stale()
+        assert store.get(job_id)["status"] == QUEUED
+
+    def test_worker_survives_failing_job(self, store, monkeypatch):
+        """Test qu'une erreur de stockage marque la tâche en échec sans arrêter le worker"""
+        complete = store.complete
+        calls = []
+
+        def flaky_complete(job_id, results, now):
+            calls.append(job_id)
+            if len(calls) == 1:
+                raise sqlite3.OperationalError("database is locked")
+            complete(job_id, results, now)
+
+        monkeypatch.setattr(store, "complete", flaky_complete)
+        queue = JobQueue(store, workers=1, poll_interval=0.05)
+        try:
+            failed = queue.submit([{"operation": "add", "a": 1, "b": 1}])
+            job = queue.wait(failed, 5)
+            succeeded = queue.submit([{"operation": "add", "a": 2, "b": 2}])
+            second = queue.wait(succeeded, 5)
+        finally:
+            queue.stop()
+
+        assert job["status"] == FAILED
+        assert "database is locked" in job["results"]
+        assert second["status"] == DONE
+
+    def test_results_purged_after_ttl(self, store):
+        """Test que les résultats expirés sont supprimés"""
+        now = [0.0]
+        queue = JobQueue(store, result_ttl=60, clock=lambda: now[0])
+        job_id = store.submit([{"operation": "add", "a": 1, "b": 1}], now=0.0)
+        store.claim(now=0.0)
+        store.complete(job_id, [], now=10.0)
+
+        now[0] = 30.0
+        assert queue.purge_expired() == 0
+        now[0] = 200.0
+        assert queue.purge_expired() == 1
+        assert store.get(job_id) is None
+
+    def test_stop_joins_workers(self, store):
+        """Test que stop arrête les workers"""
+        queue = JobQueue(store, workers=2, poll_interval=0.05)
+        queue.start()
+        threads = list(queue._threads)
+        queue.stop()
+
+        assert not any(thread.is_alive() for thread in threads)
@@ -0,0 +1,32 @@
+"""
+Tests pour les imports différés
+"""
+
+import sys
+
+import pytest
+
+from api.lazy_imports import lazy_import
+
+
+class TestLazyImport:
+    """Tests de lazy_import"""
+
+    def test_loaded_on_first_attribute_access(self, monkeypatch):
+        """Test que le module n'est exécuté qu'au premier accès à un attribut"""
+        monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+
+        module = lazy_import("colorsys")
+
+        assert type(module).__name__ == "_LazyModule"
+        assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+        assert type(module).__name__ == "module"
+
+    def test_already_imported(self):
+        """Test qu'un module déjà importé est retourné tel quel"""
+        assert lazy_import("json") is sys.modules["json"]
+
+    def test_missing_module(self):
+        """Test qu'un module introuvable lève ModuleNotFoundError immédiatement"""
+        with pytest.raises(ModuleNotFoundError):
+            lazy_import("module_that_does_not_exist")
@@ -0,0 +1,162 @@
+"""
+Tests pour l'endpoint vectoriel et matriciel /api/linalg
+"""
+
+import numpy as np
+import pytest
+
+from api.calculator import ARRAY_OPERATION_CODES
+from api.linalg import (
+    ARRAYS_MIMETYPE,
+    check_shapes,
+    decode_array_result,
+    encode_arrays,
+    infer_shape,
+    matmul_shape,
+    solve_shape,
+)
+from api.schema import ValidationError
+
+
+def post_arrays(client, operation, a, b):
+    data = encode_arrays(ARRAY_OPERATION_CODES[operation], a, b)
+    return client.post("/api/linalg", data=data, content_type=ARRAYS_MIMETYPE)
+
+
+class TestShapeRules:
+    """Tests unitaires de la validation des formes"""
+
+    def test_matmul_shapes(self):
+        """Test des formes du produit matriciel"""
+        assert matmul_shape((3, 4), (4, 5)) == (3, 5)
+        assert matmul_shape((3, 4), (4,)) == (3,)
+        with pytest.raises(ValidationError):
+            matmul_shape((3, 4), (3, 4))
+
+    def test_solve_requires_square_matrix(self):
+        """Test que solve exige une matrice carrée"""
+        with pytest.raises(ValidationError, match="square"):
+            solve_shape((2, 3), (2,))
+
+    def test_result_size_capped_before_allocation(self):
+        """Test qu'un résultat trop grand est refusé à partir des seules formes"""
+        with pytest.raises(ValidationError, match="Result is limited"):
+            check_shapes(matmul_shape, (1000, 1), (1, 1000), max_elements=10_000)
+
+    def test_too_many_dimensions(self):
+        """Test que les tableaux de plus de deux dimensions sont refusés"""
+        with pytest.raises(ValidationError, match="dimensions"):
+            check_shapes(matmul_shape, (2, 2, 2), (2, 2), max_elements=100)
+
+    def test_infer_shape(self):
+        """Test de la déduction de forme d'une liste imbriquée"""
+        assert infer_shape([[1, 2, 3], [4, 5, 6]]) == (2, 3)
+        assert infer_shape([1, 2]) == (2,)
+        assert infer_shape(5) == ()
+
+
+class TestLinalgJson:
+    """Tests d'intégration en JSON"""
+
+    @pytest.mark.parametrize(
+        "operation,a,b,expected",
+        [
+            ("add", [1, 2], [3, 4], [4.0, 6.0]),
+            ("multiply", [[1, 2], [3, 4]], [[2, 2], [2, 2]], [[2.0, 4.0], [6.0, 8.0]]),
+            ("dot", [1, 2, 3], [4, 5, 6], 32.0),
+            ("matmul", [[1, 2], [3, 4]], [[5, 6], [7, 8]], [[19.0, 22.0], [43.0, 50.0]]),
+            ("matmul", [[1, 2], [3, 4]], [1, 1], [3.0, 7.0]),
+            ("solve", [[3, 1], [1, 2]], [9, 8], [2.0, 3.0]),
+        ],
+    )
+    def test_operations(self, client, operation, a, b, expected):
+        """Test des opérations vectorielles et matricielles"""
+        response = client.post("/api/linalg", json={"operation": operation, "a": a, "b": b})
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["operation"] == operation
+        assert np.allclose(data["result"], expected)
+        assert data["shape"] == list(np.shape(expected))
+
+    @pytest.mark.parametrize(
+        "payload,error",
+        [
+            ({"operation": "add", "a": [1, 2], "b": [1, 2, 3]}, "must match"),
+            ({"operation": "solve", "a": [[1, 2], [2, 4]], "b": [1, 2]}, "singular"),
+            ({"operation": "divide", "a": [1, 2], "b": [1, 0]}, "Division by zero"),
+            ({"operation": "matmul", "a": [[1, 2], [3]], "b": [1, 1]}, "rectangular"),
+            ({"operation": "dot", "a": ["x"], "b": [1]}, "rectangular"),
+            ({"operation": "dot", "a": 1, "b": 1}, "dimensions"),
+            ({"operation": "invert", "a": [1], "b": [1]}, "Unsupported operation"),
+        ],
+    )
+    def test_invalid_requests(self, client, payload, error):
+        """Test que les entrées invalides renvoient 400 avec un message explicite"""
+        response = client.post("/api/linalg", json=payload)
+
+        assert response.status_code == 400
+        assert error in response.get_json()["error"]
+
+    def test_size_cap(self, app, client):
+        """Test que LINALG_MAX_ELEMENTS borne les entrées"""
+        app.config["LINALG_MAX_ELEMENTS"] = 4
+        response = client.post("/api/linalg", json={"operation": "add", "a": [1] * 5, "b": [1] * 5})
+
+        assert response.status_code == 400
+        assert "limited to 4 elements" in response.get_json()["error"]
+
+
+class TestLinalgBinary:
+    """Tests d'intégration du format binaire"""
+
+    def test_matmul_round_trip(self, client):
+        """Test d'un produit matriciel en binaire"""
+        rng = np.random.default_rng(0)
+        a, b = rng.random((20, 30)), rng.random((30, 10))
+        response = post_arrays(client, "matmul", a, b)
+
+        assert response.status_code == 200
+        assert response.mimetype == ARRAYS_MIMETYPE
+        code, result = decode_array_result(response.get_data())
+        assert code == ARRAY_OPERATION_CODES["matmul"]
+        assert np.allclose(result, a @ b)
+
+    def test_operation_codes_are_stable(self):
+        """Test que les codes des trames binaires ne changent pas quand des opérations sont ajoutées"""
+        assert [ARRAY_OPERATION_CODES[name] for name in ("add", "subtract", "multiply", "divide")] == [0, 1, 2, 3]
+        assert [ARRAY_OPERATION_CODES[name] for name in ("dot", "matmul", "solve")] == [4, 5, 6]
+
+    def test_dot_scalar_result(self, client):
+        """Test qu'un produit scalaire renvoie un tableau de dimension 0"""
+        _, result = decode_array_result(post_arrays(client, "dot", [1, 2], [3, 4]).get_data())
+
+        assert result.shape == ()
+        assert result == 11.0
+
+    def test_large_input_offloaded(self, app, client):
+        """Test que les gros calculs passent par le pool de threads"""
+        app.config["LINALG_OFFLOAD_THRESHOLD"] = 10
+        a = np.eye(8)
+        response = post_arrays(client, "solve", a, np.arange(8.0))
+
+        assert response.status_code == 200
+        assert np.allclose(decode_array_result(response.get_data())[1], np.arange(8.0))
+        assert "linalg_executor" in app.extensions
+
+    def test_truncated_frame(self, client):
+        """Test qu'une trame dont la longueur ne correspond pas à l'en-tête est refusée"""
+        data = encode_arrays(ARRAY_OPERATION_CODES["add"], [1, 2], [3, 4])
+        response = client.post("/api/linalg", data=data[:-8], content_type=ARRAYS_MIMETYPE)
+
+        assert response.status_code == 400
+        assert "does not match" in response.get_json()["error"]
+
+    def test_declared_shape_capped(self, app, client):
+        """Test qu'une forme annoncée trop grande est refusée avant lecture des données"""
+        app.config["LINALG_MAX_ELEMENTS"] = 100
+        header = encode_arrays(ARRAY_OPERATION_CODES["add"], np.zeros((1000, 1000)), np.zeros((1000, 1000)))[:24]
+        response = client.post("/api/linalg", data=header, content_type=ARRAYS_MIMETYPE)
+
+        assert response.status_code == 400
+        assert "limited to 100 elements" in response.get_json()["error"]
@@ -0,0 +1,126 @@
+"""
+Tests pour le délestage des opérations lourdes vers le pool de processus
+"""
+
+import threading
+import time
+
+import pytest
+
+from api.calculator import HEAVY, OPERATIONS, primes
+from api.offload import OffloadPool, OffloadTimeout, PoolSaturated
+from api.schema import ValidationError
+
+
+def slow_add(a, b, delay=0.5):
+    """Opération artificiellement lente (exécutée dans le processus enfant)"""
+    time.sleep(delay)
+    return a + b
+
+
+@pytest.fixture
+def pool():
+    pool = OffloadPool(max_workers=1, max_queue=0, timeout=5)
+    yield pool
+    pool.shutdown()
+
+
+class TestOffloadPool:
+    """Tests unitaires du pool de processus"""
+
+    def test_runs_in_child_process(self, pool):
+        """Test qu'une opération lourde est exécutée et son résultat renvoyé"""
+        assert pool.run(primes, 0.0, 100.0) == 25.0
+        assert pool.pending == 0
+
+    def test_validation_errors_propagate(self, pool):
+        """Test que les erreurs de validation du processus enfant sont propagées"""
+        with pytest.raises(ValidationError, match="must not span"):
+            pool.run(primes, 0.0, 1e9)
+
+    def test_timeout_cancels_running_task(self, pool):
+        """Test qu'une tâche trop longue est interrompue et le pool recréé"""
+        pool.timeout = 0.2
+        start = time.monotonic()
+        with pytest.raises(OffloadTimeout) as excinfo:
+            pool.run(slow_add, 1, 2, 10)
+
+        assert excinfo.value.status_code == 504
+        assert time.monotonic() - start < 5
+        pool.timeout = 5
+        assert pool.run(slow_add, 1, 2, 0) == 3
+
+    def test_full_queue_rejected(self, pool):
+        """Test qu'au-delà de max_workers + max_queue les tâches sont refusées"""
+        worker = threading.Thread(target=pool.run, args=(slow_add, 1, 2, 1))
+        worker.start()
+        while pool.pending == 0:
+            time.sleep(0.01)
+
+        with pytest.raises(PoolSaturated) as excinfo:
+            pool.run(slow_add, 1, 2, 0)
+        worker.join()
+
+        assert excinfo.value.status_code == 503
+        assert excinfo.value.to_dict()["retry_after"] == 1
+
+
+class TestHeavyOperations:
+    """Tests d'intégration de POST /api/calculate pour les opérations lourdes"""
+
+    @pytest.fixture(autouse=True)
+    def shutdown_pool(self, app):
+        yield
+        app.extensions["offload"].shutdown()
+
+    def test_primes_declared_heavy(self):
+        """Test que seul le crible est déclaré lourd parmi les opérations intégrées"""
+        assert OPERATIONS["primes"].cost == HEAVY
+        assert OPERATIONS["power"].cost != HEAVY
+        assert OPERATIONS["add"].cost != HEAVY
+
+    def test_primes_through_pool(self, client):
+        """Test d'un crible calculé dans le pool"""
+        response = client.post("/api/calculate", json={"operation": "primes", "a": 1_000_000, "b": 1_001_000})
+
+        assert response.status_code == 200
+        assert response.get_json()["result"] == 75
+
+    @pytest.mark.parametrize(
+        "a,b,expected",
+        [(0, 1, 0), (2, 2, 1), (0, 10, 4), (10, 20, 4), (97, 97, 1), (0, 10_000, 1229), (10**12 - 100, 10**12, 4)],
+    )
+    def test_primes_counts(self, a, b, expected):
+        """Test du crible segmenté sur des intervalles connus"""
+        assert primes(float(a), float(b)) == expected
+
+    @pytest.mark.parametrize(
+        "a,b,error",
+        [(1.5, 10, "integers"), (10, 2, "integers"), (-1, 10, "integers"), (0, 1e13, "integers"), (0, 1e8, "span")],
+    )
+    def test_primes_errors(self, client, a, b, error):
+        """Test que des bornes invalides renvoient 400"""
+        response = client.post("/api/calculate", json={"operation": "primes", "a": a, "b": b})
+
+        assert response.status_code == 400
+        assert error in response.get_json()["error"]
+
+    @pytest.mark.parametrize(
+        "a,b,error",
+        [(10, 400, "too large"), (0, -1, "Division by zero"), (-8, 0.5, "not a real number")],
+    )
+    def test_power_errors(self, client, a, b, error):
+        """Test que les erreurs de la puissance renvoient 400"""
+        response = client.post("/api/calculate", json={"operation": "power", "a": a, "b": b})
+
+        assert response.status_code == 400
+        assert error in response.get_json()["error"]
+
+    def test_saturated_pool_returns_503(self, app, client):
+        """Test qu'une file pleine renvoie 503 avec Retry-After"""
+        app.extensions["offload"].max_workers = 0
+        app.extensions["offload"].max_queue = 0
+        response = client.post("/api/calculate", json={"operation": "primes", "a": 2, "b": 3})
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,153 @@
+"""
+Tests pour le registre des opérations et sa table de dispatch instrumentée
+"""
+
+import pytest
+from prometheus_client import REGISTRY as METRICS
+
+from api import operations
+from api.calculator import ARRAY_OPERATION_CODES, DISPATCH, OPERATION_CODES, evaluate
+from api.columnar import COLUMNAR_MIMETYPE, encode_columns
+from api.operations import HEAVY, build_dispatch_table, code_table, load_plugins, operation, register
+from api.schema import ValidationError
+
+
+def calls(name, mode="scalar"):
+    labels = {"operation": name, "mode": mode}
+    return METRICS.get_sample_value("calculator_operation_duration_seconds_count", labels) or 0
+
+
+def errors(name, mode="scalar"):
+    return METRICS.get_sample_value("calculator_operation_errors_total", {"operation": name, "mode": mode}) or 0
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Registre vide isolé du registre de l'application"""
+    registry = {}
+    monkeypatch.setattr(operations, "REGISTRY", registry)
+    return registry
+
+
+class FakeEntryPoint:
+    def __init__(self, target):
+        self.target = target
+
+    def load(self):
+        return self.target()
+
+
+class TestRegistry:
+    """Tests unitaires de l'enregistrement"""
+
+    def test_decorator_records_metadata(self, registry):
+        """Test que le décorateur enregistre l'opération et ses métadonnées"""
+
+        @operation("hypot", code=20, vectorized=abs, cost=HEAVY)
+        def hypot(a, b):
+            return (a * a + b * b) ** 0.5
+
+        entry = registry["hypot"]
+        assert entry.function is hypot
+        assert entry.arity == 2
+        assert entry.code == entry.array_code == 20
+        assert entry.vectorized is abs
+        assert entry.cost == HEAVY
+
+    @pytest.mark.parametrize(
+        "kwargs,error",
+        [
+            ({"code": 1, "arity": 3}, "arity"),
+            ({"code": 1, "cost": "medium"}, "cost class"),
+            ({"code": 256}, "between 0 and 255"),
+            ({"code": 1.0}, "between 0 and 255"),
+            ({"code": 1, "array_code": -1, "vectorized": max}, "array code"),
+        ],
+    )
+    def test_invalid_metadata(self, registry, kwargs, error):
+        """Test que les métadonnées invalides sont refusées"""
+        with pytest.raises(ValueError, match=error):
+            register("bad", max, **kwargs)
+
+    def test_duplicate_name_rejected(self, registry):
+        """Test qu'un nom ne peut être enregistré deux fois"""
+        register("max", max, code=1)
+        with pytest.raises(ValueError, match="already registered"):
+            register("max", min, code=2)
+
+    def test_duplicate_code_rejected(self, registry):
+        """Test qu'un code binaire ne peut être pris par deux opérations"""
+        register("max", max, code=1, vectorized=max)
+        with pytest.raises(ValueError, match="code 1 of min already used by max"):
+            register("min", min, code=1)
+        with pytest.raises(ValueError, match="array code 1 of min already used by max"):
+            register("min", min, code=2, array_code=1, vectorized=min)
+
+    def test_code_table_rejects_duplicates(self):
+        """Test que les tables de codes refusent deux opérations sur le même code"""
+        assert code_table([("add", 0), ("dot", 4)]) == {"add": 0, "dot": 4}
+        with pytest.raises(ValueError, match="code 4 of power already used by dot"):
+            code_table([("dot", 4), ("power", 4)])
+
+    def test_entry_point_plugins(self, registry, monkeypatch):
+        """Test que les modules déclarés en entry points enregistrent leurs opérations"""
+        plugins = [
+            FakeEntryPoint(lambda: register("minimum", min, code=11)),
+            FakeEntryPoint(lambda: register("maximum", max, code=10)),
+        ]
+        monkeypatch.setattr(operations, "entry_points", lambda group: plugins if group == "calculator.operations" else [])
+
+        load_plugins()
+
+        assert list(registry) == ["minimum", "maximum"]
+        assert {name: entry.code for name, entry in registry.items()} == {"minimum": 11, "maximum": 10}
+        assert build_dispatch_table()["maximum"].call(2, 5) == 5
+
+
+class TestDispatch:
+    """Tests de la table de dispatch"""
+
+    def test_builtin_operation_codes(self):
+        """Test que les codes binaires des opérations intégrées restent stables"""
+        expected = {"add": 0, "subtract": 1, "multiply": 2, "divide": 3, "power": 4, "primes": 5}
+        assert {name: OPERATION_CODES[name] for name in expected} == expected
+        assert ARRAY_OPERATION_CODES["power"] == 7
+
+    def test_unary_operation(self, registry):
+        """Test qu'une opération unaire ne reçoit que a"""
+        register("negate", lambda a: -a, code=1, arity=1, vectorized=lambda a: -a)
+        dispatch = build_dispatch_table()["negate"]
+
+        assert dispatch.call(3.0, 99.0) == -3.0
+        assert dispatch.vectorized(3.0, 99.0) == -3.0
+
+    def test_scalar_calls_instrumented(self):
+        """Test que chaque appel est compté et chronométré par opération"""
+        before = calls("multiply")
+        evaluate({"operation": "multiply", "a": 2, "b": 3})
+
+        assert calls("multiply") == before + 1
+
+    def test_errors_counted(self):
+        """Test que les erreurs sont comptées par opération"""
+        before = errors("divide")
+        with pytest.raises(ValidationError):
+            DISPATCH["divide"].call(1.0, 0.0)
+
+        assert errors("divide") == before + 1
+
+    def test_columnar_calls_instrumented(self, client):
+        """Test que le mode colonnaire passe par la même table de dispatch"""
+        before = calls("add", "vectorized")
+        frame = encode_columns(OPERATION_CODES["add"], [1.0, 2.0], [3.0, 4.0])
+        client.post("/api/calculate/columnar", data=frame, content_type=COLUMNAR_MIMETYPE)
+
+        assert calls("add", "vectorized") == before + 1
+
+    def test_job_items_instrumented(self, client):
+        """Test que les éléments des tâches asynchrones sont instrumentés"""
+        before = calls("subtract")
+        job = client.post("/api/jobs", json={"items": [{"operation": "subtract", "a": 5, "b": 1}] * 3}).get_json()
+        client.get(f"/api/jobs/{job['id']}?wait=10")
+
+        assert calls("subtract") == before + 3
@@ -0,0 +1,89 @@
+"""
+Tests unitaires pour la validation déclarative des charges utiles
+"""
+
+import pytest
+
+from api.calculator import evaluate, validate_calculation
+from api.schema import Field, ValidationError, compile_schema
+
+
+class TestCompileSchema:
+    """Tests pour compile_schema"""
+
+    @pytest.fixture
+    def validate(self):
+        return compile_schema(
+            [
+                Field("name"),
+                Field("count", coerce=int, error="count must be an integer"),
+                Field("mode", choices={"fast", "slow"}, error="Unknown mode"),
+            ]
+        )
+
+    def test_valid_payload(self, validate):
+        """Test qu'une charge utile valide est convertie"""
+        values = validate({"name": "x", "count": "3", "mode": "fast", "extra": 1})
+
+        assert values == ("x", 3, "fast")
+
+    def test_first_missing_field_reported(self, validate):
+        """Test que le premier champ manquant dans l'ordre déclaré est signalé"""
+        with pytest.raises(ValidationError) as exc:
+            validate({"mode": "fast"})
+
+        assert exc.value.message == "Missing required field: name"
+        assert exc.value.status_code == 400
+
+    def test_coercion_error(self, validate):
+        """Test que l'erreur de conversion du champ est utilisée"""
+        with pytest.raises(ValidationError, match="count must be an integer"):
+            validate({"name": "x", "count": "abc", "mode": "fast"})
+
+    def test_choices_error(self, validate):
+        """Test que les valeurs hors liste sont refusées"""
+        with pytest.raises(ValidationError, match="Unknown mode"):
+            validate({"name": "x", "count": 1, "mode": "medium"})
+
+    def test_unhashable_choice_rejected(self, validate):
+        """Test qu'une valeur non hachable est refusée proprement"""
+        with pytest.raises(ValidationError, match="Unknown mode"):
+            validate({"name": "x", "count": 1, "mode": ["fast"]})
+
+    @pytest.mark.parametrize("payload", [None, [], "text", 3])
+    def test_non_object_rejected(self, validate, payload):
+        """Test que seuls les objets JSON sont acceptés"""
+        with pytest.raises(ValidationError) as exc:
+            validate(payload)
+
+        assert exc.value.to_dict() == {"error": "Request body must be a JSON object"}
+
+
+class TestCalculationSchema:
+    """Tests pour le schéma du calculateur"""
+
+    def test_numeric_errors_before_operation_errors(self):
+        """Test que les erreurs numériques priment sur l'opération inconnue"""
+        with pytest.raises(ValidationError, match="must be numeric"):
+            validate_calculation({"operation": "modulo", "a": "x", "b": 1})
+
+    def test_evaluate_dispatch(self):
+        """Test que evaluate utilise la table de dispatch"""
+        assert evaluate({"operation": "subtract", "a": 5, "b": 2}) == {
+            "result": 3.0,
+            "operation": "subtract",
+            "a": 5.0,
+            "b": 2.0,
+        }
+
+    def test_evaluate_division_by_zero(self):
+        """Test que la division par zéro est une erreur de validation"""
+        with pytest.raises(ValidationError, match="Division by zero"):
+            evaluate({"operation": "divide", "a": 1, "b": 0})
+
+    def test_null_json_body_is_400(self, client):
+        """Test qu'un corps JSON null renvoie une erreur 400 cohérente"""
+        response = client.post("/api/calculate", data="null", content_type="application/json")
+
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "Request body must be a JSON object"}
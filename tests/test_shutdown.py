@@ -0,0 +1,236 @@
+"""
+Tests pour l'arrêt progressif et le drainage des requêtes en cours
+"""
+
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from api.metrics import SHUTDOWN_ABANDONED_REQUESTS, SHUTDOWN_DRAIN_DURATION
+from api.shutdown import ShutdownCoordinator
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), "..")
+MAIN = os.path.join(ROOT_DIR, "app", "main.py")
+
+
+def make_coordinator(drain_timeout=1.0):
+    readiness = threading.Event()
+    readiness.set()
+    return ShutdownCoordinator(readiness, drain_timeout)
+
+
+class TestShutdownCoordinator:
+    """Tests unitaires du coordinateur d'arrêt"""
+
+    def test_rejects_after_drain_begins(self):
+        """Test que la disponibilité passe à faux et que les nouvelles requêtes sont refusées"""
+        coordinator = make_coordinator()
+        assert coordinator.enter()
+
+        coordinator.begin_drain()
+
+        assert not coordinator.readiness.is_set()
+        assert not coordinator.enter()
+        assert coordinator.in_flight == 1
+
+    def test_waits_for_in_flight_requests(self):
+        """Test que l'arrêt attend la fin des requêtes en cours"""
+        coordinator = make_coordinator(drain_timeout=5.0)
+        coordinator.enter()
+        threading.Timer(0.05, coordinator.exit).start()
+
+        start = time.monotonic()
+        assert coordinator.shutdown() is True
+
+        assert 0.04 < time.monotonic() - start < 2.0
+        assert SHUTDOWN_ABANDONED_REQUESTS._value.get() == 0
+        assert SHUTDOWN_DRAIN_DURATION._value.get() > 0
+
+    def test_deadline(self):
+        """Test que le drainage s'arrête au délai si une requête ne se termine pas"""
+        coordinator = make_coordinator(drain_timeout=0.05)
+        coordinator.enter()
+
+        assert coordinator.shutdown() is False
+        assert SHUTDOWN_ABANDONED_REQUESTS._value.get() == 1
+
+    def test_drain_measured_from_signal(self):
+        """Test qu'un arrêt sans délai après begin_drain (gunicorn) compte le drainage depuis le signal"""
+        coordinator = make_coordinator(drain_timeout=5.0)
+        coordinator.enter()
+        coordinator.begin_drain()
+        time.sleep(0.05)
+
+        start = time.monotonic()
+        assert coordinator.shutdown(timeout=0) is False
+
+        assert time.monotonic() - start < 0.5
+        assert SHUTDOWN_DRAIN_DURATION._value.get() >= 0.05
+        assert SHUTDOWN_ABANDONED_REQUESTS._value.get() == 1
+
+    def test_services_stopped_in_reverse_order(self):
+        """Test que les services sont arrêtés après le drainage, en ordre inverse, une seule fois"""
+        coordinator = make_coordinator()
+        stopped = []
+        coordinator.register("first", stopped.append, "first")
+        coordinator.register("failing", lambda: 1 / 0)
+        coordinator.register("last", stopped.append, "last")
+
+        coordinator.shutdown()
+        coordinator.shutdown()
+
+        assert stopped == ["last", "first"]
+
+
+class TestShutdownHooks:
+    """Tests d'intégration avec l'application"""
+
+    def test_requests_rejected_while_draining(self, app, client):
+        """Test que les requêtes reçoivent 503 avec Connection: close pendant l'arrêt"""
+        app.extensions["shutdown"].begin_drain()
+
+        response = client.post("/api/calculate", json={"operation": "add", "a": 1, "b": 2})
+
+        assert response.status_code == 503
+        assert response.headers["Connection"] == "close"
+        assert response.headers["Retry-After"] == "1"
+        assert response.get_json() == {"error": "Server is shutting down"}
+
+    def test_probes_served_while_draining(self, app, client):
+        """Test que /health reste servi et que /ready échoue pendant l'arrêt"""
+        app.extensions["shutdown"].begin_drain()
+
+        assert client.get("/health").status_code == 200
+        assert client.get("/ready").status_code == 503
+
+    def test_in_flight_released(self, app, client):
+        """Test que chaque requête terminée libère le compteur"""
+        client.post("/api/calculate", json={"operation": "add", "a": 1, "b": 2})
+        client.post("/api/calculate", json={"operation": "add", "a": 1})
+
+        assert app.extensions["shutdown"].in_flight == 0
+
+    def test_shutdown_stops_services(self, app, client):
+        """Test que l'arrêt complet arrête les workers de tâches et le pool de threads matriciel"""
+        client.post("/api/jobs", json={"items": [{"operation": "add", "a": 1, "b": 2}]})
+        jobs = app.extensions["jobs"]
+
+        assert app.extensions["shutdown"].shutdown() is True
+        assert jobs._threads == []
+        assert "linalg_executor" not in app.extensions
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_env(port):
+    # Sans worker de tâches, GET /api/jobs/<id>?wait= reste en cours jusqu'à son délai
+    return {**os.environ, "HOST": "127.0.0.1", "PORT": str(port), "JOB_WORKERS": "0", "SHUTDOWN_DRAIN_TIMEOUT": "10"}
+
+
+def wait_ready(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if request(port, "GET", "/ready")[0] == 200:
+                return
+        except OSError:
+            pass
+        assert time.monotonic() < deadline, "server did not become ready"
+        time.sleep(0.1)
+
+
+def request(port, method, path, body=None):
+    """Requête HTTP sur une nouvelle connexion ; retourne (statut, en-têtes, corps JSON)"""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        connection.request(method, path, json.dumps(body) if body is not None else None, headers)
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), json.loads(response.read())
+    finally:
+        connection.close()
+
+
+class TestSigterm:
+    """Test de bout en bout du serveur lancé par python app/main.py"""
+
+    def test_new_requests_rejected_while_draining(self):
+        """Test que pendant le drainage le serveur répond 503 et /ready échoue, puis s'arrête"""
+        port = free_port()
+        server = subprocess.Popen([sys.executable, MAIN], env=server_env(port), stderr=subprocess.DEVNULL)
+        try:
+            wait_ready(port)
+            job_id = request(port, "POST", "/api/jobs", {"items": [{"operation": "add", "a": 1, "b": 2}]})[2]["id"]
+            in_flight = []
+            poll = threading.Thread(target=lambda: in_flight.append(request(port, "GET", f"/api/jobs/{job_id}?wait=2")))
+            poll.start()
+            time.sleep(0.3)
+
+            server.send_signal(signal.SIGTERM)
+            time.sleep(0.3)
+            ready = request(port, "GET", "/ready")
+            status, headers, body = request(port, "POST", "/api/calculate", {"operation": "add", "a": 1, "b": 2})
+            poll.join(10)
+
+            assert ready[0] == 503
+            assert status == 503
+            assert headers["Connection"] == "close"
+            assert body == {"error": "Server is shutting down"}
+            assert in_flight[0][0] == 200
+            assert server.wait(10) == 0
+        finally:
+            if server.poll() is None:
+                server.kill()
+                server.wait()
+
+
+class TestGunicornSigterm:
+    """Test de bout en bout de l'image : gunicorn -c gunicorn.conf.py"""
+
+    def test_drain_begins_on_sigterm(self):
+        """Test que SIGTERM déclenche le drainage de l'application avant celui de gunicorn"""
+        pytest.importorskip("gunicorn")
+        port = free_port()
+        command = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"]
+        server = subprocess.Popen(command, cwd=ROOT_DIR, env=server_env(port), stderr=subprocess.DEVNULL)
+        try:
+            wait_ready(port)
+            job_id = request(port, "POST", "/api/jobs", {"items": [{"operation": "add", "a": 1, "b": 2}]})[2]["id"]
+            in_flight = []
+            poll = threading.Thread(target=lambda: in_flight.append(request(port, "GET", f"/api/jobs/{job_id}?wait=2")))
+            # Connexion keep-alive ouverte avant l'arrêt : gunicorn la sert encore pendant son drainage
+            # (il ignore l'en-tête Connection de l'application et ferme lui-même après SIGTERM)
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            connection.request("GET", "/ready")
+            connection.getresponse().read()
+            poll.start()
+            time.sleep(0.3)
+
+            server.send_signal(signal.SIGTERM)
+            time.sleep(0.3)
+            connection.request("GET", "/ready")
+            ready = connection.getresponse()
+            ready.read()
+            poll.join(10)
+            connection.close()
+
+            assert ready.status == 503
+            assert ready.getheader("Connection") == "close"
+            assert in_flight[0][0] == 200
+            assert server.wait(10) == 0
+        finally:
+            if server.poll() is None:
+                server.kill()
+                server.wait()
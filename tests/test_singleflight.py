@@ -0,0 +1,145 @@
+"""
+Tests pour le regroupement des calculs identiques (single-flight)
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from prometheus_client import REGISTRY
+
+from api.operations import flight_key
+from api.schema import ValidationError
+from api.singleflight import SingleFlight
+
+
+class SlowFunction:
+    """Fonction lente qui compte ses appels"""
+
+    def __init__(self, delay=0.2, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return sum(args)
+
+
+class FakeOffload:
+    """Remplace le pool de processus : exécution lente dans le thread appelant"""
+
+    def __init__(self):
+        self.slow = SlowFunction()
+
+    def run(self, function, *args):
+        self.slow(*args)
+        return function(*args)
+
+
+def run_concurrently(count, target):
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        return list(executor.map(lambda _: target(), range(count)))
+
+
+class TestSingleFlight:
+    """Tests unitaires de SingleFlight"""
+
+    def test_concurrent_calls_share_one_computation(self):
+        """Test que des appels simultanés identiques ne calculent qu'une fois"""
+        flight = SingleFlight()
+        function = SlowFunction()
+
+        results = run_concurrently(8, lambda: flight.do("key", function, 1, 2))
+
+        assert results == [3] * 8
+        assert function.calls == 1
+        assert flight.in_flight() == 0
+
+    def test_errors_shared_with_followers(self):
+        """Test que l'erreur du calcul est relevée chez tous les appelants"""
+        flight = SingleFlight()
+        function = SlowFunction(error=ValidationError("boom"))
+        errors = []
+
+        def call():
+            try:
+                flight.do("key", function)
+            except ValidationError as e:
+                errors.append(e.message)
+
+        run_concurrently(4, call)
+
+        assert errors == ["boom"] * 4
+        assert function.calls == 1
+
+    def test_sequential_calls_recompute(self):
+        """Test qu'un appel après la fin du calcul recalcule (pas de cache)"""
+        flight = SingleFlight()
+        function = SlowFunction(delay=0)
+
+        flight.do("key", function, 1)
+        flight.do("key", function, 1)
+
+        assert function.calls == 2
+
+    def test_different_keys_not_coalesced(self):
+        """Test que des clés différentes calculent chacune"""
+        flight = SingleFlight()
+        function = SlowFunction(delay=0.1)
+        threads = [threading.Thread(target=flight.do, args=(key, function)) for key in ("a", "b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert function.calls == 2
+
+    def test_signed_zero_keys_distinct(self):
+        """Test que 0.0 et -0.0 ne partagent pas un calcul (le signe du résultat peut différer)"""
+        assert flight_key("multiply", (0.0, 1.0)) != flight_key("multiply", (-0.0, 1.0))
+        assert flight_key("multiply", (2, 3)) == flight_key("multiply", (2.0, 3.0))
+
+    def test_coalesced_callback(self):
+        """Test que chaque appel regroupé est signalé"""
+        coalesced = []
+        flight = SingleFlight(on_coalesced=coalesced.append)
+
+        run_concurrently(5, lambda: flight.do("key", SlowFunction(), 1))
+
+        assert coalesced == ["key"] * 4
+
+
+class TestCalculatorCoalescing:
+    """Tests d'intégration sur POST /api/calculate"""
+
+    def test_identical_heavy_requests_coalesced(self, app):
+        """Test que des requêtes lourdes identiques simultanées partagent un calcul"""
+        offload = FakeOffload()
+        app.extensions["offload"] = offload
+        before = REGISTRY.get_sample_value("calculator_coalesced_requests_total", {"operation": "primes"}) or 0
+
+        def post():
+            return app.test_client().post("/api/calculate", json={"operation": "primes", "a": 0, "b": 100})
+
+        responses = run_concurrently(6, post)
+
+        assert [r.get_json()["result"] for r in responses] == [25.0] * 6
+        assert offload.slow.calls == 1
+        after = REGISTRY.get_sample_value("calculator_coalesced_requests_total", {"operation": "primes"})
+        assert after - before == 5
+
+    @pytest.mark.parametrize("operation", ["add", "multiply"])
+    def test_cheap_operations_not_coalesced(self, app, client, operation):
+        """Test que les opérations légères sont calculées directement"""
+        offload = FakeOffload()
+        app.extensions["offload"] = offload
+
+        response = client.post("/api/calculate", json={"operation": operation, "a": 2, "b": 3})
+
+        assert response.status_code == 200
+        assert offload.slow.calls == 0
@@ -0,0 +1,202 @@
+"""
+Tests pour les statistiques en flux et l'endpoint /api/aggregate
+"""
+
+import io
+import json
+import math
+
+import numpy as np
+import pytest
+
+from api.calculator import iter_stream_chunks
+from api.schema import ValidationError
+from api.stats import QuantileSketch, StreamingStats
+
+
+class TestStreamingStats:
+    """Tests unitaires des agrégats en une passe"""
+
+    def test_chunked_matches_numpy(self):
+        """Test que la mise à jour par blocs donne les mêmes agrégats que numpy"""
+        values = np.random.default_rng(1).normal(10, 3, 100_000)
+        stats = StreamingStats()
+        for chunk in np.array_split(values, 37):
+            stats.update(chunk)
+
+        assert stats.count == len(values)
+        assert stats.mean == pytest.approx(values.mean(), rel=1e-12)
+        assert stats.variance == pytest.approx(values.var(ddof=1), rel=1e-9)
+        assert stats.minimum == values.min()
+        assert stats.maximum == values.max()
+
+    def test_variance_stable_with_large_offset(self):
+        """Test que la variance reste exacte autour d'une moyenne très grande"""
+        stats = StreamingStats()
+        for _ in range(1000):
+            stats.update(np.array([1e9 + 4, 1e9 + 7, 1e9 + 13, 1e9 + 16]))
+
+        assert stats.variance == pytest.approx(90_000 / 3999, rel=1e-9)
+
+    def test_compensated_sum(self):
+        """Test que la somme entre blocs est compensée"""
+        stats = StreamingStats()
+        for value in [1e16, 1.0, -1e16, 1.0]:
+            stats.update(np.array([value]))
+
+        assert stats.total == 2.0
+
+    def test_variance_requires_two_values(self):
+        """Test que la variance n'est pas définie pour une seule valeur"""
+        stats = StreamingStats()
+        stats.update(np.array([5.0]))
+
+        assert stats.variance is None
+
+
+class TestQuantileSketch:
+    """Tests unitaires du t-digest"""
+
+    def test_quantiles_close_to_exact(self):
+        """Test que l'erreur de rang reste faible sur un million de valeurs"""
+        values = np.random.default_rng(2).random(1_000_000)
+        sketch = QuantileSketch()
+        for chunk in np.array_split(values, 100):
+            sketch.update(chunk)
+
+        for q in (0.01, 0.5, 0.9, 0.99, 0.999):
+            assert sketch.quantile(q) == pytest.approx(np.quantile(values, q), abs=0.005)
+
+    def test_extremes_are_observed_min_and_max(self):
+        """Test que p0 et p100 sont le minimum et le maximum observés, et que les queues restent entre eux"""
+        values = np.random.default_rng(4).exponential(size=1_000_000)
+        sketch = QuantileSketch()
+        for chunk in np.array_split(values, 100):
+            sketch.update(chunk)
+
+        assert sketch.quantile(0.0) == values.min()
+        assert sketch.quantile(1.0) == values.max()
+        assert sketch.means[0] > values.min()
+        assert values.min() < sketch.quantile(0.00001) < sketch.means[0]
+        assert sketch.means[-1] < sketch.quantile(0.99999) < values.max()
+
+    def test_memory_is_bounded(self):
+        """Test que le nombre de centroïdes ne croît pas avec le flux"""
+        sketch = QuantileSketch(compression=100)
+        rng = np.random.default_rng(3)
+        for _ in range(50):
+            sketch.update(rng.random(10_000))
+        sketch.quantile(0.5)
+
+        assert len(sketch.means) <= 100
+        assert sketch.weights.sum() == 500_000
+
+    def test_empty_sketch(self):
+        """Test qu'un flux vide n'a pas de quantile"""
+        assert QuantileSketch().quantile(0.5) is None
+
+
+class TestStreamChunks:
+    """Tests du découpage d'un flux binaire"""
+
+    def test_values_split_across_reads(self):
+        """Test qu'une valeur coupée entre deux lectures est reconstituée"""
+        data = np.arange(10, dtype="<f8").tobytes()
+        chunks = list(iter_stream_chunks(io.BytesIO(data), chunk_size=13))
+
+        assert np.array_equal(np.concatenate(chunks), np.arange(10))
+
+    def test_trailing_bytes_rejected(self):
+        """Test qu'un flux dont la taille n'est pas multiple de 8 est refusé"""
+        with pytest.raises(ValidationError):
+            list(iter_stream_chunks(io.BytesIO(b"\x00" * 12)))
+
+
+class TestAggregateEndpoint:
+    """Tests d'intégration de POST /api/aggregate"""
+
+    def test_json_values(self, client):
+        """Test d'une agrégation sur une liste JSON"""
+        response = client.post("/api/aggregate", json={"values": [1, 2, 3, 4], "percentiles": [50]})
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["count"] == 4
+        assert data["sum"] == 10.0
+        assert data["mean"] == 2.5
+        assert data["variance"] == pytest.approx(5 / 3)
+        assert data["stddev"] == pytest.approx(math.sqrt(5 / 3))
+        assert data["min"] == 1.0
+        assert data["max"] == 4.0
+        assert data["percentiles"] == {"50": 2.5}
+
+    def test_default_percentiles(self, client):
+        """Test que p50, p90 et p99 sont renvoyés par défaut"""
+        response = client.post("/api/aggregate", json={"values": [1.0]})
+
+        assert set(response.get_json()["percentiles"]) == {"50", "90", "99"}
+
+    def test_empty_values(self, client):
+        """Test qu'une liste vide renvoie des agrégats nuls"""
+        data = client.post("/api/aggregate", json={"values": []}).get_json()
+
+        assert data["count"] == 0
+        assert data["mean"] is None
+        assert data["percentiles"]["50"] is None
+
+    def test_binary_stream(self, client):
+        """Test d'un flux binaire dépassant la limite du blueprint calculateur"""
+        values = np.random.default_rng(4).random(200_000)
+        response = client.post(
+            "/api/aggregate?percentiles=10,99.9",
+            data=values.astype("<f8").tobytes(),
+            content_type="application/octet-stream",
+        )
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["count"] == len(values)
+        assert data["mean"] == pytest.approx(values.mean())
+        assert data["percentiles"]["99.9"] == pytest.approx(np.quantile(values, 0.999), abs=0.005)
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"values": ["a", "b"]},
+            {"values": [1, None]},
+            {"values": [[1, 2], [3, 4]]},
+            {"values": [1], "percentiles": [150]},
+            {"values": [1], "percentiles": "50"},
+            {"numbers": [1]},
+        ],
+    )
+    def test_invalid_json(self, client, payload):
+        """Test que les entrées invalides renvoient 400"""
+        response = client.post("/api/aggregate", json=payload)
+
+        assert response.status_code == 400
+        assert "error" in response.get_json()
+
+    def test_non_finite_stream_rejected(self, client):
+        """Test que NaN est refusé dans un flux binaire"""
+        data = np.array([1.0, np.nan]).astype("<f8").tobytes()
+        response = client.post("/api/aggregate", data=data, content_type="application/octet-stream")
+
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "Values must be finite numbers"}
+
+    def test_json_size_limit(self, app, client):
+        """Test que le corps JSON reste borné"""
+        app.config["AGGREGATE_JSON_MAX_BYTES"] = 64
+        response = client.post(
+            "/api/aggregate", data=json.dumps({"values": list(range(100))}), content_type="application/json"
+        )
+
+        assert response.status_code == 413
+        assert response.get_json()["max_bytes"] == 64
+
+    def test_unsupported_content_type(self, client):
+        """Test qu'un Content-Type inconnu est refusé"""
+        response = client.post("/api/aggregate", data="1,2,3", content_type="text/csv")
+
+        assert response.status_code == 400
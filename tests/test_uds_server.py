@@ -0,0 +1,118 @@
+"""
+Tests pour le serveur de calcul sur socket Unix
+"""
+
+import asyncio
+import struct
+
+import pytest
+
+from api.calculator import OPERATION_CODES
+from uds_server import (
+    INVALID,
+    LENGTH,
+    MALFORMED_FRAME,
+    OK,
+    CalculatorProtocol,
+    calculation_frame,
+    decode_response,
+    encode_request,
+)
+
+
+class TestCalculationFrame:
+    """Tests du traitement d'une trame"""
+
+    def test_operations(self):
+        """Test que chaque opération retourne le résultat de l'API HTTP"""
+        cases = [("add", 2, 3, 5.0), ("subtract", 5, 3, 2.0), ("multiply", 4, 3, 12.0), ("divide", 9, 3, 3.0)]
+        for operation, a, b, expected in cases:
+            frame = encode_request(7, OPERATION_CODES[operation], a, b)
+            assert decode_response(calculation_frame(memoryview(frame)[LENGTH.size :])) == (7, OK, expected)
+
+    def test_validation_errors(self):
+        """Test que les erreurs reprennent les messages du calculateur"""
+        frame = encode_request(1, OPERATION_CODES["divide"], 1, 0)
+        assert decode_response(calculation_frame(frame[LENGTH.size :])) == (1, INVALID, "Division by zero is not allowed")
+
+        request_id, status, message = decode_response(calculation_frame(encode_request(2, 200, 1, 1)[LENGTH.size :]))
+        assert (request_id, status) == (2, INVALID)
+        assert message.startswith("Unsupported operation. Use: add")
+
+    def test_heavy_operation_rejected(self):
+        """Test qu'une opération lourde est refusée plutôt que de bloquer la boucle d'événements"""
+        frame = encode_request(4, OPERATION_CODES["primes"], 0, 10)
+        request_id, status, message = decode_response(calculation_frame(frame[LENGTH.size :]))
+
+        assert (request_id, status) == (4, INVALID)
+        assert message == "Operation primes is not available over the Unix socket"
+
+    def test_malformed_frame(self):
+        """Test qu'une trame de mauvaise taille est refusée sans fermer la connexion"""
+        assert decode_response(calculation_frame(struct.pack("<IB", 3, 0))) == (3, INVALID, MALFORMED_FRAME)
+
+
+async def exchange(path, data, replies):
+    reader, writer = await asyncio.open_unix_connection(str(path))
+    writer.write(data)
+    await writer.drain()
+    frames = []
+    for _ in range(replies):
+        header = await reader.readexactly(LENGTH.size)
+        frames.append(decode_response(header + await reader.readexactly(LENGTH.unpack(header)[0])))
+    writer.close()
+    await writer.wait_closed()
+    return frames
+
+
+async def with_server(path, coroutine):
+    server = await asyncio.get_running_loop().create_unix_server(CalculatorProtocol, str(path))
+    try:
+        return await coroutine
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+class TestServer:
+    """Tests de bout en bout sur un socket Unix"""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        return tmp_path / "calculator.sock"
+
+    def test_pipelined_requests(self, path):
+        """Test que des requêtes envoyées en rafale reçoivent leurs réponses dans l'ordre"""
+        data = b"".join(encode_request(i, OPERATION_CODES["multiply"], i, 2) for i in range(1000))
+        frames = asyncio.run(with_server(path, exchange(path, data, 1000)))
+
+        assert frames == [(i, OK, 2.0 * i) for i in range(1000)]
+
+    def test_frames_split_across_writes(self, path):
+        """Test qu'une trame reçue en plusieurs morceaux est reconstituée"""
+
+        async def split():
+            reader, writer = await asyncio.open_unix_connection(str(path))
+            frame = encode_request(42, OPERATION_CODES["add"], 1.5, 2.5)
+            for byte in frame:
+                writer.write(bytes([byte]))
+                await writer.drain()
+            header = await reader.readexactly(LENGTH.size)
+            reply = decode_response(header + await reader.readexactly(LENGTH.unpack(header)[0]))
+            writer.close()
+            return reply
+
+        assert asyncio.run(with_server(path, split())) == (42, OK, 4.0)
+
+    def test_oversized_frame_closes_connection(self, path):
+        """Test qu'un préfixe de longueur démesuré ferme la connexion"""
+
+        async def oversized():
+            reader, writer = await asyncio.open_unix_connection(str(path))
+            writer.write(LENGTH.pack(1 << 30))
+            await writer.drain()
+            data = await reader.read()
+            writer.close()
+            return data
+
+        assert asyncio.run(with_server(path, oversized())) == b""
@@ -0,0 +1,84 @@
+"""
+Tests pour le préchauffage au démarrage et l'endpoint /ready
+"""
+
+import pytest
+
+import api.hello
+from api.metrics import REQUEST_COUNT, WARMUP_DURATION
+from api.warmup import warmup
+from main import create_app
+
+
+@pytest.fixture(autouse=True)
+def warmup_enabled(isolated_environment, monkeypatch):
+    """Préchauffage actif, désactivé par défaut dans conftest.py"""
+    monkeypatch.setenv("WARMUP_ENABLED", "true")
+
+
+class TestReadiness:
+    """Tests de l'endpoint /ready"""
+
+    def test_ready_after_create_app(self, client):
+        """Test que l'application est disponible dès la fin de create_app()"""
+        response = client.get("/ready")
+
+        assert response.status_code == 200
+        assert response.get_json() == {"status": "ready"}
+
+    def test_not_ready(self, app, client):
+        """Test que /ready renvoie 503 tant que la disponibilité n'est pas positionnée"""
+        app.extensions["readiness"].clear()
+
+        response = client.get("/ready")
+
+        assert response.status_code == 503
+        assert response.get_json() == {"status": "not_ready"}
+
+    def test_warmup_disabled(self, monkeypatch):
+        """Test que WARMUP_ENABLED=false rend l'application disponible sans préchauffage"""
+        monkeypatch.setenv("WARMUP_ENABLED", "false")
+        app = create_app()
+
+        assert app.extensions["readiness"].is_set()
+        assert app.test_client().get("/ready").status_code == 200
+
+
+class TestWarmup:
+    """Tests du préchauffage des routes"""
+
+    def test_all_routes_exercised(self, app):
+        """Test que chaque route est appelée, sauf celles exclues"""
+        statuses = warmup(app)
+
+        assert set(statuses) == {
+            "health.health_check",
+            "hello.hello",
+            "calculator.calculate",
+            "calculator.calculate_columnar",
+            "calculator.calculate_csv",
+            "calculator.aggregate",
+            "calculator.linalg",
+            "jobs.get_job",
+            "history.history",
+        }
+        assert all(code < 500 for codes in statuses.values() for code in codes)
+        assert WARMUP_DURATION._value.get() > 0
+
+    def test_no_side_effects(self, app, client):
+        """Test que le préchauffage n'apparaît ni dans l'historique ni dans les métriques de requêtes"""
+        counter = REQUEST_COUNT.labels(method="POST", endpoint="calculator.calculate", status=200)
+        before = counter._value.get()
+
+        warmup(app)
+
+        assert counter._value.get() == before
+        assert client.get("/api/history").get_json()["entries"] == []
+
+    def test_failed_route_keeps_not_ready(self, monkeypatch):
+        """Test qu'une route en erreur 5xx pendant le préchauffage laisse l'application indisponible"""
+        monkeypatch.setattr(api.hello, "HELLO_MESSAGE", {"message": object()})
+        app = create_app()
+
+        assert not app.extensions["readiness"].is_set()
+        assert app.test_client().get("/ready").status_code == 503